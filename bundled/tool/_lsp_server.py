@@ -1,6 +1,110 @@
-from typing import Any
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 from yaml.loader import SafeLoader
+from yaml.nodes import MappingNode, ScalarNode, SequenceNode
+
+YAML_MERGE_TAG = "tag:yaml.org,2002:merge"
+FACTORY_FIELD = re.compile(r"\{([^{}]*)\}")
+
+
+class PatternMatch(NamedTuple):
+    """A factory pattern that matched a dataset name and its placeholder values."""
+
+    pattern: str
+    values: Dict[str, str]
+
+
+def _pattern_specificity(pattern: str) -> int:
+    """Number of characters outside the curly brackets, as in Kedro."""
+    return len(FACTORY_FIELD.sub("", pattern))
+
+
+def _compile_pattern(pattern: str) -> "re.Pattern":
+    """Translate a factory pattern into a regex with the semantics of ``parse``.
+
+    Fields match lazily, repeated fields must match the same value and the
+    comparison is case insensitive, as ``parse`` does by default.
+    """
+    regex = []
+    seen = set()
+    position = 0
+    for field in FACTORY_FIELD.finditer(pattern):
+        regex.append(re.escape(pattern[position : field.start()]))
+        position = field.end()
+        # Drop format specs such as {name:s}, only the field name matters here
+        name = field.group(1).split(":", 1)[0]
+        if not name.isidentifier():
+            regex.append("(?:.+?)")
+        elif name in seen:
+            regex.append(f"(?P={name})")
+        else:
+            seen.add(name)
+            regex.append(f"(?P<{name}>.+?)")
+    regex.append(re.escape(pattern[position:]))
+    return re.compile("".join(regex), re.IGNORECASE | re.DOTALL)
+
+
+class FactoryPatternMatcher:
+    """Resolve dataset names against catalog factory patterns.
+
+    Patterns are compiled once and tried in Kedro's order: decreasing specificity,
+    decreasing number of placeholders, then alphabetically. A literal prefix check
+    skips most patterns without running the regex, and resolved names are kept
+    in an LRU cache.
+    """
+
+    def __init__(self, patterns: Iterable[str], cache_size: int = 1024):
+        self.patterns = sorted(
+            patterns,
+            key=lambda pattern: (-_pattern_specificity(pattern), -pattern.count("{"), pattern),
+        )
+        self._compiled = [
+            (pattern, pattern.split("{", 1)[0].lower(), _compile_pattern(pattern))
+            for pattern in self.patterns
+        ]
+        self._cache_size = cache_size
+        self._resolved: "OrderedDict[str, Optional[PatternMatch]]" = OrderedDict()
+
+    def match(self, name: str) -> Optional[PatternMatch]:
+        """Return the first pattern matching ``name``, or ``None``."""
+        if name in self._resolved:
+            self._resolved.move_to_end(name)
+            return self._resolved[name]
+
+        result = None
+        lowered = name.lower()
+        for pattern, prefix, regex in self._compiled:
+            if not lowered.startswith(prefix):
+                continue
+            found = regex.fullmatch(name)
+            if found:
+                result = PatternMatch(pattern, found.groupdict())
+                break
+
+        self._resolved[name] = result
+        if len(self._resolved) > self._cache_size:
+            self._resolved.popitem(last=False)
+        return result
+
+    def resolved_names(self) -> List[Tuple[str, str]]:
+        """Names resolved so far with the pattern that matched them."""
+        return [(name, match.pattern) for name, match in self._resolved.items() if match]
+
+
+def _resolve_pattern_config(config: Any, values: Dict[str, str]) -> Any:
+    """Fill the placeholders of a factory pattern config, like Kedro does."""
+    if isinstance(config, dict):
+        return {key: _resolve_pattern_config(value, values) for key, value in config.items()}
+    if isinstance(config, (list, tuple)):
+        return [_resolve_pattern_config(value, values) for value in config]
+    if isinstance(config, str) and "{" in config:
+        try:
+            return config.format_map(values)
+        except (KeyError, ValueError, IndexError):
+            return config
+    return config
 
 
 class DummyDataCatalog:
@@ -10,11 +114,16 @@ class DummyDataCatalog:
         self.conf_catalog = conf_catalog
         self._params = feed_dict or {}
         self._datasets = {}
-        
-        # Add all catalog entries
+
+        # Add all catalog entries, factory patterns are resolved on demand
+        patterns = []
         for ds_name, ds_config in conf_catalog.items():
-            self._datasets[ds_name] = ds_config
-            
+            if "{" in ds_name:
+                patterns.append(ds_name)
+            else:
+                self._datasets[ds_name] = ds_config
+        self.pattern_matcher = FactoryPatternMatcher(patterns)
+
         # Add all parameters as datasets
         if feed_dict:
             feed_dict_expanded = self._get_feed_dict()
@@ -31,6 +140,21 @@ class DummyDataCatalog:
             return self._datasets[name]
         raise KeyError(f"Dataset '{name}' not found")
     
+    def match_pattern(self, name: str) -> Optional[PatternMatch]:
+        """Return the factory pattern that generates ``name``, if any."""
+        if name in self._datasets:
+            return None
+        return self.pattern_matcher.match(name)
+
+    def get_dataset_config(self, name: str) -> Optional[Any]:
+        """Config of a dataset, either declared or resolved from a factory pattern."""
+        if name in self.conf_catalog and "{" not in name:
+            return self.conf_catalog[name]
+        match = self.match_pattern(name)
+        if match is None:
+            return None
+        return _resolve_pattern_config(self.conf_catalog[match.pattern], match.values)
+
     @property
     def params(self):
         return self._params
@@ -65,10 +189,67 @@ class DummyDataCatalog:
         return feed_dict
 
 
+class NodePosition(NamedTuple):
+    """Zero-based position of a mapping key and the end of its value."""
+
+    line: int
+    character: int
+    end_line: int
+    end_character: int
+
+
 class SafeLineLoader(SafeLoader):  # pylint: disable=too-many-ancestors
-    """A YAML loader that annotates loaded nodes with line number."""
+    """A YAML loader that records where every mapping key is defined.
+
+    Positions are kept in a side table keyed by the path of the key, e.g.
+    ``("companies", "load_args", "sep")``, so the loaded config stays clean and
+    can be handed to Kedro as-is.
+    """
+
+    def __init__(self, stream):
+        super().__init__(stream)
+        self.positions: Dict[Tuple[Any, ...], NodePosition] = {}
+
+    def get_single_data(self):
+        node = self.get_single_node()
+        if node is None:
+            return None
+        self._record_positions(node, (), set())
+        return self.construct_document(node)
+
+    def _record_positions(self, node, path, visiting):
+        # Aliases reuse the same node object, guard against recursive anchors
+        if id(node) in visiting:
+            return
+        visiting.add(id(node))
+        if isinstance(node, MappingNode):
+            # Merged keys (``<<: *anchor``) point at the anchor, explicit keys win
+            for key_node, value_node in node.value:
+                if key_node.tag == YAML_MERGE_TAG:
+                    merged = value_node.value if isinstance(value_node, SequenceNode) else [value_node]
+                    for merged_node in merged:
+                        self._record_positions(merged_node, path, visiting)
+            for key_node, value_node in node.value:
+                if not isinstance(key_node, ScalarNode) or key_node.tag == YAML_MERGE_TAG:
+                    continue
+                key = self.construct_object(key_node)
+                self.positions[path + (key,)] = NodePosition(
+                    line=key_node.start_mark.line,
+                    character=key_node.start_mark.column,
+                    end_line=value_node.end_mark.line,
+                    end_character=value_node.end_mark.column,
+                )
+                self._record_positions(value_node, path + (key,), visiting)
+        elif isinstance(node, SequenceNode):
+            for index, item_node in enumerate(node.value):
+                self._record_positions(item_node, path + (index,), visiting)
+        visiting.discard(id(node))
+
 
-    def construct_mapping(self, node, deep=False):
-        mapping = super().construct_mapping(node, deep=deep)
-        mapping["__line__"] = node.start_mark.line
-        return mapping
+def load_with_positions(stream) -> Tuple[Any, Dict[Tuple[Any, ...], NodePosition]]:
+    """Load a YAML document and return it together with its key position table."""
+    loader = SafeLineLoader(stream)
+    try:
+        return loader.get_single_data(), loader.positions
+    finally:
+        loader.dispose()
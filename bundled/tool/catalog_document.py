@@ -0,0 +1,215 @@
+"""Catalog documents parsed block by block.
+
+A catalog file is a mapping of top-level dataset entries. Each entry (a top-level
+key and its indented body) is a block that can be parsed on its own, so an edit
+only needs to re-parse the blocks it touched. Entries using an alias, e.g.
+``<<: *csv``, are parsed after the blocks defining its anchor.
+"""
+
+import bisect
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from _lsp_server import NodePosition, load_with_positions
+
+# A top-level key starts at column 0, comments and indented lines continue a block
+BLOCK_START = re.compile(r"[^\s#]")
+# Root-level sequences, flow collections, directives and document markers cannot be split
+UNSPLITTABLE_LINE = re.compile(r"(---|\.\.\.|%|-(\s|$)|[\[{])")
+# Anchors (``&csv``) and aliases (``*csv``) start a node, after a space or a flow indicator
+ANCHOR = re.compile(r"(?<![^\s\[{,])&([^\s\[\]{},]+)")
+ALIAS = re.compile(r"(?<![^\s\[{,])\*([^\s\[\]{},]+)")
+
+
+class CatalogBlock:
+    """A top-level entry of a catalog file and what was derived from it."""
+
+    def __init__(self, text: str, start_line: int):
+        self.text = text
+        self.start_line = start_line
+        # Blocks defining the anchors this block uses, in document order
+        self.anchors: List["CatalogBlock"] = []
+        self.config: Any = None
+        self.positions: Dict[Tuple[Any, ...], NodePosition] = {}
+        # Validation results with lines relative to the start of the block
+        self.diagnostics: Optional[List[Any]] = None
+        self.has_dataset_errors = False
+
+    @property
+    def key(self) -> Tuple[str, ...]:
+        """The texts parsed for this block, the block is parsed again when they change."""
+        return tuple(anchor.text for anchor in self.anchors) + (self.text,)
+
+    def parse(self):
+        """Parse the block after its anchor blocks, keeping only the block's own keys.
+
+        Positions are relative to the parsed text, see ``document_line``.
+        """
+        config, positions = load_with_positions("".join(self.key))
+        if self.anchors and isinstance(config, dict):
+            own_start = sum(anchor.text.count("\n") for anchor in self.anchors)
+            own_keys = {
+                path[0] for path, position in positions.items()
+                if len(path) == 1 and position.line >= own_start
+            }
+            config = {key: value for key, value in config.items() if key in own_keys}
+            positions = {path: position for path, position in positions.items() if path[0] in own_keys}
+        self.config, self.positions = config, positions
+
+    def document_line(self, line: int) -> int:
+        """The document line of a ``line`` of the parsed text, e.g. a key merged from an anchor."""
+        for anchor in self.anchors:
+            lines = anchor.text.count("\n")
+            if line < lines:
+                return anchor.start_line + line
+            line -= lines
+        return self.start_line + line
+
+
+class CatalogDocument:
+    """A catalog file split into top-level blocks parsed independently.
+
+    Blocks are kept keyed by their text. On update, blocks whose text did not
+    change are reused at their new line offset and only new or edited blocks
+    are parsed, so the cost of an edit scales with the blocks it touched rather
+    than with the size of the file.
+
+    A block using aliases is parsed with the blocks defining their anchors in
+    front of it, and parsed again when one of them changes. Documents that
+    cannot be split safely (root-level sequences or flow collections, several
+    documents) are parsed as a single block.
+    """
+
+    def __init__(self):
+        self.blocks: List[CatalogBlock] = []
+        self.config: Any = None
+        self.positions: Dict[Tuple[Any, ...], NodePosition] = {}
+        self.error: Optional[Exception] = None
+        self.is_split = False
+        # Whole-catalog validation results, reset whenever the source changes
+        self.catalog_diagnostics: Optional[List[Any]] = None
+        self._source: Optional[str] = None
+
+    def update(self, source: str) -> List[CatalogBlock]:
+        """Bring the document up to date with ``source``.
+
+        Returns the blocks that had to be parsed again.
+        """
+        if source == self._source:
+            return []
+        self._source = source
+        self.catalog_diagnostics = None
+
+        previous = {}
+        for block in self.blocks:
+            previous.setdefault(block.key, block)
+
+        blocks = _split_blocks(source)
+        if blocks is None:
+            blocks = [CatalogBlock(source, 0)]
+        anchors = _anchor_blocks(blocks)
+        for block, indexes in zip(blocks, anchors):
+            block.anchors = [blocks[index] for index in indexes]
+        dirty = []
+        for index, block in enumerate(blocks):
+            cached = previous.pop(block.key, None)
+            if cached is not None:
+                cached.start_line = block.start_line
+                blocks[index] = cached
+            else:
+                dirty.append(block)
+        # Cached blocks refer to the anchor blocks of the new document
+        for block, indexes in zip(blocks, anchors):
+            block.anchors = [blocks[index] for index in indexes]
+
+        try:
+            for block in dirty:
+                block.parse()
+            if len(blocks) > 1 and not all(
+                isinstance(block.config, dict) or block.config is None for block in blocks
+            ):
+                raise ValueError("Catalog blocks are not mappings")
+        except Exception:
+            # Fall back to parsing the whole document, e.g. for an alias defined after its use
+            blocks = [CatalogBlock(source, 0)]
+            dirty = blocks
+            try:
+                blocks[0].parse()
+            except Exception as exception:
+                self._reset(exception)
+                return dirty
+
+        self.blocks = blocks
+        self.is_split = len(blocks) > 1
+        self.error = None
+        self._splice()
+        return dirty
+
+    def block_at(self, line: int) -> Optional[CatalogBlock]:
+        """The block containing the zero-based ``line``."""
+        starts = [block.start_line for block in self.blocks]
+        index = bisect.bisect_right(starts, line) - 1
+        return self.blocks[index] if index >= 0 else None
+
+    def _splice(self):
+        if not self.is_split:
+            block = self.blocks[0]
+            self.config = block.config
+            self.positions = block.positions
+            return
+
+        self.config = {}
+        self.positions = {}
+        for block in self.blocks:
+            if not block.config:
+                continue
+            self.config.update(block.config)
+            for path, position in block.positions.items():
+                self.positions[path] = position._replace(
+                    line=block.document_line(position.line),
+                    end_line=block.document_line(position.end_line),
+                )
+
+    def _reset(self, error: Exception):
+        self.blocks = []
+        self.config = None
+        self.positions = {}
+        self.error = error
+        self.is_split = False
+
+
+def _split_blocks(source: str) -> Optional[List[CatalogBlock]]:
+    """Split a catalog into top-level blocks, ``None`` if it cannot be split."""
+    lines = source.splitlines(keepends=True)
+    blocks = []
+    start = 0
+    for index, line in enumerate(lines):
+        if not BLOCK_START.match(line):
+            continue
+        if UNSPLITTABLE_LINE.match(line):
+            return None
+        if index > start:
+            blocks.append(CatalogBlock("".join(lines[start:index]), start))
+            start = index
+    blocks.append(CatalogBlock("".join(lines[start:]), start))
+    return blocks
+
+
+def _anchor_blocks(blocks: List[CatalogBlock]) -> List[List[int]]:
+    """The indexes of the blocks defining the anchors used by each block.
+
+    An alias refers to the last anchor of its name before it, the anchors used
+    by that block are needed too.
+    """
+    defined: Dict[str, int] = {}
+    anchors: List[List[int]] = []
+    for index, block in enumerate(blocks):
+        needed: Set[int] = set()
+        for name in ALIAS.findall(block.text):
+            if name in defined:
+                needed.add(defined[name])
+                needed.update(anchors[defined[name]])
+        anchors.append(sorted(needed))
+        for name in ANCHOR.findall(block.text):
+            defined[name] = index
+    return anchors
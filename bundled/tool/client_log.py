@@ -0,0 +1,79 @@
+"""Logging to the output channel of the client.
+
+Every message sent to the client is a ``window/logMessage`` notification, so
+messages below the level the client asked for are dropped before they are
+formatted, and bursts are rate limited so a busy editor does not flood the
+channel or spend its time serializing logs.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable
+
+# Messages below ERROR sent per second once a burst of BURST_LIMIT is used up
+RATE_LIMIT = 20
+BURST_LIMIT = 100
+
+
+class ClientLog:
+    """Level-gated, lazily formatted and rate-limited log of the client.
+
+    Messages are formatted with ``msg % args`` as with ``logging``, and only
+    when they are sent. Errors are never rate limited, other messages past the
+    limit are counted and reported once messages can be sent again.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[int, str], None],
+        level: int = logging.INFO,
+        rate: float = RATE_LIMIT,
+        burst: int = BURST_LIMIT,
+    ):
+        # Called with the logging level and the formatted message
+        self._send = send
+        self.level = level
+        self.rate = rate
+        self.burst = burst
+        self.dropped = 0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def is_enabled_for(self, level: int) -> bool:
+        return level >= self.level
+
+    def log(self, level: int, msg: str, *args, force: bool = False):
+        """Send ``msg % args`` at ``level``, ``force`` ignoring the level of the client."""
+        if not force and level < self.level:
+            return
+        with self._lock:
+            if level < logging.ERROR and not self._acquire():
+                self.dropped += 1
+                return
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            self._send(logging.WARNING, f"{dropped} log messages were dropped, the server logged too fast")
+        self._send(level, msg % args if args else msg)
+
+    def debug(self, msg: str, *args):
+        self.log(logging.DEBUG, msg, *args)
+
+    def info(self, msg: str, *args):
+        self.log(logging.INFO, msg, *args)
+
+    def warning(self, msg: str, *args):
+        self.log(logging.WARNING, msg, *args)
+
+    def error(self, msg: str, *args):
+        self.log(logging.ERROR, msg, *args)
+
+    def _acquire(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
@@ -0,0 +1,258 @@
+"""Caching around the project's config loader and config files.
+
+Resolving a config key reads, parses and merges every file matching its
+patterns in the base and run environments. The server asks for the same keys
+on most requests, so resolved configs are memoized and only dropped when the
+file watcher reports a change to a file they were read from. Key positions
+used for navigation are indexed per file in the same way.
+"""
+
+import copy
+import io
+import os
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, Iterable, NamedTuple, Set, Tuple
+
+from _lsp_server import NodePosition, load_with_positions
+from server_stats import STATS
+
+# Private OmegaConfigLoader members the per-file cache relies on
+READ_DIR_MEMBERS = (
+    "_read_dir_configs",
+    "_fs",
+    "_is_hidden",
+    "_is_valid_config_path",
+    "_check_duplicates",
+)
+
+
+class ConfigCache:
+    """Memoize the configs resolved by an ``OmegaConfigLoader``.
+
+    Resolved configs are kept per run environment and config key. Config files
+    are also kept parsed with their modification stamp, so resolving a key again
+    after one of its files changed only reads that file and merges the others
+    from memory.
+
+    Resolved configs are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, config_loader):
+        self.config_loader = config_loader
+        self._resolved: Dict[Tuple[str, str], Any] = {}
+        self._fragments: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+        self._read_dir_configs = None
+        if getattr(config_loader, "_protocol", None) == "file" and all(
+            hasattr(config_loader, name) for name in READ_DIR_MEMBERS
+        ):
+            # Files read from the local disk are cached one by one, other
+            # protocols and Kedro versions without these members are only memoized
+            self._read_dir_configs = config_loader._read_dir_configs
+            config_loader._read_dir_configs = self._read_cached_dir_configs
+
+    @property
+    def env(self) -> str:
+        return self.config_loader.env or self.config_loader.default_run_env
+
+    def __getitem__(self, key: str) -> Any:
+        cache_key = (self.env, key)
+        STATS.cache("configs", hit=cache_key in self._resolved)
+        if cache_key not in self._resolved:
+            self._resolved[cache_key] = self.config_loader[key]
+        return self._resolved[cache_key]
+
+    def clear(self):
+        self._resolved.clear()
+        self._fragments.clear()
+
+    def invalidate(self, paths: Iterable[str]) -> bool:
+        """Forget the files at ``paths`` and every config that may read them.
+
+        Returns whether any config file was affected.
+        """
+        affected = False
+        for path in paths:
+            path = Path(path)
+            self._fragments.pop(path, None)
+            keys = self.keys_reading(path)
+            if not keys:
+                continue
+            affected = True
+            if "globals" in keys:
+                # Globals can be interpolated into any other config
+                self._resolved.clear()
+                continue
+            for cache_key in [cache_key for cache_key in self._resolved if cache_key[1] in keys]:
+                del self._resolved[cache_key]
+        return affected
+
+    def keys_reading(self, path: Path) -> Set[str]:
+        """The config keys whose patterns match the file at ``path``."""
+        try:
+            relative = path.relative_to(self.config_loader.conf_source)
+        except ValueError:
+            return set()
+        if len(relative.parts) < 2:
+            return set()
+        # Patterns are relative to the environment directory
+        relative_path = Path(*relative.parts[1:]).as_posix()
+        return {
+            key
+            for key, patterns in self.config_loader.config_patterns.items()
+            if any(_matches(relative_path, pattern) for pattern in patterns)
+        }
+
+    def _read_cached_dir_configs(
+        self, conf_path, patterns, key, processed_files, read_environment_variables=False
+    ):
+        """``OmegaConfigLoader._read_dir_configs`` reusing the files parsed before."""
+        loader = self.config_loader
+        if read_environment_variables or not os.path.isdir(conf_path):
+            # Credentials are resolved on read, missing directories raise in Kedro
+            return self._read_dir_configs(
+                conf_path, patterns, key, processed_files, read_environment_variables
+            )
+
+        paths = set()
+        for pattern in patterns:
+            for each in loader._fs.glob(Path(f"{conf_path!s}/{pattern}").as_posix()):
+                if not getattr(loader, "ignore_hidden", True) or not loader._is_hidden(each):
+                    paths.add(Path(each))
+
+        config_per_file = {}
+        try:
+            for path in paths:
+                if loader._is_valid_config_path(path):
+                    # Merging mutates the configs, the cached ones are kept pristine
+                    config_per_file[path] = copy.deepcopy(self._read_fragment(path))
+        except Exception:
+            # Let Kedro read the directory again to raise its own error
+            return self._read_dir_configs(
+                conf_path, patterns, key, processed_files, read_environment_variables
+            )
+        processed_files.update(config_per_file)
+        loader._check_duplicates(key, config_per_file)
+        return config_per_file
+
+    def _read_fragment(self, path: Path) -> Any:
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._fragments.get(path)
+        hit = cached is not None and cached[0] == stamp
+        STATS.cache("config_files", hit)
+        if hit:
+            return cached[1]
+        from omegaconf import OmegaConf
+
+        with self.config_loader._fs.open(path.as_posix()) as config_file:
+            config = OmegaConf.load(io.StringIO(config_file.read().decode("utf8")))
+        self._fragments[path] = (stamp, config)
+        return config
+
+
+class FilePositions(NamedTuple):
+    """The keys of a config file and where they are."""
+
+    stamp: Tuple[int, int]
+    config: Any
+    # Key path, e.g. ("model", "alpha"), to the position of the key
+    positions: Dict[Tuple[Any, ...], NodePosition]
+    # Dotted key path, e.g. "model.alpha", to the position of the key
+    dotted: Dict[str, NodePosition]
+
+
+class ConfigPositionIndex:
+    """Positions of every key of the config files, indexed per file.
+
+    A file is parsed once and kept with its modification stamp. It is parsed
+    again only after it changed on disk, so lookups are dictionary accesses.
+    """
+
+    def __init__(self):
+        self._files: Dict[Path, FilePositions] = {}
+
+    def get(self, path: Path) -> FilePositions:
+        """The key positions of the file at ``path``, empty if it cannot be read."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._files.pop(path, None)
+            return FilePositions((0, 0), None, {}, {})
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(path)
+        hit = cached is not None and cached.stamp == stamp
+        STATS.cache("config_positions", hit)
+        if hit:
+            return cached
+
+        try:
+            config, positions = load_with_positions(Path(path).read_text(encoding="utf8"))
+        except Exception:
+            # Broken files are indexed empty until they change again
+            config, positions = None, {}
+        self._files[path] = FilePositions(stamp, config, positions, _dotted(positions))
+        return self._files[path]
+
+    def invalidate(self, paths: Iterable[str]):
+        for path in paths:
+            self._files.pop(Path(path), None)
+
+    def dump(self) -> Dict[str, Any]:
+        """The indexed files as JSON data for the IndexCache.
+
+        Files whose config does not survive a JSON round trip, e.g. with dates or
+        non-string keys, are left out and parsed again after a restart.
+        """
+        files = {}
+        for path, file_positions in self._files.items():
+            if not _is_json_data(file_positions.config) or not all(
+                _is_json_data(list(key_path)) for key_path in file_positions.positions
+            ):
+                continue
+            files[str(path)] = {
+                "stamp": list(file_positions.stamp),
+                "config": file_positions.config,
+                "positions": [
+                    [list(key_path), list(position)]
+                    for key_path, position in file_positions.positions.items()
+                ],
+            }
+        return files
+
+    def restore(self, files: Dict[str, Any]):
+        """Index the files dumped by a previous server, they are checked on first use."""
+        for path, entry in files.items():
+            try:
+                positions = {
+                    tuple(key_path): NodePosition(*position)
+                    for key_path, position in entry["positions"]
+                }
+                stamp = tuple(entry["stamp"])
+                config = entry["config"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            self._files.setdefault(
+                Path(path), FilePositions(stamp, config, positions, _dotted(positions))
+            )
+
+
+def _dotted(positions: Dict[Tuple[Any, ...], NodePosition]) -> Dict[str, NodePosition]:
+    dotted = {}
+    for key_path, position in positions.items():
+        dotted.setdefault(".".join(str(part) for part in key_path), position)
+    return dotted
+
+
+def _is_json_data(value: Any) -> bool:
+    """Whether ``value`` is loaded back from JSON as it is."""
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _is_json_data(item) for key, item in value.items())
+    if isinstance(value, list):
+        return all(_is_json_data(item) for item in value)
+    return value is None or isinstance(value, (str, int, float))
+
+
+def _matches(path: str, pattern: str) -> bool:
+    # "**/" also matches files directly in the environment directory, as in glob
+    return fnmatch(path, pattern) or (pattern.startswith("**/") and fnmatch(path, pattern[3:]))
@@ -0,0 +1,129 @@
+"""Catalog entries no pipeline uses and pipeline inputs missing from the catalog.
+
+The dataset names of the catalog are joined with the datasets read and written
+by the nodes of the pipeline graph. Both sides report the names they changed,
+the catalog as the difference between its old and new entries and the pipeline
+graph as the datasets of the files it parsed again, and only those names are
+looked up again. An edit costs the datasets it touched rather than a scan of
+every catalog and pipeline file.
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from pipeline_index import PipelineGraphIndex, is_parameter
+
+UNUSED = "unused"
+UNDEFINED = "undefined"
+
+
+class UsageWarning(NamedTuple):
+    """A dataset flagged by the join, at one place it is written in."""
+
+    kind: str
+    dataset: str
+    path: Path
+    line: int
+    character: int
+
+    @property
+    def message(self) -> str:
+        if self.kind == UNUSED:
+            return f"Dataset '{self.dataset}' is not used by any pipeline."
+        return (
+            f"Dataset '{self.dataset}' is not in the catalog and is not the output of any node."
+        )
+
+
+class DatasetUsageIndex:
+    """Unused catalog entries and undefined pipeline inputs, kept per dataset.
+
+    A catalog entry is unused when no node reads or writes it. A node input is
+    undefined when it is not a parameter, is not in the catalog, no node writes
+    it and no factory pattern generates it, i.e. when a run would fail to find
+    it.
+    """
+
+    def __init__(self):
+        # Dataset names of the catalog and its factory patterns, as last joined
+        self.catalog: Set[str] = set()
+        self.patterns: Optional[Tuple[str, ...]] = None
+        self._warnings: Dict[str, List[UsageWarning]] = {}
+        # File -> datasets with a warning in it
+        self._paths: Dict[Path, Set[str]] = {}
+        # Every file given a warning so far, including the ones cleared since
+        self.reported_paths: Set[Path] = set()
+
+    def warnings(self, path: Path) -> List[UsageWarning]:
+        """The warnings of the file at ``path``, in document order."""
+        return sorted(
+            (
+                warning
+                for dataset in self._paths.get(Path(path), ())
+                for warning in self._warnings.get(dataset, ())
+                if warning.path == Path(path)
+            ),
+            key=lambda warning: (warning.line, warning.character),
+        )
+
+    def datasets_in(self, paths: Iterable[str]) -> Set[str]:
+        """The datasets with a warning in one of the files at ``paths``."""
+        return {dataset for path in paths for dataset in self._paths.get(Path(path), ())}
+
+    def update(
+        self,
+        catalog: Set[str],
+        patterns: Tuple[str, ...],
+        graph: PipelineGraphIndex,
+        names: Iterable[str],
+        locate_entry: Callable[[str], List[Tuple[Path, int, int]]],
+        is_generated: Callable[[str], bool],
+    ) -> Set[Path]:
+        """Join ``names`` again, along with the catalog entries added or removed.
+
+        ``locate_entry`` returns where a catalog entry is written and
+        ``is_generated`` whether a factory pattern generates a dataset. Changing
+        the factory patterns joins every dataset again.
+
+        Returns the files whose warnings changed.
+        """
+        names = set(names) | (self.catalog ^ catalog)
+        if patterns != self.patterns:
+            names |= self.catalog | catalog | graph.datasets() | set(self._warnings)
+        self.catalog = catalog
+        self.patterns = patterns
+
+        changed = set()
+        for name in names:
+            warnings = self._join(name, graph, locate_entry, is_generated)
+            previous = self._warnings.pop(name, [])
+            if warnings:
+                self._warnings[name] = warnings
+            if warnings == previous:
+                continue
+            for warning in previous:
+                self._paths[warning.path].discard(name)
+                changed.add(warning.path)
+            for warning in warnings:
+                self._paths.setdefault(warning.path, set()).add(name)
+                changed.add(warning.path)
+        self.reported_paths |= changed
+        return changed
+
+    def _join(self, name, graph, locate_entry, is_generated) -> List[UsageWarning]:
+        if name in self.catalog:
+            if name.startswith("_") or graph.producers(name) or graph.consumers(name):
+                return []
+            return [
+                UsageWarning(UNUSED, name, path, line, character)
+                for path, line, character in locate_entry(name)
+            ]
+        consumers = graph.consumers(name)
+        if not consumers or is_parameter(name) or graph.producers(name) or is_generated(name):
+            return []
+        return [
+            UsageWarning(UNDEFINED, name, node.path, line, character)
+            for node in consumers
+            for dataset, line, character in node.dataset_positions
+            if dataset == name
+        ]
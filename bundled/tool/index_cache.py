@@ -0,0 +1,153 @@
+"""Indexes of a project kept on disk across server restarts.
+
+Restarting the server, to switch environment or from ``kedro.restart``, would
+otherwise parse every config and pipeline file and validate every catalog
+again. The indexes are written to one JSON file per project in the user cache
+directory and read back when the project is loaded. Each entry carries the
+fingerprint of the file it was built from, a modification stamp or a content
+hash, so entries of files changed since are rebuilt on first use and the rest
+are used as-is.
+
+The file is only read back by the same cache version, server sources, project
+path, Python interpreter, Kedro and kedro-datasets versions and installed
+packages, as dataset imports and validation results depend on them.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Bump when the layout of a section changes
+CACHE_VERSION = 1
+# Seconds after which the cache file of a project not opened since is deleted
+MAX_CACHE_AGE = 30 * 24 * 60 * 60
+# Modules of the server, their validation results are kept in the cache
+SERVER_DIRECTORY = Path(__file__).parent
+
+
+def cache_directory() -> Path:
+    """``KEDRO_LSP_CACHE_DIR``, by default ``kedro-lsp`` in the user cache directory."""
+    directory = os.getenv("KEDRO_LSP_CACHE_DIR")
+    if directory:
+        return Path(directory)
+    if sys.platform == "win32" and os.getenv("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "kedro-lsp" / "Cache"
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "kedro-lsp"
+
+
+def _distribution_version(name: str) -> Optional[str]:
+    # Read from the package metadata, the packages themselves are not imported
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def _installed_packages() -> str:
+    """Fingerprint of the packages installed in the site-packages directories.
+
+    Installing, upgrading or removing a package creates or deletes its
+    ``.dist-info`` directory, which changes the modification time of the
+    site-packages directory holding it.
+    """
+    stamps = []
+    for entry in sys.path:
+        if Path(entry).name not in ("site-packages", "dist-packages"):
+            continue
+        try:
+            stamps.append(f"{entry}:{os.stat(entry).st_mtime_ns}")
+        except OSError:
+            continue
+    return hashlib.sha1("\n".join(stamps).encode("utf-8")).hexdigest()
+
+
+def _server_sources() -> str:
+    """Fingerprint of the server modules, e.g. the validators.
+
+    Updating the extension, or editing the server while developing it, changes
+    the modification stamps of its modules and so the diagnostics they report.
+    """
+    stamps = []
+    for path in sorted(SERVER_DIRECTORY.rglob("*.py")):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        stamps.append(f"{path}:{stat.st_mtime_ns}:{stat.st_size}")
+    return hashlib.sha1("\n".join(stamps).encode("utf-8")).hexdigest()
+
+
+class IndexCache:
+    """The cache file of one project, made of named sections of JSON data.
+
+    Sections are filled by the indexes themselves, this class only checks the
+    key of the file and reads and writes it.
+    """
+
+    def __init__(self, root_path: Path, directory: Optional[Path] = None):
+        self.root_path = Path(root_path)
+        self.directory = Path(directory) if directory is not None else cache_directory()
+        project_hash = hashlib.sha1(str(self.root_path.resolve()).encode("utf-8")).hexdigest()
+        self.path = self.directory / f"{project_hash[:16]}.json"
+        self.sections: Dict[str, Any] = {}
+        self._key: Optional[Dict[str, Any]] = None
+        # Digest of the content last read or written, identical saves are skipped
+        self._digest: Optional[str] = None
+
+    @property
+    def key(self) -> Dict[str, Any]:
+        if self._key is None:
+            self._key = {
+                "version": CACHE_VERSION,
+                "server": _server_sources(),
+                "project": str(self.root_path.resolve()),
+                "python": sys.executable,
+                "kedro": _distribution_version("kedro"),
+                "kedro_datasets": _distribution_version("kedro-datasets"),
+                # e.g. a missing dataset dependency installed since
+                "packages": _installed_packages(),
+            }
+        return self._key
+
+    def load(self) -> bool:
+        """Read the sections from disk, returns whether the file matched the key."""
+        try:
+            content = self.path.read_text(encoding="utf8")
+            data = json.loads(content)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(data, dict) or data.get("key") != self.key:
+            return False
+        self.sections = data.get("sections") or {}
+        self._digest = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        return True
+
+    def save(self) -> bool:
+        """Write the sections to disk unless nothing changed, returns whether it wrote."""
+        content = json.dumps({"key": self.key, "sections": self.sections}, separators=(",", ":"))
+        digest = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        if digest == self._digest:
+            return False
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Written aside and moved, a server killed mid-write leaves the previous file
+        temporary_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        temporary_path.write_text(content, encoding="utf8")
+        os.replace(temporary_path, self.path)
+        self._digest = digest
+        self._prune()
+        return True
+
+    def _prune(self):
+        expiry = time.time() - MAX_CACHE_AGE
+        for path in self.directory.glob("*.json"):
+            try:
+                if path.stat().st_mtime < expiry:
+                    path.unlink()
+            except OSError:
+                pass
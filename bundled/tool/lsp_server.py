@@ -4,7 +4,15 @@
 
 from __future__ import annotations
 
+import time
+
+# Taken first so the import profile covers the whole server
+SERVER_IMPORT_START = time.perf_counter()
+
+import asyncio
+import contextlib
 import glob
+import hashlib
 import importlib
 import json
 import logging
@@ -12,8 +20,11 @@ import os
 import pathlib
 import re
 import sys
+import threading
+from collections import OrderedDict
+from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, Tuple, Optional, List
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Tuple, Optional, List, Set
 
 # Must be set before any Kedro import to prevent kedro.framework.project from
 # overriding the logging config with rich_logging.yml (which breaks pygls).
@@ -34,8 +45,8 @@ update_sys_path(
 )
 after_update_path = sys.path.copy()
 
-logger.warning(f"{before_update_path=}")
-logger.warning(f"{after_update_path=}")
+logger.debug("before_update_path=%s", before_update_path)
+logger.debug("after_update_path=%s", after_update_path)
 # **********************************************************
 # Imports needed for the language server goes below this.
 # **********************************************************
@@ -53,6 +64,9 @@ from lsprotocol.types import (
     WORKSPACE_DID_CHANGE_CONFIGURATION,
     TEXT_DOCUMENT_DID_OPEN,
     TEXT_DOCUMENT_DID_CHANGE,
+    TEXT_DOCUMENT_DIAGNOSTIC,
+    WORKSPACE_DIAGNOSTIC,
+    WORKSPACE_DIAGNOSTIC_REFRESH,
     CompletionItem,
     CompletionList,
     CompletionOptions,
@@ -64,6 +78,7 @@ from lsprotocol.types import (
     MarkupContent,
     MarkupKind,
     Position,
+    TextDocumentSyncKind,
     Range,
     TextDocumentPositionParams,
     DidOpenTextDocumentParams,
@@ -77,105 +92,883 @@ from lsprotocol.types import (
     DidChangeWatchedFilesRegistrationOptions,
     FileSystemWatcher,
     WatchKind,
+    DiagnosticOptions,
+    DocumentDiagnosticParams,
+    RelatedFullDocumentDiagnosticReport,
+    RelatedUnchangedDocumentDiagnosticReport,
+    WorkspaceDiagnosticParams,
+    WorkspaceDiagnosticReport,
+    WorkspaceFullDocumentDiagnosticReport,
+    WorkspaceUnchangedDocumentDiagnosticReport,
 )
 from pygls import uris, workspace
 from pygls.workspace import TextDocument
 
 """Kedro Language Server."""
-import yaml
-from _lsp_server import DummyDataCatalog, SafeLineLoader
-from kedro.config import OmegaConfigLoader
-from kedro.framework.hooks.manager import _NullPluginManager
-from kedro.framework.session import KedroSession
-from kedro.framework.startup import (
-    ProjectMetadata,
-    bootstrap_project,
+from _lsp_server import DummyDataCatalog, PatternMatch
+from catalog_document import CatalogDocument
+from client_log import ClientLog
+from config_cache import ConfigCache, ConfigPositionIndex
+from dataset_usage import DatasetUsageIndex
+from index_cache import IndexCache
+from lsprotocol.converters import get_converter
+from pipeline_index import (
+    PipelineGraphIndex,
+    PipelineReferenceIndex,
+    find_registered_pipelines,
+    registry_files,
 )
-from kedro.io import DataCatalog
+from pygls.protocol import LanguageServerProtocol
+from profiler import ServerProfiler
 from pygls.server import LanguageServer
+from server_stats import STATS
+from symbol_index import DATASET, PARAMETER, PATTERN, PIPELINE, Symbol, SymbolIndex
+
+if TYPE_CHECKING:
+    # Kedro is imported when a project is bootstrapped, after the server replied
+    # to the client, see _bootstrap_project
+    from kedro.config import OmegaConfigLoader
+    from kedro.framework.session import KedroSession
+    from kedro.framework.startup import ProjectMetadata
 
 # Import validators
 from validators import (
+    CatalogValidationEngine,
     FactoryPatternValidator,
     DatasetConfigValidator,
     FullCatalogValidator,
     create_diagnostic,
 )
 
+SERVER_IMPORT_TIME = time.perf_counter() - SERVER_IMPORT_START
+# Set KEDRO_LSP_PROFILE_IMPORTS=1 to log the time spent importing the server and Kedro,
+# PYTHONPROFILEIMPORTTIME=1 breaks it down further into every module imported
+PROFILE_IMPORTS = os.getenv("KEDRO_LSP_PROFILE_IMPORTS", "0") not in ("", "0")
+# Lazy import name -> seconds spent the first time it was imported
+IMPORT_TIMES: Dict[str, float] = {}
 
-class KedroLanguageServer(LanguageServer):
-    """Store Kedro-specific information in the language server."""
 
-    project_metadata: Optional[ProjectMetadata] = None
+@contextlib.contextmanager
+def profile_import(name: str):
+    """Time the imports in the block the first time it runs, logged when profiling imports."""
+    if name in IMPORT_TIMES:
+        yield
+        return
+    start = time.perf_counter()
+    yield
+    IMPORT_TIMES[name] = time.perf_counter() - start
+    if PROFILE_IMPORTS:
+        log_always(f"Import profile: {name} imported in {IMPORT_TIMES[name] * 1000:.1f} ms")
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.context = None
-        self.config_loader = None
-        self.dummy_catalog = None
-        self.run_env = None
+
+class DiagnosticsStore:
+    """Remember a fingerprint of the diagnostics last published for each URI.
+
+    Publishing the same diagnostics again costs a JSON-RPC notification and a
+    re-render in the client for nothing, so identical sets are suppressed. An
+    empty set is only sent to clear diagnostics that were published before.
+    """
+
+    def __init__(self):
+        self._published: Dict[str, int] = {}
+        # uri -> (result_id, diagnostics) of the last computed report
+        self._results: Dict[str, Tuple[str, List[Diagnostic]]] = {}
+        # uri -> (file stamp, result_id) of the last report computed from disk content
+        self._stamps: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+    @staticmethod
+    def result_id(content: str) -> str:
+        """Identify a computed report by the content it was computed from."""
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def get_result(self, uri: str, result_id: str) -> Optional[List[Diagnostic]]:
+        """Diagnostics computed for ``uri`` with ``result_id``, if still cached."""
+        cached = self._results.get(uri)
+        if cached is not None and cached[0] == result_id:
+            return cached[1]
+        return None
+
+    def set_result(self, uri: str, result_id: str, diagnostics: List[Diagnostic]):
+        self._results[uri] = (result_id, diagnostics)
+
+    def stamped_result_id(self, uri: str, stamp: Optional[Tuple[int, int]]) -> Optional[str]:
+        """The result id of the disk content of ``uri``, if the file has not changed since."""
+        cached = self._stamps.get(uri)
+        if stamp is not None and cached is not None and cached[0] == stamp:
+            return cached[1]
+        return None
+
+    def set_stamp(self, uri: str, stamp: Optional[Tuple[int, int]], result_id: str):
+        if stamp is None:
+            self._stamps.pop(uri, None)
+        else:
+            self._stamps[uri] = (stamp, result_id)
+
+    def forget(self, uri: str):
+        self._results.pop(uri, None)
+        self._stamps.pop(uri, None)
+
+    def results(self) -> Dict[str, Tuple[str, List[Diagnostic]]]:
+        """The last computed report of every URI."""
+        return dict(self._results)
+
+    def uris(self) -> Set[str]:
+        """The URIs with a computed report or published diagnostics."""
+        return set(self._results) | set(self._published)
+
+    @staticmethod
+    def fingerprint(diagnostics: List[Diagnostic]) -> int:
+        return hash(
+            tuple(
+                (
+                    diagnostic.range.start.line,
+                    diagnostic.range.start.character,
+                    diagnostic.range.end.line,
+                    diagnostic.range.end.character,
+                    diagnostic.severity,
+                    diagnostic.source,
+                    diagnostic.message,
+                )
+                for diagnostic in diagnostics
+            )
+        )
+
+    def has_changed(self, uri: str, diagnostics: List[Diagnostic]) -> bool:
+        """Record the diagnostics for ``uri`` and return whether they need publishing."""
+        previous = self._published.get(uri)
+        if not diagnostics:
+            self._published.pop(uri, None)
+            return previous is not None
+        fingerprint = self.fingerprint(diagnostics)
+        if previous == fingerprint:
+            return False
+        self._published[uri] = fingerprint
+        return True
+
+
+class ProjectState(Enum):
+    """Lifecycle of a KedroProject."""
+
+    UNINITIALIZED = "uninitialized"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class EnvironmentSnapshot:
+    """The config of a project resolved for one run environment."""
+
+    def __init__(self, run_env: str, context, config_loader: OmegaConfigLoader, lock=None):
+        self.run_env = run_env
+        # Only created on demand, see KedroProject.load_context
+        self.context = context
+        self.config_loader = config_loader
+        self.config_cache = ConfigCache(config_loader)
+        # Config resolution registers process-global OmegaConf resolvers
+        self._lock = lock or threading.RLock()
+        self._dummy_catalog = None
+        self._is_stale = True
+
+    @property
+    def dummy_catalog(self):
+        """The catalog and parameters of the environment, rebuilt after a config change."""
+        if self._is_stale:
+            with self._lock:
+                if self._is_stale:
+                    self._dummy_catalog = self._get_dummy_catalog()
+                    self._is_stale = False
+        return self._dummy_catalog
+
+    def invalidate(self, paths: List[str]):
+        if self.config_cache.invalidate(paths):
+            self._is_stale = True
+
+    def _get_dummy_catalog(self):
+        try:
+            # '**/catalog*' reads modular pipeline configs
+            conf_catalog = self.config_cache["catalog"]
+            params = self.config_cache["parameters"]
+
+            # The DummyDataCatalog now handles internally
+            catalog = DummyDataCatalog(conf_catalog=conf_catalog, feed_dict=params)
+            return catalog
+        except Exception as e:
+            log_to_output("Failed to create DummyDataCatalog: %s", e)
+            return None
+
+
+class KedroProject:
+    """A Kedro project of the workspace and what the server derived from it.
+
+    The config of the active run environment is kept in an EnvironmentSnapshot,
+    along with the snapshots of the environments used recently or warmed in the
+    background, so switching environment does not bootstrap the project again.
+    """
+
+    def __init__(self, root_path: Path, settings: Dict[str, Any]):
+        self.root_path = root_path
+        self.settings = settings
+        self.project_metadata: Optional[ProjectMetadata] = None
+        self.state = ProjectState.UNINITIALIZED
+        self.failures = 0
+        # time.monotonic() after which a failed project may bootstrap again
+        self.retry_at = 0.0
+        self.snapshot: Optional[EnvironmentSnapshot] = None
+        # run_env -> snapshot, least recently used first
+        self.snapshots: "OrderedDict[str, EnvironmentSnapshot]" = OrderedDict()
+        # (run_env, config key) -> config files, kept until a file is created or deleted
+        self.conf_paths: Dict[Tuple[str, str], List[Path]] = {}
+        self.position_index = ConfigPositionIndex()
+        self.pipeline_index = PipelineReferenceIndex()
+        self._pipeline_graph: Optional[PipelineGraphIndex] = None
+        self.dataset_usage = DatasetUsageIndex()
+        self.symbol_index = SymbolIndex()
+        # URIs of the catalog files under the project, found again once one is created or deleted
+        self.catalog_files: Optional[List[str]] = None
+        # Indexes of the previous server, read back on the first load
+        self.index_cache = IndexCache(root_path)
+        self._index_restored = False
+        # uri -> catalog report of the previous server, until the catalog is validated
+        self.restored_reports: Dict[str, Any] = {}
+        self.last_used = time.monotonic()
+        self._lock = threading.RLock()
 
     def is_kedro_project(self) -> bool:
-        """Returns whether the current workspace is a kedro project."""
+        """Returns whether the project was bootstrapped as a Kedro project."""
         return self.project_metadata is not None
 
-    def _set_project_with_workspace(self):
-        if self.project_metadata:
-            log_to_output("_set_project_with_workspace: already initialized, skipping")
+    @property
+    def package_name(self) -> Optional[str]:
+        return self.project_metadata.package_name if self.project_metadata else None
+
+    @property
+    def context(self):
+        return self.snapshot.context if self.snapshot else None
+
+    @property
+    def config_loader(self) -> Optional[OmegaConfigLoader]:
+        return self.snapshot.config_loader if self.snapshot else None
+
+    @property
+    def config_cache(self) -> Optional[ConfigCache]:
+        return self.snapshot.config_cache if self.snapshot else None
+
+    @property
+    def dummy_catalog(self):
+        return self.snapshot.dummy_catalog if self.snapshot else None
+
+    @property
+    def run_env(self) -> Optional[str]:
+        return self.snapshot.run_env if self.snapshot else None
+
+    def load(self):
+        """Bootstrap the project unless it is loaded, loading or waiting to retry."""
+        if self.state in (ProjectState.READY, ProjectState.LOADING):
+            return
+        if self.state is ProjectState.FAILED and time.monotonic() < self.retry_at:
             return
-        try:
-            self.workspace_settings = next(iter(WORKSPACE_SETTINGS.values()))
-            root_path = pathlib.Path(
-                self.workspace_settings.get("kedroProjectPath") or self.workspace.root_path
-            )  # todo: From language server, can we get it from client initialise response instead?
-            log_to_output(f"_set_project_with_workspace: bootstrapping project at {root_path}")
-            project_metadata = bootstrap_project(root_path)
-            env = None
-            if self.workspace_settings.get("environment"):
-                env = self.workspace_settings.get("environment")
-            session = KedroSession.create(root_path, env=env)
-            # todo: less hacky way to override session hook manager
-            # avoid initialise spark hooks etc
-            session._hook_manager = _NullPluginManager()
-            context = session.load_context()
-            config_loader: OmegaConfigLoader = context.config_loader
-            # context.env is set when KEDRO_ENV or kedro run --env is set
-            run_env = context.env if context.env else config_loader.default_run_env
 
+        self.state = ProjectState.LOADING
+        self.restore_index()
+        try:
+            log_to_output("KedroProject.load: bootstrapping project at %s", self.root_path)
+            project_metadata = _bootstrap_project(self.root_path)
+            snapshot = self._load_environment(
+                self.settings.get("environment") or None, project_metadata.package_name
+            )
         except Exception as e:
-            log_to_output(f"_set_project_with_workspace: FAILED: {e}")
+            log_to_output("KedroProject.load: FAILED: %s", e)
             project_metadata = None
-            context = None
-            config_loader = None
-            run_env = None
+            snapshot = None
         finally:
             self.project_metadata = project_metadata
-            self.context = context
-            self.config_loader = config_loader
-            self.dummy_catalog = self._get_dummy_catalog()
-            self.run_env = run_env
-            log_to_output(f"_set_project_with_workspace: project_metadata={self.project_metadata is not None}, config_loader={self.config_loader is not None}, dummy_catalog={self.dummy_catalog is not None}")
-
-    def _get_dummy_catalog(self):
-        if self.config_loader is None:
+            self.snapshots.clear()
+            self.conf_paths = {}
+            self.snapshot = snapshot
+            if snapshot is not None:
+                self._remember(snapshot)
+            self._set_loaded(snapshot is not None)
+            log_to_output("KedroProject.load: state=%s, config_loader=%s, dummy_catalog=%s", self.state.value, self.config_loader is not None, self.dummy_catalog is not None)
+        if self.is_kedro_project():
+            self.warm_environments(self.settings.get("warmEnvironments") or [])
+
+    def restore_index(self):
+        """Index the files indexed by the previous server, once per project.
+
+        Entries are checked against their file on first use, so only the files
+        changed since the previous server are read again.
+        """
+        if self._index_restored:
+            return
+        self._index_restored = True
+        if not self.index_cache.load():
+            return
+        sections = self.index_cache.sections
+        self.position_index.restore(sections.get("config_positions") or {})
+        self.pipeline_index.restore(sections.get("pipeline_references") or {})
+        self.restored_reports = dict(sections.get("catalog_reports") or {})
+        log_to_output("KedroProject.restore_index: restored indexes from %s", self.index_cache.path)
+
+    def restored_report(self, uri: str, result_id: str) -> Optional[List[Diagnostic]]:
+        """The diagnostics the previous server computed for the same catalog content."""
+        entry = self.restored_reports.pop(uri, None)
+        if not isinstance(entry, dict) or entry.get("result_id") != result_id:
             return None
         try:
-            # '**/catalog*' reads modular pipeline configs
-            conf_catalog = self.config_loader["catalog"]
-            params = self.config_loader["parameters"]
+            return [
+                DIAGNOSTICS_CONVERTER.structure(diagnostic, Diagnostic)
+                for diagnostic in entry["diagnostics"]
+            ]
+        except Exception:
+            return None
 
-            # The DummyDataCatalog now handles internally
-            catalog = DummyDataCatalog(conf_catalog=conf_catalog, feed_dict=params)
-            return catalog
-        except Exception as e:
-            log_to_output(f"Failed to create DummyDataCatalog: {e}")
+    def save_index(self, catalog_reports: Dict[str, Tuple[str, List[Diagnostic]]]):
+        """Write the indexes to disk for the next server, with the reports of its catalogs."""
+        if not self.is_kedro_project():
+            return
+        # Catalogs not validated by this server keep their previous report
+        reports = {
+            uri: entry
+            for uri, entry in self.restored_reports.items()
+            if Path(uris.to_fs_path(uri)).is_file()
+        }
+        for uri, (result_id, diagnostics) in catalog_reports.items():
+            path = Path(uris.to_fs_path(uri))
+            if self.root_path == path or Path(self.root_path) in path.parents:
+                reports[uri] = {
+                    "result_id": result_id,
+                    "diagnostics": DIAGNOSTICS_CONVERTER.unstructure(diagnostics),
+                }
+        self.index_cache.sections = {
+            "config_positions": self.position_index.dump(),
+            "pipeline_references": self.pipeline_index.dump(),
+            "catalog_reports": reports,
+        }
+        try:
+            if self.index_cache.save():
+                log_for_lsp_debug("KedroProject.save_index: saved %s", self.index_cache.path)
+        except (OSError, TypeError, ValueError) as e:
+            log_to_output("KedroProject.save_index: FAILED: %s", e)
+
+    def retry(self):
+        """Let a failed project bootstrap again on the next request, e.g. after a fix."""
+        if self.state is ProjectState.FAILED:
+            self.retry_at = 0.0
+
+    def _set_loaded(self, succeeded: bool):
+        if succeeded:
+            self.state = ProjectState.READY
+            self.failures = 0
+            return
+        # Back off exponentially so a broken project is not bootstrapped on every keystroke
+        self.state = ProjectState.FAILED
+        self.failures += 1
+        delay = min(PROJECT_RETRY_DELAY * 2 ** (self.failures - 1), PROJECT_MAX_RETRY_DELAY)
+        self.retry_at = time.monotonic() + delay
+        log_to_output("KedroProject.load: retrying in %.0fs", delay)
+
+    def has_environment(self, env: Optional[str]) -> bool:
+        """Whether a snapshot of ``env`` is ready, ``None`` being the default environment."""
+        return (env or self._default_run_env()) in self.snapshots
+
+    def switch_environment(self, env: Optional[str]) -> EnvironmentSnapshot:
+        """Make ``env`` the active run environment, reusing its snapshot if there is one."""
+        with self._lock:
+            snapshot = self.snapshots.get(env or self._default_run_env())
+            STATS.cache("environment_snapshots", hit=snapshot is not None)
+            if snapshot is None:
+                log_to_output("KedroProject.switch_environment: loading environment %s", env)
+                snapshot = self._load_environment(env)
+                conf_path = Path(snapshot.config_loader.conf_source) / snapshot.run_env
+                if not conf_path.is_dir():
+                    raise ValueError(f"Configuration path {conf_path} does not exist")
+            self.snapshot = snapshot
+            self._remember(snapshot)
+            self.settings["environment"] = env or ""
+            return snapshot
+
+    def warm_environments(self, envs: List[str]):
+        """Load the snapshots of ``envs`` in a background thread.
+
+        Only as many environments as there are free snapshot slots are loaded,
+        warming never evicts a snapshot.
+        """
+        envs = [env for env in dict.fromkeys(envs) if env not in self.snapshots]
+        free = MAX_ENVIRONMENT_SNAPSHOTS - len(self.snapshots)
+        if len(envs) > free:
+            log_to_output(
+                "KedroProject.warm_environments: skipping %s, only %s environments are kept",
+                envs[max(free, 0):],
+                MAX_ENVIRONMENT_SNAPSHOTS,
+            )
+            envs = envs[:max(free, 0)]
+        if not envs:
+            return
+
+        def _warm():
+            for env in envs:
+                try:
+                    with self._lock:
+                        if env not in self.snapshots and len(self.snapshots) < MAX_ENVIRONMENT_SNAPSHOTS:
+                            self._remember(self._load_environment(env), activate=False)
+                except Exception as e:
+                    log_to_output("KedroProject.warm_environments: %s FAILED: %s", env, e)
+
+        threading.Thread(target=_warm, name="kedro-warm-environments", daemon=True).start()
+
+    def pipeline_graph(self) -> Optional[PipelineGraphIndex]:
+        """The nodes and datasets of the project pipelines, built in a worker on first use."""
+        metadata = self.project_metadata
+        if metadata is None:
+            return None
+        if self._pipeline_graph is None:
+            with self._lock:
+                if self._pipeline_graph is None:
+                    self._pipeline_graph = PipelineGraphIndex(
+                        Path(metadata.source_dir) / metadata.package_name / "pipelines"
+                    )
+        self._pipeline_graph.start()
+        return self._pipeline_graph
+
+    def refresh_pipelines(self, paths: List[str]) -> Set[str]:
+        """Parse the pipeline files at ``paths`` again, if the pipeline graph was built.
+
+        Returns the datasets of the nodes that may have changed.
+        """
+        if self._pipeline_graph is None:
+            return set()
+        return self._pipeline_graph.refresh(paths)
+
+    def update_dataset_usage(self, names: Iterable[str] = ()) -> Set[Path]:
+        """Join the catalog with the pipeline graph again for ``names``.
+
+        Catalog entries added or removed since the last join are joined too.
+        Returns the files whose dataset usage warnings changed.
+        """
+        graph = self.pipeline_graph()
+        catalog = self.dummy_catalog
+        if graph is None or catalog is None:
+            return set()
+        # Catalog entry -> where it is written, read once the join flags an entry
+        entries: Optional[Dict[str, List[Tuple[Path, int, int]]]] = None
+
+        def _locate_entry(name: str) -> List[Tuple[Path, int, int]]:
+            nonlocal entries
+            if entries is None:
+                entries = {}
+                for catalog_path in _get_conf_paths(self, "catalog"):
+                    file_positions = self.position_index.get(catalog_path)
+                    for key_path, position in file_positions.positions.items():
+                        if len(key_path) == 1:
+                            entries.setdefault(key_path[0], []).append(
+                                (catalog_path, position.line, position.character)
+                            )
+            return entries.get(name, [])
+
+        with STATS.timer("dataset_usage/update"):
+            return self.dataset_usage.update(
+                catalog={name for name in catalog.conf_catalog if "{" not in name},
+                patterns=tuple(catalog.pattern_matcher.patterns),
+                graph=graph,
+                names=names,
+                locate_entry=_locate_entry,
+                is_generated=lambda name: catalog.match_pattern(name) is not None,
+            )
+
+    def search_symbols(self, query: str) -> List[Symbol]:
+        """The datasets, parameters, factory patterns and pipelines best matching ``query``.
+
+        Only the config files changed since the last search are read again,
+        from the position index.
+        """
+        sources = []
+        for key in ("catalog", "parameters"):
+            for conf_path in _get_conf_paths(self, key):
+                file_positions = self.position_index.get(conf_path)
+                sources.append((key, conf_path))
+                self.symbol_index.update(
+                    (key, conf_path),
+                    file_positions.stamp,
+                    lambda: _config_symbols(self, key, conf_path, file_positions),
+                )
+        package_dir = Path(self.project_metadata.source_dir) / self.project_metadata.package_name
+        sources.append(PIPELINE)
+        self.symbol_index.update(
+            PIPELINE,
+            # Stamps of every file read, e.g. create_pipeline moved in a pipeline.py
+            tuple(_stamp(path) for path in registry_files(package_dir)),
+            lambda: [
+                Symbol(name, PIPELINE, str(path), line, 0, "pipeline")
+                for name, path, line in find_registered_pipelines(package_dir)
+            ],
+        )
+        self.symbol_index.retain(sources)
+        return self.symbol_index.search(query)
+
+    def reload_config(self, paths: List[str]):
+        """Drop the configs read from ``paths``, snapshots rebuild what depends on them."""
+        self.position_index.invalidate(paths)
+        with self._lock:
+            for snapshot in self.snapshots.values():
+                snapshot.invalidate(paths)
+
+    def forget_conf_paths(self, paths: List[str]):
+        """Drop the config file lists that files created or deleted at ``paths`` belong to."""
+        if self.config_cache is None:
+            self.conf_paths.clear()
+            return
+        keys = set()
+        for path in paths:
+            keys |= self.config_cache.keys_reading(Path(path))
+        for cache_key in [cache_key for cache_key in self.conf_paths if cache_key[1] in keys]:
+            del self.conf_paths[cache_key]
+
+    def load_context(self):
+        """The KedroContext of the active environment, created on first use.
+
+        Bootstrapping only builds the config loader, features that need the
+        full context (hooks are still disabled) escalate through this method.
+        """
+        snapshot = self.snapshot
+        if snapshot is None:
             return None
+        if snapshot.context is None:
+            with self._lock:
+                if snapshot.context is None:
+                    log_to_output("KedroProject.load_context: creating context for %s", snapshot.run_env)
+                    with kedro_settings(self.package_name):
+                        session = _create_session(self.root_path, snapshot.run_env)
+                        snapshot.context = session.load_context()
+        return snapshot.context
+
+    def _load_environment(
+        self, env: Optional[str], package_name: Optional[str] = None
+    ) -> EnvironmentSnapshot:
+        # As KedroSession.create does, KEDRO_ENV applies when no environment is given
+        env = env or os.getenv("KEDRO_ENV")
+        with kedro_settings(package_name or self.package_name):
+            if self.settings.get("loadFullContext"):
+                context = _create_session(self.root_path, env).load_context()
+                config_loader: OmegaConfigLoader = context.config_loader
+            else:
+                context = None
+                config_loader = _create_config_loader(self.root_path, env)
+        run_env = env if env else config_loader.default_run_env
+        snapshot = EnvironmentSnapshot(run_env, context, config_loader, self._lock)
+        # Resolve the catalog and parameters now rather than on the first request
+        snapshot.dummy_catalog
+        return snapshot
+
+    def _default_run_env(self) -> Optional[str]:
+        config_loader = self.config_loader
+        return config_loader.default_run_env if config_loader is not None else None
+
+    def _remember(self, snapshot: EnvironmentSnapshot, activate: bool = True):
+        self.snapshots[snapshot.run_env] = snapshot
+        if activate:
+            self.snapshots.move_to_end(snapshot.run_env)
+        else:
+            self.snapshots.move_to_end(snapshot.run_env, last=False)
+        while len(self.snapshots) > MAX_ENVIRONMENT_SNAPSHOTS:
+            run_env = next(
+                run_env for run_env, kept in self.snapshots.items() if kept is not self.snapshot
+            )
+            del self.snapshots[run_env]
+
+
+def _config_symbols(
+    project: KedroProject, key: str, conf_path: Path, file_positions
+) -> List[Symbol]:
+    """The catalog entries or parameters written in a config file."""
+    try:
+        container = conf_path.relative_to(project.root_path).as_posix()
+    except ValueError:
+        container = conf_path.as_posix()
+    symbols = []
+    for key_path, position in file_positions.positions.items():
+        if not all(isinstance(part, str) for part in key_path):
+            continue
+        if key == "catalog":
+            # Entries starting with "_" are YAML anchors, not datasets
+            if len(key_path) > 1 or key_path[0].startswith("_"):
+                continue
+            name = key_path[0]
+            kind = PATTERN if "{" in name else DATASET
+        else:
+            name = "params:" + ".".join(key_path)
+            kind = PARAMETER
+        symbols.append(
+            Symbol(name, kind, str(conf_path), position.line, position.character, container)
+        )
+    return symbols
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+# Kedro keeps the settings of a single project in process globals, which
+# bootstrap_project() overwrites. Building config loaders and sessions holds
+# this lock with the settings configured for the project being built.
+KEDRO_SETTINGS_LOCK = threading.RLock()
+
+
+@contextlib.contextmanager
+def kedro_settings(package_name: Optional[str]):
+    """Hold the Kedro settings, configured for the project package ``package_name``."""
+    with KEDRO_SETTINGS_LOCK:
+        if package_name is not None:
+            from kedro.framework import project as kedro_project
+
+            if kedro_project.PACKAGE_NAME != package_name:
+                log_to_output("Configuring Kedro settings for %s", package_name)
+                kedro_project.configure_project(package_name)
+        yield
+
+
+def _bootstrap_project(root_path: Path) -> ProjectMetadata:
+    with profile_import("kedro.framework.startup"):
+        from kedro.framework.startup import bootstrap_project
+
+    with KEDRO_SETTINGS_LOCK:
+        return bootstrap_project(root_path)
 
 
-LSP_SERVER = KedroLanguageServer("pygls-kedro-example", "v0.1")
+def _create_config_loader(root_path: Path, env: Optional[str]) -> OmegaConfigLoader:
+    """Build the config loader of a bootstrapped project the way KedroSession does.
+
+    Only ``settings.py`` is read: no session store, hook manager, logging setup
+    or KedroContext is created.
+    """
+    with profile_import("kedro.framework.project"):
+        from kedro.framework.project import settings
+
+    conf_source = str(Path(root_path).expanduser().resolve() / settings.CONF_SOURCE)
+    return settings.CONFIG_LOADER_CLASS(
+        conf_source=conf_source,
+        env=env,
+        runtime_params=None,
+        **settings.CONFIG_LOADER_ARGS,
+    )
+
+
+def _create_session(root_path: Path, env: Optional[str]) -> KedroSession:
+    with profile_import("kedro.framework.session"):
+        from kedro.framework.hooks.manager import _NullPluginManager
+        from kedro.framework.session import KedroSession
+
+    session = KedroSession.create(root_path, env=env)
+    # todo: less hacky way to override session hook manager
+    # avoid initialise spark hooks etc
+    session._hook_manager = _NullPluginManager()
+    return session
+
+
+class _StatsTransport:
+    """Count the bytes written to the client against the method being answered."""
+
+    def __init__(self, transport, sending: threading.local):
+        self._transport = transport
+        self._sending = sending
+
+    def write(self, data):
+        STATS.sent(getattr(self._sending, "method", None) or "other", len(data))
+        self._transport.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._transport, name)
+
+
+class KedroLanguageServerProtocol(LanguageServerProtocol):
+    """Report the size of responses and notifications sent to the client to STATS."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._request_methods: Dict[Any, str] = {}
+        # Method of the message being serialized on each thread
+        self._sending = threading.local()
+
+    def connection_made(self, transport):
+        super().connection_made(_StatsTransport(transport, self._sending))
+
+    def _handle_request(self, msg_id, method_name, params):
+        self._request_methods[msg_id] = method_name
+        super()._handle_request(msg_id, method_name, params)
+
+    def _send_response(self, msg_id, result=None, error=None):
+        self._sending.method = self._request_methods.pop(msg_id, None)
+        try:
+            super()._send_response(msg_id, result, error)
+        finally:
+            self._sending.method = None
+
+    def notify(self, method: str, params=None):
+        self._sending.method = method
+        try:
+            super().notify(method, params)
+        finally:
+            self._sending.method = None
+
+    def send_request(self, method, params=None, callback=None, msg_id=None):
+        self._sending.method = method
+        try:
+            return super().send_request(method, params, callback, msg_id)
+        finally:
+            self._sending.method = None
+
+
+class KedroLanguageServer(LanguageServer):
+    """Store Kedro-specific information in the language server."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Project root -> project, bootstrapped when a request first needs it
+        self.projects: Dict[Path, KedroProject] = {}
+        self.diagnostics_store = DiagnosticsStore()
+        # uri -> catalog parsed block by block, reused across edits. Parameters
+        # files are parsed the same way for their outline
+        self.catalog_documents: Dict[str, CatalogDocument] = {}
+        self.profiler = ServerProfiler()
+        # Stops the profiler at the end of a time window given to kedro.profile
+        self.profiler_timer: Optional[asyncio.TimerHandle] = None
+
+    def feature(self, feature_name: str, options: Optional[Any] = None):
+        """Register an LSP feature, timing each of its calls in STATS."""
+        register = super().feature(feature_name, options)
+
+        def decorator(f):
+            register(STATS.timed(feature_name, f))
+            return f
+
+        return decorator
+
+    def command(self, command_name: str):
+        """Register a command, timing each of its calls in STATS."""
+        register = super().command(command_name)
+
+        def decorator(f):
+            register(STATS.timed(f"command/{command_name}", f))
+            return f
+
+        return decorator
+
+    def project_for(self, uri: Optional[str] = None) -> KedroProject:
+        """The project of the workspace folder containing ``uri``.
+
+        Without a URI, or for documents outside every workspace folder, the
+        project of the first workspace folder is used.
+        """
+        folder, settings = _workspace_settings_for(uri)
+        root_path = Path(settings.get("kedroProjectPath") or folder or self.workspace.root_path)
+        project = self.projects.get(root_path)
+        if project is None:
+            project = self.projects[root_path] = KedroProject(root_path, settings)
+        project.last_used = time.monotonic()
+        self.evict_idle_projects(keep=project)
+        return project
+
+    def evict_idle_projects(self, keep: Optional[KedroProject] = None):
+        """Forget the projects no request needed for ``PROJECT_IDLE_TIMEOUT`` seconds.
+
+        They are bootstrapped again if a request needs them later.
+        """
+        now = time.monotonic()
+        for root_path, project in list(self.projects.items()):
+            if project is not keep and now - project.last_used > PROJECT_IDLE_TIMEOUT:
+                log_to_output("Evicting idle project at %s", root_path)
+                project.save_index(self.diagnostics_store.results())
+                del self.projects[root_path]
+
+    def remove_project(self, root_path: Path):
+        """Forget the project of a removed workspace folder, saving its indexes first.
+
+        The diagnostics of its files are cleared, they are outside the workspace now.
+        """
+        project = self.projects.pop(root_path, None)
+        if project is None:
+            return
+        project.save_index(self.diagnostics_store.results())
+        file_uris = self.diagnostics_store.uris() | {
+            uris.from_fs_path(str(path)) for path in project.dataset_usage.reported_paths
+        }
+        file_uris = [
+            uri
+            for uri in file_uris
+            if Path(uris.to_fs_path(uri)) == root_path or root_path in Path(uris.to_fs_path(uri)).parents
+        ]
+        for uri in file_uris:
+            self.forget_catalog(uri)
+        if self.supports_pull_diagnostics():
+            self.refresh_diagnostics()
+        else:
+            self.publish_diagnostics_batch({uri: [] for uri in file_uris})
+
+    def project_containing(self, uri: str) -> Optional[KedroProject]:
+        """The project loaded so far whose root contains ``uri``, the innermost one."""
+        path = Path(uris.to_fs_path(uri))
+        for root_path in sorted(self.projects, key=lambda root: len(root.parts), reverse=True):
+            if path == root_path or root_path in path.parents:
+                return self.projects[root_path]
+        return None
+
+    def save_indexes(self):
+        """Write the indexes of every project to disk for the next server."""
+        results = self.diagnostics_store.results()
+        for project in list(self.projects.values()):
+            project.save_index(results)
+
+    def forget_catalog(self, uri: str):
+        """Drop everything cached for a catalog file that is gone."""
+        self.diagnostics_store.forget(uri)
+        self.catalog_documents.pop(uri, None)
+
+    def supports_pull_diagnostics(self) -> bool:
+        """Whether the client pulls diagnostics (LSP 3.17) instead of waiting for pushes."""
+        try:
+            return self.client_capabilities.text_document.diagnostic is not None
+        except AttributeError:
+            return False
+
+    def refresh_diagnostics(self):
+        """Ask a pulling client to request diagnostics again."""
+        try:
+            if self.client_capabilities.workspace.diagnostics.refresh_support:
+                self.lsp.send_request(WORKSPACE_DIAGNOSTIC_REFRESH, None)
+        except AttributeError:
+            pass
+
+    def publish_diagnostics(self, uri: str, diagnostics: List[Diagnostic], *args, **kwargs):
+        """Publish diagnostics, skipping sets identical to the last published one."""
+        if not self.diagnostics_store.has_changed(uri, diagnostics):
+            return
+        super().publish_diagnostics(uri, diagnostics, *args, **kwargs)
+
+    def publish_diagnostics_batch(self, batch: Dict[str, List[Diagnostic]]):
+        """Publish the diagnostics of many URIs after they have all been computed.
+
+        Only URIs whose diagnostics changed are sent, which keeps startup and
+        watcher bursts down to the files that actually need re-rendering.
+        """
+        for uri, diagnostics in batch.items():
+            self.publish_diagnostics(uri, diagnostics)
+
+
+# Clients send only the edited ranges, catalogs are re-parsed block by block
+LSP_SERVER = KedroLanguageServer(
+    "pygls-kedro-example",
+    "v0.1",
+    protocol_cls=KedroLanguageServerProtocol,
+    text_document_sync_kind=TextDocumentSyncKind.Incremental,
+)
 ADDITION = re.compile(
     r"^\s*(\d+)\s*\+\s*(\d+)\s*=(?=\s*$)"
 )  # todo: remove this when mature
+# Custom request switching the run environment without restarting the server
+KEDRO_SWITCH_ENVIRONMENT = "kedro/switchEnvironment"
 RE_START_WORD = re.compile(r"[A-Za-z_0-9:\.]*$")
 RE_END_WORD = re.compile(r"^[A-Za-z_0-9:\.]*")
 
@@ -185,13 +978,23 @@ WORKSPACE_SETTINGS = {}
 IS_EXPERIMENTAL = "yes"
 RUNNER = pathlib.Path(__file__).parent / "lsp_runner.py"
 MAX_WORKERS = 5
+# Seconds without requests after which a project is dropped from memory
+PROJECT_IDLE_TIMEOUT = 30 * 60
+# Run environments kept resolved per project, including the active one
+MAX_ENVIRONMENT_SNAPSHOTS = 4
+# Seconds before a project that failed to bootstrap is tried again, doubling on each failure
+PROJECT_RETRY_DELAY = 5
+PROJECT_MAX_RETRY_DELAY = 5 * 60
+# Seconds a request waits for the pipeline graph while it is first built
+PIPELINE_GRAPH_TIMEOUT = 1.0
+# Diagnostics to and from JSON for the index cache
+DIAGNOSTICS_CONVERTER = get_converter()
 
 
 @LSP_SERVER.feature(lsp.INITIALIZE)
 async def initialize(params: lsp.InitializeParams) -> None:
-    log_to_output(f"CWD Server: {os.getcwd()}")
-    paths = "\r\n   ".join(sys.path)
-    log_to_output(f"sys.path used to run Server:\r\n   {paths}")
+    log_to_output("CWD Server: %s", os.getcwd())
+    log_for_lsp_debug("sys.path used to run Server:\r\n   %s", "\r\n   ".join(sys.path))
     GLOBAL_SETTINGS.update(**params.initialization_options.get("globalSettings", {}))
     settings = params.initialization_options["settings"]
     _update_workspace_settings(settings)
@@ -211,16 +1014,46 @@ async def initialize(params: lsp.InitializeParams) -> None:
     log_to_output(
         f"Workspace settings:\r\n{json.dumps(WORKSPACE_SETTINGS, indent=4, ensure_ascii=False)}\r\n"
     )
-    _check_project()
+    if PROFILE_IMPORTS:
+        log_always(f"Import profile: server imported in {SERVER_IMPORT_TIME * 1000:.1f} ms")
+
+
+@LSP_SERVER.feature(lsp.INITIALIZED)
+async def initialized(params: lsp.InitializedParams) -> None:
+    """Bootstrap the project once the client has the server capabilities.
+
+    Kedro is only imported here, so the client is not kept waiting for the
+    initialize response while the project loads.
+    """
+    project = _check_project()
 
     # After initialisation, validate all catalog files
     await validate_all_catalogs(LSP_SERVER)
+    # Saved now too, in case the server is killed rather than shut down
+    LSP_SERVER.save_indexes()
 
-    # Set up file watchers for catalog files
+    # Set up file watchers for catalog files and the rest of the project config
     try:
-        catalog_pattern = FileSystemWatcher(
-            glob_pattern="**/catalog*.y?(a)ml",
-            kind=(WatchKind.Create | WatchKind.Change | WatchKind.Delete)
+        watchers = [
+            FileSystemWatcher(
+                glob_pattern="**/catalog*.y?(a)ml",
+                kind=(WatchKind.Create | WatchKind.Change | WatchKind.Delete)
+            )
+        ]
+        if project.config_loader is not None:
+            conf_dir = Path(project.config_loader.conf_source).name
+            watchers.append(
+                FileSystemWatcher(
+                    glob_pattern=f"**/{conf_dir}/**/*.{{yml,yaml,json}}",
+                    kind=(WatchKind.Create | WatchKind.Change | WatchKind.Delete)
+                )
+            )
+        # Keep the pipeline graph up to date with the saved pipeline files
+        watchers.append(
+            FileSystemWatcher(
+                glob_pattern="**/pipelines/**/*.py",
+                kind=(WatchKind.Create | WatchKind.Change | WatchKind.Delete)
+            )
         )
         await LSP_SERVER.register_capability_async(
             RegistrationParams(
@@ -229,37 +1062,49 @@ async def initialize(params: lsp.InitializeParams) -> None:
                         id="catalogWatcher",
                         method="workspace/didChangeWatchedFiles",
                         register_options=DidChangeWatchedFilesRegistrationOptions(
-                            watchers=[catalog_pattern]
+                            watchers=watchers
                         ),
                     )
                 ]
             )
         )
     except Exception as e:
-        log_to_output(f"File watcher registration not supported by client: {e}")
+        log_to_output("File watcher registration not supported by client: %s", e)
 
 ### Kedro LSP logic
-def _get_conf_paths(server: KedroLanguageServer, key):
+def _get_conf_paths(project: KedroProject, key):
     """
     Get the configuration paths of parameters based on the project metadata.
 
+    The paths are cached per config key until the file watcher reports a
+    config file created or deleted.
+
     Args:
-        project_metadata: The metadata of the project.
+        project: The project holding the config loader.
+        key: The config key, e.g. "parameters" or "catalog".
 
     Returns:
-        A set of configuration paths.
+        A list of configuration paths, run environment first.
 
     """
-    config_loader: OmegaConfigLoader = server.config_loader
+    config_loader: OmegaConfigLoader = project.config_loader
     if config_loader is None:
-        log_to_output(f"_get_conf_paths: config_loader is None")
+        log_to_output("_get_conf_paths: config_loader is None")
         return []
+    cache_key = (project.run_env, key)
+    STATS.cache("conf_paths", hit=cache_key in project.conf_paths)
+    if cache_key not in project.conf_paths:
+        project.conf_paths[cache_key] = _find_conf_paths(project, config_loader, key)
+    return project.conf_paths[cache_key]
+
+
+def _find_conf_paths(project: KedroProject, config_loader: OmegaConfigLoader, key):
     patterns = config_loader.config_patterns.get(key, [])
     # By default is local
-    run_env = str(Path(config_loader.conf_source) / server.run_env)
+    run_env = str(Path(config_loader.conf_source) / project.run_env)
     base_env = str(Path(config_loader.conf_source) / config_loader.base_env)
 
-    log_for_lsp_debug(f"_get_conf_paths: key={key}, patterns={patterns}, run_env={run_env}, base_env={base_env}")
+    log_for_lsp_debug("_get_conf_paths: key=%s, patterns=%s, run_env=%s, base_env=%s", key, patterns, run_env, base_env)
 
     # Extract from OmegaConfigLoader source code
     paths = []
@@ -287,42 +1132,33 @@ def _get_conf_paths(server: KedroLanguageServer, key):
     return paths
 
 
-def _get_param_location(server: KedroLanguageServer, word: str) -> Optional[Location]:
+def _get_param_location(project: KedroProject, word: str) -> Optional[Location]:
     words = word.split("params:")
     if len(words) > 1:
-        words = words[1].split(".")  # ["params:", "a.b.c"]
-        param = words[0]  # Top level key ["a","b","c"]
+        parts = words[1].split(".")  # ["params:", "a.b.c"] -> ["a", "b", "c"]
     else:
         return None
-    log_to_output(f"Attempt to search `{param}` from parameters file")
-
-    # TODO: cache -- we shouldn't have to re-read the file on every request
-    params_paths = _get_conf_paths(server, "parameters")
-    param_line_no = None
-
-    for parameters_file in params_paths:
-        with open(parameters_file) as f:
-            for line_no, line in enumerate(f, 1):
-                if line.startswith(param):
-                    param_line_no = line_no
-                    break
-        if param_line_no is None:
-            continue
-
-        location = Location(
-            uri=parameters_file.resolve().as_uri(),
-            range=Range(
-                start=Position(line=param_line_no - 1, character=0),
-                end=Position(
-                    line=param_line_no,
-                    character=0,
+    log_to_output("Attempt to search `%s` from parameters file", words[1])
+
+    params_files = [
+        (parameters_file, project.position_index.get(parameters_file))
+        for parameters_file in _get_conf_paths(project, "parameters")
+    ]
+    # Fall back to the closest parent key, e.g. for list items or keys set at runtime
+    for end in range(len(parts), 0, -1):
+        dotted = ".".join(parts[:end])
+        for parameters_file, file_positions in params_files:
+            position = file_positions.dotted.get(dotted)
+            if position is None:
+                continue
+            return Location(
+                uri=parameters_file.resolve().as_uri(),
+                range=Range(
+                    start=Position(line=position.line, character=position.character),
+                    end=Position(line=position.end_line, character=position.end_character),
                 ),
-            ),
-        )
-        return location
-
-    if param_line_no is None:
-        return
+            )
+    return None
 
 
 @LSP_SERVER.feature(TEXT_DOCUMENT_DEFINITION)
@@ -330,8 +1166,8 @@ def definition(
     server: KedroLanguageServer, params: TextDocumentPositionParams, word=None
 ) -> Optional[List[Location]]:
     """Support Goto Definition for a dataset or parameter."""
-    _check_project()
-    if not server.is_kedro_project():
+    project = _check_project(params.text_document.uri if params else None)
+    if not project.is_kedro_project():
         return None
 
     def _query_parameter(document, word=None):
@@ -340,12 +1176,12 @@ def definition(
                 params.position, RE_START_WORD, RE_END_WORD
             )
 
-        log_for_lsp_debug(f"Query keyword for params: {word}")
+        log_for_lsp_debug("Query keyword for params: %s", word)
 
         if word.startswith("params:"):
-            param_location = _get_param_location(server, word)
+            param_location = _get_param_location(project, word)
             if param_location:
-                log_for_lsp_debug(f"{param_location=}")
+                log_for_lsp_debug("param_location=%r", param_location)
                 return [param_location]
 
     def _query_catalog(document, word=None):
@@ -353,29 +1189,43 @@ def definition(
             word = document.word_at_position(
                 params.position, RE_START_WORD, RE_END_WORD
             )
-        catalog_paths = _get_conf_paths(server, "catalog")
-        log_for_lsp_debug(f"Attempt to search `{word}` from catalog")
-        log_for_lsp_debug(f"{catalog_paths=}")
+        catalog_paths = _get_conf_paths(project, "catalog")
+        log_for_lsp_debug("Attempt to search `%s` from catalog", word)
+        log_for_lsp_debug("catalog_paths=%r", catalog_paths)
+
+        # Datasets generated by a factory pattern jump to the pattern entry
+        keys = [word]
+        match = _match_factory_pattern(
+            project, document, word, params.position if params else None
+        )
+        if match:
+            keys.append(match.pattern)
+
+        for key in keys:
+            location = _find_catalog_key(catalog_paths, key)
+            if location:
+                return [location]
 
+    def _find_catalog_key(catalog_paths, key):
         for catalog_path in catalog_paths:
-            log_for_lsp_debug(f"    {catalog_path=}")
-            catalog_conf = yaml.load(catalog_path.read_text(), Loader=SafeLineLoader)
-            if not catalog_conf:
+            log_for_lsp_debug("    catalog_path=%r", catalog_path)
+            file_positions = project.position_index.get(catalog_path)
+            if not isinstance(file_positions.config, dict):
                 continue
-            if word in catalog_conf:
-                line = catalog_conf[word]["__line__"]
+            if key in file_positions.config and (key,) in file_positions.positions:
+                line = file_positions.positions[(key,)].line
                 location = Location(
                     uri=catalog_path.resolve().as_uri(),
                     range=Range(
-                        start=Position(line=line - 1, character=0),
+                        start=Position(line=line, character=0),
                         end=Position(
-                            line=line,
+                            line=line + 1,
                             character=0,
                         ),
                     ),
                 )
-                log_for_lsp_debug(f"{location=}")
-                return [location]
+                log_for_lsp_debug("location=%r", location)
+                return location
 
     def _query_pipeline_from_catalog(document, word=None):
         """When in a catalog file, find where the dataset is used in pipeline.py files."""
@@ -383,36 +1233,37 @@ def definition(
         file_path = Path(uris.to_fs_path(document_uri))
 
         # Only do this for catalog YAML files
-        if not (file_path.name.startswith("catalog") and file_path.suffix in {".yml", ".yaml"}):
+        if not _is_catalog(document_uri):
             return None
 
         if not word:
             word = document.word_at_position(params.position, RE_START_WORD, RE_END_WORD)
         # Strip trailing colon from YAML keys (e.g. "shuttles:" -> "shuttles")
         word = word.rstrip(":")
-        log_for_lsp_debug(f"_query_pipeline_from_catalog: word={word}, file={file_path.name}")
+        log_for_lsp_debug("_query_pipeline_from_catalog: word=%s, file=%s", word, file_path.name)
 
+        # Datasets written by a node jump to the node function, the others to their first use
+        producers = _producer_locations(project, word)
+        if producers:
+            return producers
         try:
-            from importlib.resources import files
-            from kedro.framework.project import PACKAGE_NAME
-
-            pipelines_package = files(f"{PACKAGE_NAME}.pipelines")
-            log_for_lsp_debug(f"_query_pipeline_from_catalog: searching in {pipelines_package}")
-
-            for pipeline_file in glob.glob(f"{str(pipelines_package)}/**/*.py", recursive=True):
-                abs_path = Path(pipeline_file).absolute()
-                try:
-                    content = abs_path.read_text(encoding='utf-8').splitlines()
-                    for i, line in enumerate(content):
-                        if f'"{word}"' in line:
-                            return [reference_location(abs_path, i)]
-                except (IOError, UnicodeDecodeError):
-                    continue
+            for pipeline_file in _find_pipeline_files(project):
+                lines = project.pipeline_index.get(pipeline_file).lines.get(word)
+                if lines:
+                    return [reference_location(pipeline_file, lines[0])]
         except Exception as e:
-            log_for_lsp_debug(f"Error searching pipelines from catalog: {e}")
+            log_for_lsp_debug("Error searching pipelines from catalog: %s", e)
 
         return None
 
+    def _query_producer(document, word=None):
+        """Datasets missing from the catalog jump to the function of the node writing them."""
+        if params and _is_catalog(params.text_document.uri):
+            return None
+        if not word:
+            word = document.word_at_position(params.position, RE_START_WORD, RE_END_WORD)
+        return _producer_locations(project, word)
+
     if params:
         document: TextDocument = server.workspace.get_text_document(
             params.text_document.uri
@@ -423,6 +1274,9 @@ def definition(
     if result:
         return result
     result = _query_catalog(document, word)
+    if result:
+        return result
+    result = _query_producer(document, word)
     if result:
         return result
     result = _query_pipeline_from_catalog(document, word)
@@ -433,6 +1287,68 @@ def definition(
     return None
 
 
+def _producer_locations(project: KedroProject, dataset: str) -> Optional[List[Location]]:
+    """Where the functions of the nodes writing ``dataset`` are defined."""
+    graph = project.pipeline_graph()
+    if graph is None or not graph.wait(PIPELINE_GRAPH_TIMEOUT):
+        return None
+    locations = []
+    for node in graph.producers(dataset):
+        if node.function_path is not None:
+            locations.append(reference_location(node.function_path, node.function_line or 0))
+        else:
+            locations.append(reference_location(node.path, node.line))
+    return locations or None
+
+
+def _dataflow_markdown(project: KedroProject, dataset: str) -> Optional[str]:
+    """The nodes writing and reading ``dataset``, for hovers."""
+    graph = project.pipeline_graph()
+    if graph is None or not graph.wait(PIPELINE_GRAPH_TIMEOUT):
+        return None
+    lines = []
+    for label, nodes in (
+        ("Produced by", graph.producers(dataset)),
+        ("Consumed by", graph.consumers(dataset)),
+    ):
+        if nodes:
+            described = ", ".join(f"`{node.name}` ({node.pipeline})" for node in nodes)
+            lines.append(f"**{label}:** {described}")
+    return "  \n".join(lines) or None
+
+
+def _match_factory_pattern(
+    project: KedroProject,
+    document: Optional[TextDocument],
+    word: str,
+    position: Optional[Position] = None,
+) -> Optional[PatternMatch]:
+    """Match a word against the catalog factory patterns.
+
+    Catch-all patterns match every word, so when a document is given the word
+    must be a string literal on its line to count as a dataset name.
+    """
+    if not word or project.dummy_catalog is None:
+        return None
+    if document is not None and position is not None:
+        line = document.lines[position.line] if position.line < len(document.lines) else ""
+        if f'"{word}"' not in line and f"'{word}'" not in line:
+            return None
+    return project.dummy_catalog.match_pattern(word)
+
+
+def _find_pipeline_files(project: KedroProject) -> List[Path]:
+    """The modules under the ``pipelines`` package of the project, modular or flat."""
+    from importlib.resources import files
+
+    # Find pipelines module, the package of the last bootstrapped project may differ
+    pipelines_package = files(f"{project.package_name}.pipelines")
+    return [
+        Path(pipeline_file).absolute()
+        for pipeline_file in glob.glob(f"{str(pipelines_package)}/**/*.py", recursive=True)
+    ]
+
+
 def reference_location(path, line):
     location = Location(
         uri=path.resolve().as_uri(),
@@ -444,7 +1360,7 @@ def reference_location(path, line):
             ),
         ),
     )
-    log_for_lsp_debug(f"{location=}")
+    log_for_lsp_debug("location=%r", location)
     return location
 
 
@@ -453,8 +1369,8 @@ def references(
     server: KedroLanguageServer, params: TextDocumentPositionParams
 ) -> Optional[List[Location]]:
     """Obtain all references to text."""
-    _check_project()
-    if not server.is_kedro_project():
+    project = _check_project(params.text_document.uri)
+    if not project.is_kedro_project():
         return None
 
     document: TextDocument = server.workspace.get_text_document(
@@ -462,29 +1378,9 @@ def references(
     )
     word = document.word_at_position(params.position)
 
-    log_for_lsp_debug(f"Query Reference keyword: {word}")
+    log_for_lsp_debug("Query Reference keyword: %s", word)
     word = word.strip(":")
-    from importlib.resources import files
-    from kedro.framework.project import PACKAGE_NAME
-
-    # Find pipelines module
-    pipelines_package = files(f"{PACKAGE_NAME}.pipelines")
-
-    # Iterate on pipelines/**/*.py that fits both modular or flat pipeline structure.
-    result = []
-    for pipeline_file in glob.glob(f"{str(pipelines_package)}/**/*.py", recursive=True):
-        # Ensure the path is absolute
-        abs_pipeline_file = Path(pipeline_file).absolute()
-        
-        try:
-            # Read the file using Path
-            content = abs_pipeline_file.read_text(encoding='utf-8').splitlines()
-            for i, line in enumerate(content):
-                if f'"{word}"' in line:
-                    result.append((abs_pipeline_file, i))
-        except (IOError, UnicodeDecodeError) as e:
-            log_for_lsp_debug(f"Error reading file {abs_pipeline_file}: {e}")
-            continue
+    result = project.pipeline_index.find(_find_pipeline_files(project), word)
 
     locations = []
     if result:
@@ -503,19 +1399,26 @@ def completions(server: KedroLanguageServer, params: CompletionParams):
     i.e. pipelines (completion)
     may actually just load it from DataCatalog
     """
-    _check_project()
+    project = _check_project(params.text_document.uri)
     # Experimental feature that only enabled if the flag is on.
     if not IS_EXPERIMENTAL:
         return None
-    if not server.is_kedro_project():
+    if not project.is_kedro_project():
         return None
     if not _is_pipeline(params.text_document.uri):
         return
 
     completion_items = []
-    for item in server.dummy_catalog.list():
+    for item in project.dummy_catalog.list():
         completion_items.append(CompletionItem(label=item))
 
+    # Datasets generated by factory patterns cannot be listed upfront, offer the
+    # ones resolved so far by hover and definition requests
+    for name, pattern in project.dummy_catalog.pattern_matcher.resolved_names():
+        completion_items.append(
+            CompletionItem(label=name, detail=f"Factory pattern: {pattern}")
+        )
+
     return CompletionList(
         is_incomplete=False,
         items=completion_items,
@@ -526,10 +1429,10 @@ def completions(server: KedroLanguageServer, params: CompletionParams):
 def hover(ls: KedroLanguageServer, params: HoverParams):
     import pprint
 
-    _check_project()
-    if not ls.is_kedro_project():
+    project = _check_project(params.text_document.uri)
+    if not project.is_kedro_project():
         return None
-    if ls.dummy_catalog is None:
+    if project.dummy_catalog is None:
         return None
 
     pos = params.position
@@ -540,34 +1443,232 @@ def hover(ls: KedroLanguageServer, params: HoverParams):
 {text}
 ```"""
 
+    def _hover(value):
+        return Hover(
+            contents=MarkupContent(kind=MarkupKind.Markdown, value=value),
+            range=Range(
+                start=Position(line=pos.line, character=0),
+                end=Position(line=pos.line + 1, character=0),
+            ),
+        )
+
+    document = ls.workspace.get_text_document(document_uri)
+    if _is_catalog(document_uri):
+        # Datasets of the catalog show the nodes using them
+        line = document.lines[pos.line] if pos.line < len(document.lines) else ""
+        if line[:1].isspace():
+            return None
+        word = document.word_at_position(params.position, RE_START_WORD, RE_END_WORD)
+        dataflow = _dataflow_markdown(project, word.rstrip(":"))
+        return _hover(dataflow) if dataflow else None
     if not _is_pipeline(document_uri):
         return
-    document = ls.workspace.get_text_document(document_uri)
-    catalog = ls.dummy_catalog
+    catalog = project.dummy_catalog
 
     word = document.word_at_position(params.position, RE_START_WORD, RE_END_WORD)
+    match = None
+    hover_content = None
     if not word.startswith("params:"):
         # Search catalog
-        ds = ls.dummy_catalog._datasets.get(word)
-        if not ds:
-            # Not a dataset or does not exist in catalog.yml
-            return
-        hover_content = catalog.conf_catalog.get(word)
+        ds = catalog._datasets.get(word)
+        if ds:
+            hover_content = catalog.conf_catalog.get(word)
+        else:
+            match = _match_factory_pattern(project, document, word, params.position)
+            if match:
+                hover_content = catalog.get_dataset_config(word)
 
     else:
         # parameters
-        hover_content = ls.dummy_catalog.load(word)
+        hover_content = catalog.load(word)
+
+    dataflow = _dataflow_markdown(project, word)
+    if hover_content is None:
+        # Not a dataset of catalog.yml, datasets only passed between nodes still have a dataflow
+        return _hover(dataflow) if dataflow else None
 
     hover_content = pprint.pformat(hover_content, sort_dicts=False)
+    if match:
+        hover_content = f"# Resolved from factory pattern {match.pattern!r}\n{hover_content}"
     highlight = _highlight(hover_content)
+    if dataflow:
+        highlight = f"{highlight}\n\n{dataflow}"
+    return _hover(highlight)
 
-    return Hover(
-        contents=MarkupContent(kind=MarkupKind.Markdown, value=highlight),
-        range=Range(
-            start=Position(line=pos.line, character=0),
-            end=Position(line=pos.line + 1, character=0),
-        ),
-    )
+
+SYMBOL_KINDS = {
+    DATASET: lsp.SymbolKind.Variable,
+    PARAMETER: lsp.SymbolKind.Property,
+    PATTERN: lsp.SymbolKind.TypeParameter,
+    PIPELINE: lsp.SymbolKind.Module,
+}
+
+
+@LSP_SERVER.feature(lsp.WORKSPACE_SYMBOL)
+def workspace_symbol(
+    ls: KedroLanguageServer, params: lsp.WorkspaceSymbolParams
+) -> List[lsp.SymbolInformation]:
+    """Find the datasets, parameters, factory patterns and pipelines of the loaded projects."""
+    _check_project()
+    results = []
+    for project in list(ls.projects.values()):
+        if not project.is_kedro_project():
+            continue
+        for symbol in project.search_symbols(params.query):
+            results.append(
+                lsp.SymbolInformation(
+                    name=symbol.name,
+                    kind=SYMBOL_KINDS[symbol.kind],
+                    location=Location(
+                        uri=Path(symbol.path).resolve().as_uri(),
+                        range=Range(
+                            start=Position(line=symbol.line, character=symbol.character),
+                            end=Position(line=symbol.line, character=symbol.character),
+                        ),
+                    ),
+                    container_name=symbol.container,
+                )
+            )
+    return results
+
+
+def _parsed_config_document(
+    ls: KedroLanguageServer, uri: str
+) -> Tuple[Optional[CatalogDocument], str]:
+    """The parse tree and content of a catalog or parameters file.
+
+    Only the blocks that changed since the file was last parsed are parsed again.
+
+    Catalogs share the document validated for diagnostics, so an outline of a
+    validated catalog does not parse it again.
+    """
+    content = read_catalog_content(ls, uri)
+    if content is None:
+        ls.forget_catalog(uri)
+        return None, ""
+    document = ls.catalog_documents.setdefault(uri, CatalogDocument())
+    document.update(content)
+    return document, content
+
+
+@LSP_SERVER.feature(lsp.TEXT_DOCUMENT_DOCUMENT_SYMBOL)
+def document_symbol(
+    ls: KedroLanguageServer, params: lsp.DocumentSymbolParams
+) -> Optional[List[lsp.DocumentSymbol]]:
+    """Outline a catalog or parameters file, with the dataset type of catalog entries."""
+    uri = params.text_document.uri
+    is_catalog = _is_catalog(uri)
+    if not is_catalog and not _is_parameters(uri):
+        return None
+    document, _ = _parsed_config_document(ls, uri)
+    if document is None:
+        return None
+
+    symbols: Dict[Tuple[Any, ...], lsp.DocumentSymbol] = {}
+    roots = []
+    for key_path, position in _written_positions(document.positions):
+        # Keys of list items hang under the closest mapping key, e.g. "[0].name"
+        parent = key_path[:-1]
+        while parent and parent not in symbols:
+            parent = parent[:-1]
+        name = "".join(
+            f"[{part}]" if isinstance(part, int) else f".{part}" for part in key_path[len(parent):]
+        ).lstrip(".")
+        value = _config_value(document.config, key_path)
+        if not is_catalog:
+            kind, detail = PARAMETER, _scalar_detail(value)
+        elif len(key_path) == 1:
+            kind = PATTERN if "{" in name else DATASET
+            detail = str(value.get("type", "")) if isinstance(value, dict) else ""
+        else:
+            kind, detail = PARAMETER, _scalar_detail(value)
+        symbol = lsp.DocumentSymbol(
+            name=name,
+            detail=detail,
+            kind=SYMBOL_KINDS[kind],
+            range=Range(
+                start=Position(line=position.line, character=position.character),
+                end=Position(line=position.end_line, character=position.end_character),
+            ),
+            selection_range=Range(
+                start=Position(line=position.line, character=position.character),
+                end=Position(line=position.line, character=position.character + len(str(key_path[-1]))),
+            ),
+            children=[],
+        )
+        symbols[key_path] = symbol
+        (symbols[parent].children if parent else roots).append(symbol)
+    return roots
+
+
+@LSP_SERVER.feature(lsp.TEXT_DOCUMENT_FOLDING_RANGE)
+def folding_range(
+    ls: KedroLanguageServer, params: lsp.FoldingRangeParams
+) -> Optional[List[lsp.FoldingRange]]:
+    """Fold the keys of a catalog or parameters file whose value spans several lines."""
+    uri = params.text_document.uri
+    if not _is_catalog(uri) and not _is_parameters(uri):
+        return None
+    document, content = _parsed_config_document(ls, uri)
+    if document is None:
+        return None
+    lines = content.splitlines()
+    ranges = []
+    for _, position in _written_positions(document.positions):
+        # Block values end at the start of the line after them, blank lines included
+        end_line = position.end_line - 1 if position.end_character == 0 else position.end_line
+        while end_line > position.line and not lines[end_line].strip():
+            end_line -= 1
+        if end_line > position.line:
+            ranges.append(lsp.FoldingRange(start_line=position.line, end_line=end_line))
+    return ranges
+
+
+def _written_positions(positions: Dict[Tuple[Any, ...], Any]) -> List[Tuple[Tuple[Any, ...], Any]]:
+    """The keys written in the file, in document order.
+
+    Keys inherited through an alias or a merge key (``<<: *anchor``) are
+    recorded at the anchor, outside the value of the key using it, and are
+    left out along with the keys under them.
+    """
+    written = {}
+    for key_path, position in sorted(positions.items(), key=lambda item: item[1]):
+        parent = key_path[:-1]
+        while parent and parent not in positions:
+            parent = parent[:-1]
+        if parent:
+            if parent not in written:
+                continue
+            parent_position = written[parent]
+            if not (
+                (parent_position.line, parent_position.character)
+                < (position.line, position.character)
+                <= (parent_position.end_line, parent_position.end_character)
+            ):
+                continue
+        written[key_path] = position
+    return list(written.items())
+
+
+def _config_value(config: Any, key_path: Tuple[Any, ...]) -> Any:
+    for part in key_path:
+        try:
+            config = config[part]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return config
+
+
+def _scalar_detail(value: Any) -> str:
+    if isinstance(value, (dict, list)):
+        return ""
+    return str(value)
+
+
+@LSP_SERVER.feature(lsp.SHUTDOWN)
+def shutdown(ls: KedroLanguageServer, params=None) -> None:
+    """Save the indexes before the client stops the server, e.g. to restart it."""
+    ls.save_indexes()
 
 
 @LSP_SERVER.feature(WORKSPACE_DID_CHANGE_CONFIGURATION)
@@ -580,55 +1681,250 @@ def did_change_configuration(
     """
 
 
+@LSP_SERVER.feature(KEDRO_SWITCH_ENVIRONMENT)
+def switch_environment(ls: KedroLanguageServer, params) -> Dict[str, Any]:
+    """Switch the run environment of a project in place.
+
+    Params are ``{"environment": str, "uri": Optional[str]}``, the project is the
+    one of the workspace folder containing ``uri``. Environments used recently or
+    warmed in the background are switched to without loading any config.
+    """
+    project = _check_project(getattr(params, "uri", None))
+    if not project.is_kedro_project():
+        return {"environment": None, "reused": False}
+
+    environment = getattr(params, "environment", None) or None
+    reused = project.has_environment(environment)
+    try:
+        snapshot = project.switch_environment(environment)
+    except Exception as e:
+        log_error(f"Failed to switch to environment {environment}: {e}")
+        # The active environment is unchanged, the client restarts the server instead
+        return {"environment": None, "reused": False, "error": str(e)}
+    log_to_output("Switched to environment %s (reused=%s)", snapshot.run_env, reused)
+    # The catalog of the environment may define other datasets
+    asyncio.ensure_future(analyse_dataset_usage(ls, project))
+    return {"environment": snapshot.run_env, "reused": reused}
+
+
+@LSP_SERVER.feature(lsp.WORKSPACE_DID_CHANGE_WORKSPACE_FOLDERS)
+def did_change_workspace_folders(
+    ls: KedroLanguageServer, params: lsp.DidChangeWorkspaceFoldersParams
+) -> None:
+    """Track workspace folders, their projects are bootstrapped on first use."""
+    for folder in params.event.removed:
+        folder_path = uris.to_fs_path(folder.uri)
+        settings = WORKSPACE_SETTINGS.pop(folder_path, {})
+        root_path = Path(settings.get("kedroProjectPath") or folder_path)
+        ls.remove_project(root_path)
+    for folder in params.event.added:
+        folder_path = uris.to_fs_path(folder.uri)
+        WORKSPACE_SETTINGS.setdefault(
+            folder_path,
+            {
+                "cwd": folder_path,
+                "workspaceFS": folder_path,
+                "workspace": folder.uri,
+                **_get_global_defaults(),
+            },
+        )
+
+
 @LSP_SERVER.feature(TEXT_DOCUMENT_DID_OPEN)
 async def did_open(ls: KedroLanguageServer, params: DidOpenTextDocumentParams):
     """Validate catalog content when a file is opened."""
     document_uri = params.text_document.uri
-    file_path = pathlib.Path(uris.to_fs_path(document_uri))
 
-    # Only validate files with 'catalog' in the name and YAML extensions
-    if not (file_path.name.startswith("catalog") and file_path.suffix in {".yml", ".yaml"}):
+    # Only validate files with 'catalog' in the name and YAML extensions.
+    # Clients supporting pull diagnostics ask for them when they need them.
+    if not _is_catalog(document_uri) or ls.supports_pull_diagnostics():
         return
 
-    document = ls.workspace.get_text_document(document_uri)
-    await validate_catalog_content(ls, document_uri, document.source)
+    await validate_catalog(ls, document_uri)
 
 
 @LSP_SERVER.feature(TEXT_DOCUMENT_DID_CHANGE)
 async def did_change(ls: KedroLanguageServer, params: DidChangeTextDocumentParams):
     """Validate the catalog file live on every change."""
     document_uri = params.text_document.uri
-    file_path = pathlib.Path(uris.to_fs_path(document_uri))
 
     # Only validate files with 'catalog' in the name and YAML extensions
-    if not (file_path.name.startswith("catalog") and file_path.suffix in {".yml", ".yaml"}):
+    if not _is_catalog(document_uri) or ls.supports_pull_diagnostics():
         return
 
-    document = ls.workspace.get_text_document(document_uri)
-    updated_content = document.source  # Live content of the file
-    await validate_catalog_content(ls, document_uri, updated_content)
+    await validate_catalog(ls, document_uri)
+
+
+@LSP_SERVER.feature(
+    TEXT_DOCUMENT_DIAGNOSTIC,
+    DiagnosticOptions(
+        identifier="kedro",
+        # Dataset usage warnings depend on the catalog and the pipeline files
+        inter_file_dependencies=True,
+        workspace_diagnostics=True,
+    ),
+)
+def document_diagnostic(ls: KedroLanguageServer, params: DocumentDiagnosticParams):
+    """Return the diagnostics of a catalog file the client is looking at.
+
+    When the content hash matches ``previous_result_id`` the report is marked
+    unchanged, so the client keeps what it has and nothing is revalidated.
+    """
+    document_uri = params.text_document.uri
+    if not _is_catalog(document_uri) and not _is_pipeline(document_uri):
+        return RelatedFullDocumentDiagnosticReport(items=[])
+
+    result_id, diagnostics = get_document_report(ls, document_uri)
+    if result_id is not None and result_id == params.previous_result_id:
+        return RelatedUnchangedDocumentDiagnosticReport(result_id=result_id)
+    return RelatedFullDocumentDiagnosticReport(items=diagnostics, result_id=result_id)
+
+
+@LSP_SERVER.feature(WORKSPACE_DIAGNOSTIC)
+def workspace_diagnostic(ls: KedroLanguageServer, params: WorkspaceDiagnosticParams):
+    """Return the diagnostics of every catalog file, reusing the client's result ids.
+
+    Pipeline files are included once they were given dataset usage warnings.
+    """
+    _check_project()
+    previous_result_ids = {
+        previous.uri: previous.value for previous in params.previous_result_ids
+    }
+    file_uris = _find_project_catalog_files(ls)
+    for project in list(ls.projects.values()):
+        file_uris.extend(
+            uris.from_fs_path(str(path))
+            for path in project.dataset_usage.reported_paths
+            if not _is_catalog(path.as_uri())
+        )
+    items = []
+    for file_uri in file_uris:
+        result_id, diagnostics = get_document_report(ls, file_uri)
+        if result_id is None:
+            continue
+        if previous_result_ids.get(file_uri) == result_id:
+            items.append(
+                WorkspaceUnchangedDocumentDiagnosticReport(
+                    uri=file_uri, result_id=result_id, version=None
+                )
+            )
+        else:
+            items.append(
+                WorkspaceFullDocumentDiagnosticReport(
+                    uri=file_uri, items=diagnostics, result_id=result_id, version=None
+                )
+            )
+    return WorkspaceDiagnosticReport(items=items)
 
 
 @LSP_SERVER.feature(lsp.WORKSPACE_DID_CHANGE_WATCHED_FILES)
 async def did_change_watched_files(ls: KedroLanguageServer, params: DidChangeWatchedFilesParams):
-    """Handle changes to catalog files."""
-    for change in params.changes:
+    """Handle changes to config and catalog files."""
+    changed_paths = [uris.to_fs_path(change.uri) for change in params.changes]
+    created_or_deleted_paths = [
+        uris.to_fs_path(change.uri)
+        for change in params.changes
+        if change.type in (FileChangeType.Created, FileChangeType.Deleted)
+    ]
+    # Projects ignore the paths outside of their conf source
+    usage_changed_paths = set()
+    for project in list(ls.projects.values()):
+        if any(Path(project.root_path) in Path(path).parents for path in changed_paths):
+            project.retry()
+        project.reload_config(changed_paths)
+        project.forget_conf_paths(created_or_deleted_paths)
+        if any(
+            Path(project.root_path) in Path(path).parents and _is_catalog(uris.from_fs_path(path))
+            for path in created_or_deleted_paths
+        ):
+            project.catalog_files = None
+        # Warnings of the changed files move with their lines
+        names = project.refresh_pipelines(changed_paths)
+        names |= project.dataset_usage.datasets_in(changed_paths)
+        usage_changed_paths |= await update_dataset_usage(project, names)
+    changes = [change for change in params.changes if _is_catalog(change.uri)]
+    if not changes and not usage_changed_paths:
+        return
+    if ls.supports_pull_diagnostics():
+        for change in changes:
+            if change.type == FileChangeType.Deleted:
+                ls.forget_catalog(change.uri)
+        ls.refresh_diagnostics()
+        return
+
+    batch = {
+        uris.from_fs_path(str(path)): get_catalog_diagnostics(ls, uris.from_fs_path(str(path)))
+        for path in usage_changed_paths
+    }
+    for change in changes:
         if change.type in (FileChangeType.Created, FileChangeType.Changed):
-            await validate_catalog(ls, change.uri)
+            batch[change.uri] = get_catalog_diagnostics(ls, change.uri)
         elif change.type == FileChangeType.Deleted:
             # Clear diagnostics for deleted files
-            ls.publish_diagnostics(change.uri, [])
+            ls.forget_catalog(change.uri)
+            batch[change.uri] = []
+    ls.publish_diagnostics_batch(batch)
+
+
+async def update_dataset_usage(project: KedroProject, names: Iterable[str] = ()) -> Set[Path]:
+    """Join the catalog with the pipelines of ``project`` again, see DatasetUsageIndex.
+
+    Returns the files whose dataset usage warnings changed.
+    """
+    if not project.is_kedro_project() or not project.settings.get("datasetUsageDiagnostics", True):
+        return set()
+    graph = project.pipeline_graph()
+    # Built in a worker on first use, the server keeps answering meanwhile
+    await asyncio.get_running_loop().run_in_executor(None, graph.wait)
+    try:
+        return project.update_dataset_usage(names)
+    except Exception as e:
+        log_to_output("Dataset usage analysis FAILED: %s", e)
+        return set()
+
+
+async def analyse_dataset_usage(
+    ls: KedroLanguageServer, project: KedroProject, names: Iterable[str] = ()
+):
+    """Publish the dataset usage warnings that changed, for ``names`` or every dataset."""
+    changed_paths = await update_dataset_usage(project, names)
+    if not changed_paths:
+        return
+    if ls.supports_pull_diagnostics():
+        ls.refresh_diagnostics()
+        return
+    ls.publish_diagnostics_batch(
+        {
+            uris.from_fs_path(str(path)): get_catalog_diagnostics(ls, uris.from_fs_path(str(path)))
+            for path in changed_paths
+        }
+    )
 
 
 async def validate_all_catalogs(ls: KedroLanguageServer):
-    """Validate all catalog files in the workspace."""
+    """Validate all catalog files of the projects bootstrapped so far."""
     _check_project()
-    if not ls.is_kedro_project():
+    if ls.supports_pull_diagnostics():
         return
 
-    catalog_files = find_all_catalog_files(ls.workspace.root_path)
-    for file_uri in catalog_files:
-        await validate_catalog(ls, file_uri)
+    ls.publish_diagnostics_batch(
+        {file_uri: get_catalog_diagnostics(ls, file_uri) for file_uri in _find_project_catalog_files(ls)}
+    )
+
+
+def _find_project_catalog_files(ls: KedroLanguageServer) -> List[str]:
+    """Catalog files of the Kedro projects bootstrapped so far.
+
+    Projects of other workspace folders are bootstrapped lazily, their catalogs
+    are validated once a request needs the project.
+    """
+    catalog_files = []
+    for project in list(ls.projects.values()):
+        if project.is_kedro_project():
+            if project.catalog_files is None:
+                project.catalog_files = find_all_catalog_files(project.root_path)
+            catalog_files.extend(project.catalog_files)
+    return catalog_files
 
 
 def find_all_catalog_files(root_path):
@@ -643,7 +1939,9 @@ def find_all_catalog_files(root_path):
     return catalog_files
 
 
-async def validate_catalog_content(ls: KedroLanguageServer, uri: str, content: str):
+def compute_catalog_diagnostics(
+    content: str, document: Optional[CatalogDocument] = None, max_workers: Optional[int] = None
+) -> List[Diagnostic]:
     """Validate catalog content using a chain of validators.
 
     Strategy:
@@ -654,54 +1952,220 @@ async def validate_catalog_content(ls: KedroLanguageServer, uri: str, content: s
       3. FullCatalogValidator — only runs when DatasetConfigValidator found nothing,
          as a fallback for cross-dataset issues (e.g. conflicts between entries) that
          per-dataset validation cannot detect. Its errors land on line 0.
+
+    Steps 1 and 2 are cached per top-level block of the CatalogDocument, so an edit
+    only validates the blocks it touched. The blocks that need validating share a
+    single CatalogValidationEngine, so the DataCatalog is only built once per pass.
     """
-    diagnostics = []
+    document = document if document is not None else CatalogDocument()
+    max_workers = max_workers if max_workers is not None else _get_validation_workers()
+    parsed = document.update(content)
+    STATS.cache("catalog_blocks", hit=True, count=len(document.blocks) - len(parsed))
+    STATS.cache("catalog_blocks", hit=False, count=len(parsed))
+
+    if document.error is not None:
+        log_error(f"Error parsing catalog content: {document.error}")
+        return [create_diagnostic(
+            range_start=Position(line=0, character=0),
+            range_end=Position(line=0, character=0),
+            message=f"YAML parsing error: {document.error}"
+        )]
 
-    try:
-        catalog_config = yaml.load(content, Loader=SafeLineLoader)
-        if not isinstance(catalog_config, dict):
-            ls.publish_diagnostics(uri, [create_diagnostic(
-                range_start=Position(line=0, character=0),
-                range_end=Position(line=0, character=0),
-                message="Invalid catalog format: root must be a mapping/dictionary"
-            )])
-            return
+    if not isinstance(document.config, dict):
+        return [create_diagnostic(
+            range_start=Position(line=0, character=0),
+            range_end=Position(line=0, character=0),
+            message="Invalid catalog format: root must be a mapping/dictionary"
+        )]
 
-        # Step 1: factory-pattern syntax check (no DataCatalog instantiation)
-        try:
-            diagnostics.extend(FactoryPatternValidator().validate(catalog_config, content))
-        except Exception as e:
-            log_error(f"Error in FactoryPatternValidator: {e}")
+    pending = [block for block in document.blocks if block.diagnostics is None]
+    engine = None
+    if pending:
+        engine = _validate_blocks(document, pending, content, max_workers)
+
+    diagnostics = []
+    for block in document.blocks:
+        diagnostics.extend(
+            _shift_diagnostic(diagnostic, block.start_line) for diagnostic in block.diagnostics
+        )
+
+    if any(block.has_dataset_errors for block in document.blocks):
+        return diagnostics
 
-        # Step 2: per-dataset validation (catches bad types, missing fields, etc.)
-        dataset_errors = []
+    # Step 3: whole-catalog validation as fallback for cross-dataset issues
+    if document.catalog_diagnostics is None:
+        if len(pending) != len(document.blocks):
+            engine = CatalogValidationEngine(document.config, max_workers=max_workers)
         try:
-            dataset_errors = DatasetConfigValidator().validate(catalog_config, content)
+            with STATS.timer("validator/FullCatalogValidator"):
+                document.catalog_diagnostics = FullCatalogValidator().validate(
+                    document.config, content, engine
+                )
         except Exception as e:
-            log_error(f"Error in DatasetConfigValidator: {e}")
-
-        if dataset_errors:
-            diagnostics.extend(dataset_errors)
-        else:
-            # Step 3: whole-catalog validation as fallback for cross-dataset issues
-            try:
-                diagnostics.extend(FullCatalogValidator().validate(catalog_config, content))
-            except Exception as e:
-                log_error(f"Error in FullCatalogValidator: {e}")
+            log_error(f"Error in FullCatalogValidator: {e}")
+            document.catalog_diagnostics = []
+    diagnostics.extend(document.catalog_diagnostics)
+    return diagnostics
+
+
+def _validate_blocks(
+    document: CatalogDocument, blocks, content: str, max_workers: int
+) -> CatalogValidationEngine:
+    """Run the per-dataset validators on ``blocks`` and store the results on each block."""
+    catalog_config = {}
+    for block in blocks:
+        block.diagnostics = []
+        block.has_dataset_errors = False
+        if isinstance(block.config, dict):
+            catalog_config.update(block.config)
+
+    engine = CatalogValidationEngine(catalog_config, max_workers=max_workers)
+
+    # Step 1: factory-pattern syntax check (no DataCatalog instantiation)
+    factory_errors = []
+    try:
+        with STATS.timer("validator/FactoryPatternValidator"):
+            factory_errors = FactoryPatternValidator().validate(catalog_config, content, engine)
+    except Exception as e:
+        log_error(f"Error in FactoryPatternValidator: {e}")
 
+    # Step 2: per-dataset validation (catches bad types, missing fields, etc.)
+    dataset_errors = []
+    try:
+        with STATS.timer("validator/DatasetConfigValidator"):
+            dataset_errors = DatasetConfigValidator().validate(catalog_config, content, engine)
     except Exception as e:
-        log_error(f"Error parsing catalog content: {e}")
-        diagnostics.append(create_diagnostic(
-            range_start=Position(line=0, character=0),
-            range_end=Position(line=0, character=0),
-            message=f"YAML parsing error: {e}"
-        ))
+        log_error(f"Error in DatasetConfigValidator: {e}")
+
+    # Diagnostics are kept relative to their block so they survive line shifts
+    for diagnostic, is_dataset_error in [(d, False) for d in factory_errors] + [
+        (d, True) for d in dataset_errors
+    ]:
+        block = document.block_at(diagnostic.range.start.line)
+        if block is None:
+            continue
+        block.diagnostics.append(_shift_diagnostic(diagnostic, -block.start_line))
+        block.has_dataset_errors = block.has_dataset_errors or is_dataset_error
+    return engine
 
-    ls.publish_diagnostics(uri, diagnostics)
+
+def _shift_diagnostic(diagnostic: Diagnostic, offset: int) -> Diagnostic:
+    if offset == 0:
+        return diagnostic
+    return Diagnostic(
+        range=Range(
+            start=Position(
+                line=diagnostic.range.start.line + offset,
+                character=diagnostic.range.start.character,
+            ),
+            end=Position(
+                line=diagnostic.range.end.line + offset,
+                character=diagnostic.range.end.character,
+            ),
+        ),
+        message=diagnostic.message,
+        severity=diagnostic.severity,
+        source=diagnostic.source,
+    )
 
 
 async def validate_catalog(ls: KedroLanguageServer, uri: str):
-    """Validate a catalog file, preferring in-memory content over disk content."""
+    """Validate a catalog file and publish the diagnostics."""
+    ls.publish_diagnostics(uri, get_catalog_diagnostics(ls, uri))
+
+
+def get_catalog_diagnostics(ls: KedroLanguageServer, uri: str) -> List[Diagnostic]:
+    """Validate a catalog file, preferring in-memory content over disk content.
+
+    The dataset usage warnings of the file are included, pipeline files only have those.
+    """
+    return get_document_report(ls, uri)[1]
+
+
+def get_document_report(ls: KedroLanguageServer, uri: str) -> Tuple[Optional[str], List[Diagnostic]]:
+    """Return the result id and diagnostics of a catalog or pipeline file.
+
+    Catalog files are validated, both get the dataset usage warnings of their
+    project. The result id changes with either.
+    """
+    result_id, diagnostics = "usage", []
+    if _is_catalog(uri):
+        result_id, diagnostics = get_catalog_report(ls, uri)
+        if result_id is None:
+            return None, []
+    usage = dataset_usage_diagnostics(ls, uri)
+    if usage:
+        result_id = f"{result_id}-{DiagnosticsStore.fingerprint(usage) & 0xFFFFFFFFFFFFFFFF:x}"
+        diagnostics = diagnostics + usage
+    return result_id, diagnostics
+
+
+def dataset_usage_diagnostics(ls: KedroLanguageServer, uri: str) -> List[Diagnostic]:
+    """Warnings of the unused catalog entries and undefined node inputs of a file."""
+    project = ls.project_containing(uri)
+    if project is None or not project.settings.get("datasetUsageDiagnostics", True):
+        return []
+    return [
+        create_diagnostic(
+            range_start=Position(line=warning.line, character=warning.character),
+            range_end=Position(
+                line=warning.line, character=warning.character + len(warning.dataset)
+            ),
+            message=warning.message,
+            severity=DiagnosticSeverity.Warning,
+        )
+        for warning in project.dataset_usage.warnings(Path(uris.to_fs_path(uri)))
+    ]
+
+
+def get_catalog_report(ls: KedroLanguageServer, uri: str) -> Tuple[Optional[str], List[Diagnostic]]:
+    """Return the result id and diagnostics of a catalog file.
+
+    Reports are cached per URI and content hash, so unchanged files are not
+    validated again. The result id is ``None`` when the file cannot be read.
+    """
+    # Files not open in the editor are only read again once they changed on disk
+    stamp = None if _is_open(ls, uri) else _stamp(Path(uris.to_fs_path(uri)))
+    result_id = ls.diagnostics_store.stamped_result_id(uri, stamp)
+    if result_id is not None:
+        diagnostics = ls.diagnostics_store.get_result(uri, result_id)
+        if diagnostics is not None:
+            STATS.cache("catalog_reports", hit=True)
+            return result_id, diagnostics
+
+    content = read_catalog_content(ls, uri)
+    if content is None:
+        ls.forget_catalog(uri)
+        return None, []
+
+    result_id = ls.diagnostics_store.result_id(content)
+    ls.diagnostics_store.set_stamp(uri, stamp, result_id)
+    diagnostics = ls.diagnostics_store.get_result(uri, result_id)
+    STATS.cache("catalog_reports", hit=diagnostics is not None)
+    if diagnostics is None:
+        # The previous server may have validated the same content
+        project = ls.project_containing(uri)
+        if project is not None:
+            diagnostics = project.restored_report(uri, result_id)
+            STATS.cache("restored_catalog_reports", hit=diagnostics is not None)
+        if diagnostics is None:
+            document = ls.catalog_documents.setdefault(uri, CatalogDocument())
+            diagnostics = compute_catalog_diagnostics(
+                content, document, max_workers=_get_validation_workers(uri)
+            )
+        ls.diagnostics_store.set_result(uri, result_id, diagnostics)
+    return result_id, diagnostics
+
+
+def _is_open(ls: KedroLanguageServer, uri: str) -> bool:
+    try:
+        return uri in ls.workspace.text_documents
+    except Exception:
+        return False
+
+
+def read_catalog_content(ls: KedroLanguageServer, uri: str) -> Optional[str]:
+    """Read a catalog file, preferring in-memory content over disk content."""
     file_path = pathlib.Path(uris.to_fs_path(uri))
 
     # pygls returns a document object even for unopened files, but source may be empty.
@@ -716,16 +2180,14 @@ async def validate_catalog(ls: KedroLanguageServer, uri: str):
 
     if content is None:
         if not file_path.exists():
-            ls.publish_diagnostics(uri, [])
-            return
+            return None
         try:
             content = file_path.read_text(encoding='utf-8')
         except Exception as e:
             log_error(f"Error reading file {file_path}: {e}")
-            ls.publish_diagnostics(uri, [])
-            return
+            return None
 
-    await validate_catalog_content(ls, uri, content)
+    return content
 
 
 
@@ -743,6 +2205,19 @@ def is_dataset_importable(dataset_type: str) -> Tuple[bool, Optional[str]]:
         return False, "Invalid dataset type format. It should be 'module.ClassName'."
 
 
+def _get_validation_workers(uri: Optional[str] = None) -> int:
+    """Number of threads used to validate the datasets of the catalog at ``uri``.
+
+    The setting of the workspace folder containing ``uri`` applies, the first
+    folder's by default.
+    """
+    _, workspace_settings = _workspace_settings_for(uri)
+    try:
+        return int(workspace_settings.get("validationWorkers", MAX_WORKERS))
+    except (TypeError, ValueError):
+        return MAX_WORKERS
+
+
 def _get_global_defaults():
     return {
         "path": GLOBAL_SETTINGS.get("path", []),
@@ -752,6 +2227,10 @@ def _get_global_defaults():
         "showNotifications": GLOBAL_SETTINGS.get("showNotifications", "off"),
         "environment": GLOBAL_SETTINGS.get("environment", ""),
         "kedroProjectPath": GLOBAL_SETTINGS.get("kedroProjectPath", ""),
+        "validationWorkers": GLOBAL_SETTINGS.get("validationWorkers", MAX_WORKERS),
+        "warmEnvironments": GLOBAL_SETTINGS.get("warmEnvironments", []),
+        "loadFullContext": GLOBAL_SETTINGS.get("loadFullContext", False),
+        "datasetUsageDiagnostics": GLOBAL_SETTINGS.get("datasetUsageDiagnostics", True),
     }
 
 
@@ -788,19 +2267,57 @@ def get_cwd(settings: Dict[str, Any], document: Optional[workspace.Document]) ->
     return settings["cwd"]
 
 
-def _check_project():
+def _check_project(uri: Optional[str] = None) -> KedroProject:
     """This was a workaround because the server.workspace.root_path is not available at __init__ time.
     Ideally there should be some place to inject this logic after client send back the information.
-    For now this function will be triggered for every LSP feature"""
-    LSP_SERVER._set_project_with_workspace()
+    For now this function will be triggered for every LSP feature.
 
-
-def log_for_lsp_debug(msg: str):
-    """The log_to_output is too verbose for now, once the LSP is stable these log should
-    be removed. Default level set as warning otherwise user cannot see the log and report
-    back easily without touching configuration.
+    Returns the project of the workspace folder containing ``uri``, bootstrapping it if needed.
+    Projects are analysed for dataset usage once bootstrapped, whichever folder they are in.
+    """
+    project = LSP_SERVER.project_for(uri)
+    bootstrapping = project.state not in (ProjectState.READY, ProjectState.LOADING)
+    project.load()
+    if bootstrapping and project.state is ProjectState.READY:
+        try:
+            asyncio.get_running_loop().create_task(analyse_dataset_usage(LSP_SERVER, project))
+        except RuntimeError:
+            # Not called from the server's event loop, there is nothing to publish to
+            pass
+    return project
+
+
+def _workspace_settings_for(uri: Optional[str] = None) -> Tuple[Optional[str], Dict[str, Any]]:
+    """The workspace folder containing ``uri`` and its settings, the first folder by default."""
+    if not WORKSPACE_SETTINGS:
+        return None, {}
+    if uri is not None:
+        path = Path(uris.to_fs_path(uri))
+        # The innermost folder wins when workspace folders are nested
+        for folder in sorted(WORKSPACE_SETTINGS, key=len, reverse=True):
+            if path == Path(folder) or Path(folder) in path.parents:
+                return folder, WORKSPACE_SETTINGS[folder]
+    folder = next(iter(WORKSPACE_SETTINGS))
+    return folder, WORKSPACE_SETTINGS[folder]
+
+
+def log_for_lsp_debug(msg: str, *args):
+    """Log ``msg % args`` when the Kedro output channel is set to Debug or Trace.
+
+    These logs are on the paths of every request: pass values as ``args`` so
+    they are only formatted when the message is sent.
     """
-    logger.warning(f"Kedro LSP: {msg}")
+    CLIENT_LOG.debug(msg, *args)
+
+
+def _is_catalog(uri):
+    path = Path(uris.to_fs_path(uri))
+    return path.name.startswith("catalog") and path.suffix in {".yml", ".yaml"}
+
+
+def _is_parameters(uri):
+    path = Path(uris.to_fs_path(uri))
+    return path.name.startswith("parameters") and path.suffix in {".yml", ".yaml"}
 
 
 def _is_pipeline(uri):
@@ -817,6 +2334,63 @@ def _is_pipeline(uri):
 
 
 ###### Commands
+@LSP_SERVER.command("kedro.getServerStats")
+def get_server_stats(ls, args=None):
+    """Counts, latencies and bytes sent per method, cache hit rates and import times."""
+    stats = STATS.snapshot()
+    stats["imports_ms"] = {name: round(seconds * 1000, 3) for name, seconds in IMPORT_TIMES.items()}
+    stats["imports_ms"]["lsp_server"] = round(SERVER_IMPORT_TIME * 1000, 3)
+    return stats
+
+
+@LSP_SERVER.command("kedro.profile")
+def profile_server(ls: KedroLanguageServer, args=None):
+    """Start or stop profiling the server with cProfile.
+
+    Args:
+        args: ``["start"]``, ``["start", seconds]`` to stop after a time window,
+            or ``["stop"]``. The profiler is toggled without arguments.
+
+    Returns:
+        Whether the profiler is running and, once stopped, the paths of the
+        profile and of its text summary, written under ``.kedro/profiles`` of
+        the project or the temporary directory.
+    """
+    action = args[0] if args else ("stop" if ls.profiler.running else "start")
+    if action == "start":
+        if not ls.profiler.running:
+            try:
+                ls.profiler.start()
+            except (RuntimeError, ValueError) as e:
+                log_error(f"Cannot start the profiler: {e}")
+                return {"running": False, "error": str(e)}
+            log_always("Profiling the Kedro language server")
+        seconds = float(args[1]) if args and len(args) > 1 else None
+        if seconds:
+            if ls.profiler_timer is not None:
+                ls.profiler_timer.cancel()
+            ls.profiler_timer = ls.loop.call_later(seconds, _stop_profiler, ls, True)
+        return {"running": True, "stopsIn": seconds}
+    if action == "stop":
+        return _stop_profiler(ls)
+    raise ValueError(f"Unknown kedro.profile action {action!r}, expected 'start' or 'stop'")
+
+
+def _stop_profiler(ls: KedroLanguageServer, notify: bool = False) -> Dict[str, Any]:
+    if ls.profiler_timer is not None:
+        ls.profiler_timer.cancel()
+        ls.profiler_timer = None
+    if not ls.profiler.running:
+        return {"running": False}
+    root_path = ls.project_for().root_path if WORKSPACE_SETTINGS else None
+    profile_path, summary_path = ls.profiler.stop(root_path)
+    log_always(f"Kedro language server profile written to {profile_path}")
+    if notify:
+        # Nobody waits for the result when the time window ends
+        ls.show_message(f"Kedro language server profile written to {summary_path}")
+    return {"running": False, "profile": str(profile_path), "summary": str(summary_path)}
+
+
 @LSP_SERVER.command("kedro.goToDefinitionFromFlowchart")
 def definition_from_flowchart(ls, word):
     """Starts counting down and showing message synchronously.
@@ -868,26 +2442,52 @@ def get_project_data_from_viz(ls, args=None):
 # *****************************************************
 # Logging and notification.
 # *****************************************************
-def log_to_output(
-    message: str, msg_type: lsp.MessageType = lsp.MessageType.Log
-) -> None:
-    LSP_SERVER.show_message_log(message, msg_type)
+# Level of the Kedro output channel, sent by the client as the trace value
+TRACE_LOG_LEVELS = {
+    lsp.TraceValues.Off: logging.WARNING,
+    lsp.TraceValues.Messages: logging.INFO,
+    lsp.TraceValues.Verbose: logging.DEBUG,
+}
+LOG_MESSAGE_TYPES = {
+    logging.DEBUG: lsp.MessageType.Log,
+    logging.INFO: lsp.MessageType.Log,
+    logging.WARNING: lsp.MessageType.Warning,
+    logging.ERROR: lsp.MessageType.Error,
+}
+
+
+def _send_log(level: int, message: str) -> None:
+    LSP_SERVER.show_message_log(message, LOG_MESSAGE_TYPES.get(level, lsp.MessageType.Log))
+
+
+CLIENT_LOG = ClientLog(_send_log)
+
+
+@LSP_SERVER.feature(lsp.SET_TRACE)
+def set_trace(params: lsp.SetTraceParams) -> None:
+    """Follow the log level of the Kedro output channel, which the client sends as trace."""
+    CLIENT_LOG.level = TRACE_LOG_LEVELS.get(params.value, logging.INFO)
+
+
+def log_to_output(message: str, *args) -> None:
+    """Log ``message % args`` unless the Kedro output channel only shows warnings and errors."""
+    CLIENT_LOG.info(message, *args)
 
 
 def log_error(message: str) -> None:
-    LSP_SERVER.show_message_log(message, lsp.MessageType.Error)
+    CLIENT_LOG.error(message)
     if os.getenv("LS_SHOW_NOTIFICATION", "off") in ["onError", "onWarning", "always"]:
         LSP_SERVER.show_message(message, lsp.MessageType.Error)
 
 
 def log_warning(message: str) -> None:
-    LSP_SERVER.show_message_log(message, lsp.MessageType.Warning)
+    CLIENT_LOG.warning(message)
     if os.getenv("LS_SHOW_NOTIFICATION", "off") in ["onWarning", "always"]:
         LSP_SERVER.show_message(message, lsp.MessageType.Warning)
 
 
 def log_always(message: str) -> None:
-    LSP_SERVER.show_message_log(message, lsp.MessageType.Info)
+    CLIENT_LOG.log(logging.INFO, message, force=True)
     if os.getenv("LS_SHOW_NOTIFICATION", "off") in ["always"]:
         LSP_SERVER.show_message(message, lsp.MessageType.Info)
 
@@ -0,0 +1,562 @@
+"""Indexes of the pipeline files of a project.
+
+Finding where a dataset is used means looking for its name as a string literal
+in every pipeline file. The literals of each file are indexed once with the
+file's modification stamp, so a lookup only reads the files that changed.
+
+The nodes of the pipelines, with the datasets they read and write, are read
+from the ``node()`` calls of the same files. They are parsed rather than
+imported, so no project code runs in the server. Nodes wrapped by
+``pipeline()`` calls of the same file are renamed as Kedro does, after their
+namespace and inputs, outputs and parameters mappings.
+"""
+
+import ast
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from server_stats import STATS
+
+# Names the pipeline files call to create a node, e.g. ``from kedro.pipeline import node``
+NODE_FACTORIES = {"node", "Node"}
+# Names the pipeline files call to wrap nodes, e.g. ``pipeline(nodes, namespace="dp")``
+PIPELINE_FACTORIES = {"pipeline", "Pipeline"}
+# Keywords of a pipeline call mapping the names of its datasets
+MAPPING_KEYWORDS = ("inputs", "outputs", "parameters")
+
+
+class FileReferences(NamedTuple):
+    """The double-quoted string literals of a pipeline file."""
+
+    stamp: Tuple[int, int]
+    # Literal, e.g. "companies", to the zero-based lines it is on
+    lines: Dict[str, List[int]]
+
+
+def find_literals(content: str) -> Dict[str, List[int]]:
+    """Lines of the text between every two consecutive double quotes of a line.
+
+    A word is found in a line exactly when ``f'"{word}"' in line``, for the
+    words without double quotes the server looks for.
+    """
+    lines: Dict[str, List[int]] = {}
+    for line_number, line in enumerate(content.splitlines()):
+        if line.count('"') < 2:
+            continue
+        for literal in set(line.split('"')[1:-1]):
+            lines.setdefault(literal, []).append(line_number)
+    return lines
+
+
+class PipelineReferenceIndex:
+    """String literals of the pipeline files, indexed per file."""
+
+    def __init__(self):
+        self._files: Dict[Path, FileReferences] = {}
+
+    def get(self, path: Path) -> FileReferences:
+        """The literals of the file at ``path``, empty if it cannot be read."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._files.pop(path, None)
+            return FileReferences((0, 0), {})
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(path)
+        hit = cached is not None and cached.stamp == stamp
+        STATS.cache("pipeline_references", hit)
+        if hit:
+            return cached
+
+        try:
+            lines = find_literals(Path(path).read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError):
+            lines = {}
+        self._files[path] = FileReferences(stamp, lines)
+        return self._files[path]
+
+    def find(self, paths: Iterable[Path], word: str) -> List[Tuple[Path, int]]:
+        """The files among ``paths`` and lines where ``word`` is a string literal."""
+        return [
+            (path, line) for path in paths for line in self.get(path).lines.get(word, ())
+        ]
+
+    def invalidate(self, paths: Iterable[str]):
+        for path in paths:
+            self._files.pop(Path(path), None)
+
+    def dump(self) -> Dict[str, Any]:
+        """The indexed files as JSON data for the IndexCache."""
+        return {
+            str(path): {"stamp": list(references.stamp), "lines": references.lines}
+            for path, references in self._files.items()
+        }
+
+    def restore(self, files: Dict[str, Any]):
+        """Index the files dumped by a previous server, they are checked on first use."""
+        for path, entry in files.items():
+            try:
+                references = FileReferences(tuple(entry["stamp"]), dict(entry["lines"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+            self._files.setdefault(Path(path), references)
+
+
+def is_parameter(name: str) -> bool:
+    return name == "parameters" or name.startswith("params:")
+
+
+class Remap(NamedTuple):
+    """The namespace and dataset mapping of a ``pipeline()`` call."""
+
+    namespace: Optional[str]
+    # Dataset name in the wrapped pipeline -> its name outside
+    mapping: Dict[str, str]
+
+    def rename(self, dataset: str) -> str:
+        if dataset in self.mapping:
+            return self.mapping[dataset]
+        if self.namespace and not is_parameter(dataset):
+            return f"{self.namespace}.{dataset}"
+        return dataset
+
+
+class PipelineNode(NamedTuple):
+    """A ``node()`` call of a pipeline file."""
+
+    # The node name, the function name when the node is not named
+    name: str
+    # The registered pipeline, i.e. the package under ``pipelines`` the node is in
+    pipeline: str
+    path: Path
+    line: int
+    function: str
+    # Where the node function is defined, when it could be resolved from the imports
+    function_path: Optional[Path]
+    function_line: Optional[int]
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    # Zero-based line and character of the name of each input and output
+    dataset_positions: Tuple[Tuple[str, int, int], ...]
+
+
+class PipelineGraphIndex:
+    """Nodes of the pipelines of a project and the datasets they read and write.
+
+    All pipeline files are parsed once in a worker thread, then only the files
+    reported changed are parsed again, along with the pipeline files importing
+    node functions from them. Producers and consumers of a dataset are
+    dictionary lookups.
+
+    Pipelines are named after the packages under ``pipelines`` as
+    ``find_pipelines()`` registers them, datasets are the string literals given
+    to ``node()`` as inputs and outputs.
+    """
+
+    def __init__(self, pipelines_dir: Path):
+        self.pipelines_dir = Path(pipelines_dir)
+        # The directory holding the project package, absolute imports start there
+        self.source_dir = self.pipelines_dir.parent.parent
+        self._files: Dict[Path, List[PipelineNode]] = {}
+        self._producers: Dict[str, List[PipelineNode]] = {}
+        self._consumers: Dict[str, List[PipelineNode]] = {}
+        # Module -> pipeline files with nodes whose function is defined in it
+        self._dependents: Dict[Path, Set[Path]] = {}
+        # Files refreshed while the index is being built, the build keeps their refreshed nodes
+        self._refreshed: Set[Path] = set()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def start(self):
+        """Build the index in a worker thread unless it is built or being built."""
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(
+                target=self._build, name="kedro-pipeline-graph", daemon=True
+            )
+        self._worker.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Start building the index and wait for it, returns whether it is built."""
+        self.start()
+        return self._ready.wait(timeout)
+
+    def refresh(self, paths: Iterable[str]) -> Set[str]:
+        """Parse the files at ``paths`` again, the files that are gone are dropped.
+
+        Returns the datasets read or written by the nodes of these files, before
+        or after they changed.
+        """
+        pending = set()
+        for path in paths:
+            path = Path(path)
+            if path.suffix == ".py" and self.pipelines_dir in path.parents:
+                pending.add(path)
+            with self._lock:
+                pending |= self._dependents.get(path, set())
+        with self._lock:
+            if not self._ready.is_set():
+                self._refreshed |= pending
+        touched = set()
+        for path in pending:
+            touched |= self._index(path)
+        return touched
+
+    def producers(self, dataset: str) -> List[PipelineNode]:
+        with self._lock:
+            return list(self._producers.get(dataset, ()))
+
+    def consumers(self, dataset: str) -> List[PipelineNode]:
+        with self._lock:
+            return list(self._consumers.get(dataset, ()))
+
+    def datasets(self) -> Set[str]:
+        """Every dataset read or written by a node."""
+        with self._lock:
+            return set(self._producers) | set(self._consumers)
+
+    def nodes(self) -> List[PipelineNode]:
+        with self._lock:
+            return [node for nodes in self._files.values() for node in nodes]
+
+    def _build(self):
+        try:
+            with STATS.timer("pipeline_graph/build"):
+                for path in sorted(self.pipelines_dir.rglob("*.py")):
+                    self._index(path, building=True)
+        finally:
+            with self._lock:
+                self._refreshed.clear()
+                self._ready.set()
+
+    def _index(self, path: Path, building: bool = False) -> Set[str]:
+        try:
+            nodes = parse_pipeline_file(path, self.pipelines_dir, self.source_dir)
+        except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+            # Files being edited are indexed empty until they parse again
+            nodes = []
+        touched = {dataset for node in nodes for dataset in node.inputs + node.outputs}
+        with self._lock:
+            if building and path in self._refreshed:
+                # Read before the refresh, possibly before the change it reported
+                return set()
+            for node in self._files.pop(path, ()):
+                touched.update(node.inputs + node.outputs)
+                for dataset in node.inputs:
+                    self._consumers[dataset].remove(node)
+                    if not self._consumers[dataset]:
+                        del self._consumers[dataset]
+                for dataset in node.outputs:
+                    self._producers[dataset].remove(node)
+                    if not self._producers[dataset]:
+                        del self._producers[dataset]
+            for dependents in self._dependents.values():
+                dependents.discard(path)
+            if not nodes:
+                return touched
+            self._files[path] = nodes
+            for node in nodes:
+                for dataset in node.inputs:
+                    self._consumers.setdefault(dataset, []).append(node)
+                for dataset in node.outputs:
+                    self._producers.setdefault(dataset, []).append(node)
+                if node.function_path is not None and node.function_path != path:
+                    self._dependents.setdefault(node.function_path, set()).add(path)
+        return touched
+
+
+def parse_pipeline_file(path: Path, pipelines_dir: Path, source_dir: Path) -> List[PipelineNode]:
+    """The nodes created by the ``node()`` calls of a pipeline file."""
+    path = Path(path)
+    tree = ast.parse(path.read_text(encoding="utf-8"), str(path))
+    relative = path.relative_to(pipelines_dir)
+    pipeline = relative.parts[0] if len(relative.parts) > 1 else relative.stem
+
+    functions = {path: _function_lines(tree)}
+    # Local name -> imported module, or (module, name) for imported functions
+    modules: Dict[str, Path] = {}
+    imported: Dict[str, Tuple[Path, str]] = {}
+    for statement in ast.walk(tree):
+        if isinstance(statement, ast.Import):
+            for alias in statement.names:
+                module_path = _module_path(alias.name, 0, path, source_dir)
+                if module_path is not None and alias.asname:
+                    modules[alias.asname] = module_path
+        elif isinstance(statement, ast.ImportFrom):
+            for alias in statement.names:
+                local_name = alias.asname or alias.name
+                submodule = ".".join(part for part in (statement.module, alias.name) if part)
+                module_path = _module_path(submodule, statement.level, path, source_dir)
+                if module_path is not None:
+                    modules[local_name] = module_path
+                    continue
+                module_path = _module_path(statement.module, statement.level, path, source_dir)
+                if module_path is not None:
+                    imported[local_name] = (module_path, alias.name)
+
+    def _resolve(expression) -> Tuple[str, Optional[Path], Optional[int]]:
+        if isinstance(expression, ast.Call) and expression.args:
+            # e.g. partial(function, ...)
+            return _resolve(expression.args[0])
+        if isinstance(expression, ast.Name):
+            name = expression.id
+            if name in functions[path]:
+                return name, path, functions[path][name]
+            if name in imported:
+                module_path, name = imported[name]
+                return name, module_path, _lines_of(module_path).get(name)
+            return name, None, None
+        if isinstance(expression, ast.Attribute):
+            if isinstance(expression.value, ast.Name) and expression.value.id in modules:
+                module_path = modules[expression.value.id]
+                return expression.attr, module_path, _lines_of(module_path).get(expression.attr)
+            return expression.attr, None, None
+        return "<lambda>" if isinstance(expression, ast.Lambda) else "", None, None
+
+    def _lines_of(module_path: Path) -> Dict[str, int]:
+        if module_path not in functions:
+            try:
+                functions[module_path] = _function_lines(
+                    ast.parse(module_path.read_text(encoding="utf-8"), str(module_path))
+                )
+            except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+                functions[module_path] = {}
+        return functions[module_path]
+
+    remaps = _node_remaps(tree)
+    nodes = []
+    for call in ast.walk(tree):
+        if not isinstance(call, ast.Call) or _callee(call.func) not in NODE_FACTORIES:
+            continue
+        arguments = dict(zip(("func", "inputs", "outputs", "name"), call.args))
+        arguments.update((keyword.arg, keyword.value) for keyword in call.keywords if keyword.arg)
+        if "func" not in arguments:
+            continue
+        function, function_path, function_line = _resolve(arguments["func"])
+        name = arguments.get("name")
+        if not (isinstance(name, ast.Constant) and isinstance(name.value, str)):
+            name = None
+        inputs = _dataset_literals(arguments.get("inputs"))
+        outputs = _dataset_literals(arguments.get("outputs"))
+        # One node per pipeline the call ends up in, e.g. a pipeline reused in two namespaces
+        for chain in remaps.get(call, [()]):
+
+            def _rename(dataset: str) -> str:
+                for remap in chain:
+                    dataset = remap.rename(dataset)
+                return dataset
+
+            namespace = ".".join(remap.namespace for remap in reversed(chain) if remap.namespace)
+            node_name = name.value if name is not None else function
+            nodes.append(
+                PipelineNode(
+                    name=f"{namespace}.{node_name}" if namespace else node_name,
+                    pipeline=pipeline,
+                    path=path,
+                    line=call.lineno - 1,
+                    function=function,
+                    function_path=function_path,
+                    function_line=function_line if function_path is not None else None,
+                    inputs=tuple(_rename(literal.value) for literal in inputs),
+                    outputs=tuple(_rename(literal.value) for literal in outputs),
+                    dataset_positions=tuple(
+                        # The name starts after the opening quote
+                        (_rename(literal.value), literal.lineno - 1, literal.col_offset + 1)
+                        for literal in inputs + outputs
+                    ),
+                )
+            )
+    return nodes
+
+
+def _node_remaps(tree: ast.Module) -> Dict[ast.Call, List[Tuple[Remap, ...]]]:
+    """The remaps applied to each ``node()`` call by the ``pipeline()`` calls wrapping it.
+
+    Chains of remaps are innermost first. Pipelines are followed through lists,
+    ``+`` and variables assigned in the same file, pipelines created in other
+    files, e.g. by the registry, are not.
+    """
+    # Variable -> the expressions assigned to it
+    assigned: Dict[str, List[Any]] = {}
+    for statement in ast.walk(tree):
+        if isinstance(statement, ast.Assign):
+            for target in statement.targets:
+                if isinstance(target, ast.Name):
+                    assigned.setdefault(target.id, []).append(statement.value)
+        elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+            if isinstance(statement.target, ast.Name):
+                assigned.setdefault(statement.target.id, []).append(statement.value)
+
+    def _wrapped(expression, seen: Tuple[str, ...]) -> List[Tuple[ast.Call, Tuple[ast.Call, ...]]]:
+        if isinstance(expression, (ast.List, ast.Tuple, ast.Set)):
+            return [item for element in expression.elts for item in _wrapped(element, seen)]
+        if isinstance(expression, ast.Starred):
+            return _wrapped(expression.value, seen)
+        if isinstance(expression, ast.BinOp):
+            return _wrapped(expression.left, seen) + _wrapped(expression.right, seen)
+        if isinstance(expression, ast.Name) and expression.id not in seen:
+            return [
+                item
+                for value in assigned.get(expression.id, ())
+                for item in _wrapped(value, seen + (expression.id,))
+            ]
+        if not isinstance(expression, ast.Call):
+            return []
+        callee = _callee(expression.func)
+        if callee in NODE_FACTORIES:
+            return [(expression, ())]
+        if callee not in PIPELINE_FACTORIES:
+            return []
+        # The mappings and namespace are keyword-only
+        arguments = dict(zip(("pipe",), expression.args))
+        arguments.update(
+            (keyword.arg, keyword.value) for keyword in expression.keywords if keyword.arg
+        )
+        if expression not in remaps:
+            remaps[expression] = _remap(arguments)
+        wrapped = arguments.get("pipe", arguments.get("nodes"))
+        return [(call, chain + (expression,)) for call, chain in _wrapped(wrapped, seen)]
+
+    # Pipeline call -> its remap, chains are made of the calls until they are complete
+    remaps: Dict[ast.Call, Remap] = {}
+    chains: Dict[ast.Call, Set[Tuple[ast.Call, ...]]] = {}
+    for expression in ast.walk(tree):
+        if isinstance(expression, ast.Call) and _callee(expression.func) in PIPELINE_FACTORIES:
+            for call, chain in _wrapped(expression, ()):
+                chains.setdefault(call, set()).add(chain)
+    # A chain extended by an outer pipeline call is only an intermediate pipeline
+    return {
+        call: [
+            tuple(remaps[pipeline_call] for pipeline_call in chain)
+            for chain in sorted(calls, key=lambda chain: [(c.lineno, c.col_offset) for c in chain])
+            if not any(len(other) > len(chain) and other[: len(chain)] == chain for other in calls)
+        ]
+        for call, calls in chains.items()
+    }
+
+
+def _remap(arguments: Dict[str, Any]) -> Remap:
+    namespace = arguments.get("namespace")
+    if not (isinstance(namespace, ast.Constant) and isinstance(namespace.value, str)):
+        namespace = None
+    mapping = {}
+    for keyword in MAPPING_KEYWORDS:
+        expression = arguments.get(keyword)
+        if isinstance(expression, ast.Dict):
+            for key, value in zip(expression.keys, expression.values):
+                if isinstance(key, ast.Constant) and isinstance(value, ast.Constant):
+                    mapping[key.value] = value.value
+        else:
+            # A name or names kept as they are, outside the namespace
+            for literal in _dataset_literals(expression):
+                mapping[literal.value] = literal.value
+    return Remap(namespace.value if namespace is not None else None, mapping)
+
+
+def registry_files(package_dir: Path) -> List[Path]:
+    """The files ``find_registered_pipelines`` reads, to tell when to read them again."""
+    pipelines_dir = Path(package_dir) / "pipelines"
+    files = [Path(package_dir) / "pipeline_registry.py", pipelines_dir]
+    try:
+        pipeline_dirs = sorted(pipelines_dir.iterdir())
+    except OSError:
+        pipeline_dirs = []
+    for pipeline_dir in pipeline_dirs:
+        files.extend((pipeline_dir / "pipeline.py", pipeline_dir / "__init__.py"))
+    return files
+
+
+def find_registered_pipelines(package_dir: Path) -> List[Tuple[str, Path, int]]:
+    """The pipelines registered by ``register_pipelines()`` and where they are defined.
+
+    Names written as string keys in ``pipeline_registry.py``, e.g.
+    ``pipelines["__default__"] = ...``, are located there. When the registry
+    calls ``find_pipelines()``, the packages under ``pipelines`` are registered
+    too and located at their ``create_pipeline`` function.
+    """
+    registry = Path(package_dir) / "pipeline_registry.py"
+    try:
+        tree = ast.parse(registry.read_text(encoding="utf-8"), str(registry))
+    except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+        tree = None
+
+    registered: Dict[str, Tuple[str, Path, int]] = {}
+    discovers = tree is None
+    for expression in ast.walk(tree) if tree is not None else ():
+        if isinstance(expression, ast.Dict):
+            keys = expression.keys
+        elif isinstance(expression, ast.Subscript) and isinstance(expression.ctx, ast.Store):
+            keys = [expression.slice]
+        else:
+            discovers = discovers or _callee(expression) == "find_pipelines"
+            continue
+        for key in keys:
+            if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                registered.setdefault(key.value, (key.value, registry, key.lineno - 1))
+
+    pipelines_dir = Path(package_dir) / "pipelines"
+    if discovers and pipelines_dir.is_dir():
+        for pipeline_dir in sorted(pipelines_dir.iterdir()):
+            if pipeline_dir.name in registered or not (pipeline_dir / "__init__.py").is_file():
+                continue
+            location = (pipeline_dir / "__init__.py", 0)
+            for module in ("pipeline.py", "__init__.py"):
+                try:
+                    lines = _function_lines(ast.parse((pipeline_dir / module).read_text(encoding="utf-8")))
+                except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+                    continue
+                if "create_pipeline" in lines:
+                    location = (pipeline_dir / module, lines["create_pipeline"])
+                    break
+            registered[pipeline_dir.name] = (pipeline_dir.name, *location)
+    return list(registered.values())
+
+
+def _callee(expression) -> Optional[str]:
+    if isinstance(expression, ast.Name):
+        return expression.id
+    if isinstance(expression, ast.Attribute):
+        return expression.attr
+    return None
+
+
+def _dataset_literals(expression) -> List[ast.Constant]:
+    """The string literals of a node's inputs or outputs: a name, a list or a dict."""
+    if expression is None:
+        return []
+    if isinstance(expression, ast.Dict):
+        items = expression.values
+    elif isinstance(expression, (ast.List, ast.Tuple, ast.Set)):
+        items = expression.elts
+    else:
+        items = [expression]
+    return [item for item in items if isinstance(item, ast.Constant) and isinstance(item.value, str)]
+
+
+def _function_lines(tree: ast.Module) -> Dict[str, int]:
+    """Zero-based lines of the functions defined at the top of a module."""
+    return {
+        statement.name: statement.lineno - 1
+        for statement in tree.body
+        if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef))
+    }
+
+
+def _module_path(module: Optional[str], level: int, path: Path, source_dir: Path) -> Optional[Path]:
+    """The file of a module imported from ``path``, if it is part of the project."""
+    if level:
+        base = path.parent
+        for _ in range(level - 1):
+            base = base.parent
+    else:
+        base = source_dir
+    candidate = base.joinpath(*module.split(".")) if module else base
+    if candidate.with_suffix(".py").is_file():
+        return candidate.with_suffix(".py")
+    if (candidate / "__init__.py").is_file():
+        return candidate / "__init__.py"
+    return None
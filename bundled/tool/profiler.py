@@ -0,0 +1,79 @@
+"""Profile the running server on demand.
+
+cProfile is enabled in the thread of the event loop, where requests are
+handled, from the ``kedro.profile`` command and disabled by a second call or
+after a time window. The profile is written for ``pstats`` or snakeviz, next
+to a text summary sorted by cumulative time that the extension opens.
+"""
+
+import cProfile
+import io
+import pstats
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+PROFILE_DIR = Path(".kedro") / "profiles"
+# Functions listed in the text summary
+SUMMARY_LINES = 60
+
+
+class ServerProfiler:
+    """A cProfile session started and stopped from commands."""
+
+    def __init__(self):
+        self._profile: Optional[cProfile.Profile] = None
+        self._started = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._profile is not None
+
+    def start(self):
+        if self.running:
+            raise RuntimeError("The profiler is already running")
+        profile = cProfile.Profile()
+        # Raises if another profiler, e.g. a debugger or coverage, is active
+        profile.enable()
+        self._profile = profile
+        self._started = time.time()
+
+    def stop(self, root_path: Optional[Path] = None) -> Tuple[Path, Path]:
+        """Stop profiling and write the profile under ``root_path``.
+
+        Returns the paths of the profile and of its text summary.
+        """
+        if not self.running:
+            raise RuntimeError("The profiler is not running")
+        profile, self._profile = self._profile, None
+        profile.disable()
+
+        directory = profile_directory(root_path)
+        name = time.strftime("lsp-%Y%m%d-%H%M%S", time.localtime(self._started))
+        name += f"-{int(self._started * 1000) % 1000:03d}"
+        profile_path = directory / f"{name}.prof"
+        profile.dump_stats(str(profile_path))
+
+        summary = io.StringIO()
+        summary.write(f"Kedro language server profile of {time.time() - self._started:.1f} s\n")
+        summary.write(f"Load {profile_path} in pstats or snakeviz for the full profile.\n")
+        stats = pstats.Stats(profile, stream=summary)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_LINES)
+        summary_path = directory / f"{name}.txt"
+        summary_path.write_text(summary.getvalue(), encoding="utf8")
+        return profile_path, summary_path
+
+
+def profile_directory(root_path: Optional[Path] = None) -> Path:
+    """``.kedro/profiles`` in ``root_path``, a temporary directory if it cannot be created."""
+    if root_path is not None:
+        directory = Path(root_path) / PROFILE_DIR
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            return directory
+        except OSError:
+            pass
+    directory = Path(tempfile.gettempdir()) / "kedro-lsp-profiles"
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
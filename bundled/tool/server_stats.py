@@ -0,0 +1,191 @@
+"""Counters and latency histograms of the work done by the server.
+
+Handlers, validators and caches report to the process-wide ``STATS``. The
+``kedro.getServerStats`` command returns a snapshot of it, and setting
+``KEDRO_LSP_STATS_FILE`` to a path appends every timed call to that file as
+one JSON object per line.
+"""
+
+import asyncio
+import bisect
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Upper bounds in milliseconds of the latency histogram buckets, the last bucket is unbounded
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class MethodStats:
+    """Calls of one method: count, errors, latency histogram and bytes sent."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram: List[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        # Serialized responses or notifications sent to the client for this method
+        self.messages_sent = 0
+        self.bytes_sent = 0
+
+    def record(self, seconds: float, error: bool = False):
+        self.count += 1
+        self.errors += error
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)] += 1
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Upper bound in milliseconds of the bucket holding the ``percent`` percentile."""
+        if not self.count:
+            return None
+        rank = percent / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            seen += count
+            if seen >= rank and count:
+                break
+        if index < len(LATENCY_BUCKETS_MS):
+            return float(LATENCY_BUCKETS_MS[index])
+        return round(self.max * 1000, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [
+            f">{LATENCY_BUCKETS_MS[-1]}ms"
+        ]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.count, 3) if self.count else None,
+            "max_ms": round(self.max * 1000, 3),
+            "p50_ms": self.percentile(50),
+            "p99_ms": self.percentile(99),
+            "histogram": {label: count for label, count in zip(labels, self.histogram) if count},
+            "messages_sent": self.messages_sent,
+            "bytes_sent": self.bytes_sent,
+        }
+
+
+class ServerStats:
+    """Per-method latency and per-cache hit counts, safe to update from any thread."""
+
+    def __init__(self, dump_path: Optional[str] = None):
+        self.started = time.time()
+        self.methods: Dict[str, MethodStats] = {}
+        # Cache name -> [hits, misses]
+        self.caches: Dict[str, List[int]] = {}
+        self.dump_path = dump_path
+        self._dump_file = None
+        self._lock = threading.Lock()
+
+    def record(self, method: str, seconds: float, error: bool = False):
+        with self._lock:
+            self._method(method).record(seconds, error)
+            if self.dump_path:
+                self._dump(
+                    {
+                        "time": round(time.time(), 3),
+                        "method": method,
+                        "ms": round(seconds * 1000, 3),
+                        "error": error,
+                    }
+                )
+
+    def sent(self, method: str, size: int):
+        """Count a message of ``size`` bytes sent to the client for ``method``."""
+        with self._lock:
+            stats = self._method(method)
+            stats.messages_sent += 1
+            stats.bytes_sent += size
+
+    def cache(self, name: str, hit: bool, count: int = 1):
+        """Count ``count`` lookups of the cache ``name`` that hit or missed."""
+        with self._lock:
+            self.caches.setdefault(name, [0, 0])[0 if hit else 1] += count
+
+    @contextlib.contextmanager
+    def timer(self, method: str):
+        """Record how long the block took under ``method``, as an error if it raised."""
+        start = time.perf_counter()
+        error = True
+        try:
+            yield
+            error = False
+        finally:
+            self.record(method, time.perf_counter() - start, error)
+
+    def timed(self, method: str, function: Callable) -> Callable:
+        """Wrap ``function``, sync or async, to record its calls under ``method``."""
+        if asyncio.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with self.timer(method):
+                    return await function(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.timer(method):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            methods = {name: stats.to_dict() for name, stats in sorted(self.methods.items())}
+            caches = {
+                name: {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+                }
+                for name, (hits, misses) in sorted(self.caches.items())
+            }
+        return {
+            "uptime_s": round(time.time() - self.started, 3),
+            "max_rss_kb": _max_rss_kb(),
+            "methods": methods,
+            "caches": caches,
+        }
+
+    def _method(self, method: str) -> MethodStats:
+        stats = self.methods.get(method)
+        if stats is None:
+            stats = self.methods[method] = MethodStats()
+        return stats
+
+    def _dump(self, entry: Dict[str, Any]):
+        try:
+            if self._dump_file is None:
+                self._dump_file = open(self.dump_path, "a", encoding="utf8")
+            self._dump_file.write(json.dumps(entry) + "\n")
+            self._dump_file.flush()
+        except OSError:
+            # Stop dumping rather than failing the request being timed
+            self.dump_path = None
+
+
+def _max_rss_kb() -> Optional[int]:
+    """Peak resident memory of the server process, where the platform reports it."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes on Linux
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+
+STATS = ServerStats(os.getenv("KEDRO_LSP_STATS_FILE") or None)
@@ -0,0 +1,101 @@
+"""Fuzzy search over the datasets, parameters and pipelines of a project.
+
+Symbols are kept per source, e.g. a catalog file, along with the version of
+the source they were read from. A source is read again only when its version
+changed, and searching is a scan of the lowercased names held in memory.
+"""
+
+import heapq
+import re
+from typing import Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+DATASET = "dataset"
+PARAMETER = "parameter"
+PATTERN = "pattern"
+PIPELINE = "pipeline"
+
+# Symbols returned for one query, the client asks again as the query changes
+DEFAULT_LIMIT = 100
+# Characters a word starts after, e.g. "alpha" in "params:model.alpha"
+WORD_SEPARATORS = frozenset("_.:-/{} ")
+
+
+class Symbol(NamedTuple):
+    """A named thing of the project and where it is written."""
+
+    name: str
+    kind: str
+    path: str
+    line: int
+    character: int
+    # Where the symbol belongs, e.g. the catalog file or the pipeline
+    container: str = ""
+
+
+class SymbolIndex:
+    """Symbols of a project, searchable by fuzzy matching on their name."""
+
+    def __init__(self):
+        # Source -> version it was read at and its symbols
+        self._sources: Dict[Hashable, Tuple[Hashable, List[Symbol]]] = {}
+        # Lowercased name and symbol of every source, rebuilt after a source changed
+        self._entries: Optional[List[Tuple[str, Symbol]]] = None
+
+    def __len__(self) -> int:
+        return len(self._all_entries())
+
+    def update(self, source: Hashable, version: Hashable, read: Callable[[], List[Symbol]]):
+        """Keep the symbols of ``source``, calling ``read`` if its version changed."""
+        cached = self._sources.get(source)
+        if cached is not None and cached[0] == version:
+            return
+        self._sources[source] = (version, read())
+        self._entries = None
+
+    def retain(self, sources: Iterable[Hashable]):
+        """Drop the sources other than ``sources``, e.g. config files deleted."""
+        sources = set(sources)
+        for source in [source for source in self._sources if source not in sources]:
+            del self._sources[source]
+            self._entries = None
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Symbol]:
+        """The best ``limit`` symbols matching ``query``, best first.
+
+        A name matches when it contains the characters of the query in order,
+        ignoring case. Exact names rank first, then names starting with the
+        query, then names containing it, at the start of a word first, then
+        the other matches by how spread out their characters are.
+        """
+        entries = self._all_entries()
+        query = query.strip().lower()
+        if not query:
+            return [symbol for _, symbol in entries[:limit]]
+        # Lazy gaps find the first and tightest match of each query character
+        pattern = re.compile(".*?".join(re.escape(character) for character in query))
+        ranked = []
+        for lowered, symbol in entries:
+            index = lowered.find(query)
+            if index == 0:
+                rank = (0 if len(lowered) == len(query) else 1, 0)
+            elif index > 0:
+                rank = (2 if lowered[index - 1] in WORD_SEPARATORS else 3, index)
+            else:
+                match = pattern.search(lowered)
+                if match is None:
+                    continue
+                rank = (4, match.end() - match.start() - len(query))
+            ranked.append((rank, len(lowered), symbol.name, symbol))
+        return [item[-1] for item in heapq.nsmallest(limit, ranked)]
+
+    def _all_entries(self) -> List[Tuple[str, Symbol]]:
+        if self._entries is None:
+            self._entries = sorted(
+                (
+                    (symbol.name.lower(), symbol)
+                    for _, symbols in self._sources.values()
+                    for symbol in symbols
+                ),
+                key=lambda entry: entry[1].name,
+            )
+        return self._entries
@@ -1,24 +1,26 @@
 """Validator exports"""
 from .base import CatalogValidator
+from .engine import CatalogValidationEngine
 from .factory_pattern import FactoryPatternValidator
 from .dataset_config import DatasetConfigValidator
 from .full_catalog import FullCatalogValidator
 from .utils import (
     find_line_number_and_character,
     create_diagnostic,
+    collect_config_tokens,
     has_config_references,
     is_valid_dataset_entry,
-    remove_line_numbers,
 )
 
 __all__ = [
     "CatalogValidator",
+    "CatalogValidationEngine",
     "FactoryPatternValidator",
     "DatasetConfigValidator",
     "FullCatalogValidator",
     "find_line_number_and_character",
     "create_diagnostic",
+    "collect_config_tokens",
     "has_config_references",
     "is_valid_dataset_entry",
-    "remove_line_numbers",
 ]
@@ -1,18 +1,28 @@
 """Base validator class"""
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List, Optional
 from lsprotocol.types import Diagnostic
 
+if TYPE_CHECKING:
+    from .engine import CatalogValidationEngine
+
 
 class CatalogValidator:
     """Base class for catalog validators"""
     
-    def validate(self, catalog_config: Dict, content: str) -> List[Diagnostic]:
+    def validate(
+        self,
+        catalog_config: Dict,
+        content: str,
+        engine: Optional["CatalogValidationEngine"] = None,
+    ) -> List[Diagnostic]:
         """
         Validate catalog and return diagnostics
         
         Args:
             catalog_config: Parsed catalog configuration
             content: Original text content for line number mapping
+            engine: Validation engine shared by the validators of a pass,
+                created on demand when not given
             
         Returns:
             List of Diagnostic objects
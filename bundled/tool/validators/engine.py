@@ -0,0 +1,101 @@
+"""Shared DataCatalog for a validation pass"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Optional
+from .utils import has_config_references, is_valid_dataset_entry
+
+if TYPE_CHECKING:
+    from kedro.io import DataCatalog
+
+
+class CatalogValidationEngine:
+    """Builds a single DataCatalog per validation pass and shares it between validators
+
+    The catalog is built once from every entry that can be validated. Datasets are
+    then materialised individually from that catalog so failures are attributed to
+    the right entry. If the shared catalog cannot be built at all (Kedro 0.19.x
+    instantiates datasets eagerly), each dataset falls back to its own catalog.
+
+    Dataset checks are independent (imports and constructors), so with
+    ``max_workers > 1`` they are fanned out over a thread pool. Errors are still
+    merged in document order to keep diagnostics deterministic.
+    """
+
+    def __init__(self, catalog_config: Dict, max_workers: int = 1):
+        self.catalog_config = catalog_config
+        self.max_workers = max(1, max_workers)
+        self.datasets = {
+            dataset_name: dataset_config
+            for dataset_name, dataset_config in catalog_config.items()
+            # Skip factory patterns with configuration references
+            if is_valid_dataset_entry(dataset_name)
+            and not ('{' in dataset_name and has_config_references(dataset_config))
+        }
+        self._catalog: Optional["DataCatalog"] = None
+        self._catalog_error: Optional[Exception] = None
+        self._is_built = False
+        self._dataset_errors: Optional[Dict[str, Exception]] = None
+
+    @property
+    def catalog(self) -> Optional["DataCatalog"]:
+        """The shared catalog, ``None`` if it could not be built"""
+        self._build()
+        return self._catalog
+
+    @property
+    def catalog_error(self) -> Optional[Exception]:
+        """The error raised while building the shared catalog, if any"""
+        self._build()
+        return self._catalog_error
+
+    def dataset_errors(self) -> Dict[str, Exception]:
+        """Errors raised while instantiating each dataset, in document order"""
+        if self._dataset_errors is None:
+            # Build the shared catalog before fanning out so workers don't race on it
+            self._build()
+            dataset_names = list(self.datasets)
+            workers = min(self.max_workers, len(dataset_names))
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    errors = list(executor.map(self._check_dataset, dataset_names))
+            else:
+                errors = [self._check_dataset(dataset_name) for dataset_name in dataset_names]
+            self._dataset_errors = {
+                dataset_name: error
+                for dataset_name, error in zip(dataset_names, errors)
+                if error is not None
+            }
+        return self._dataset_errors
+
+    def _build(self) -> None:
+        if self._is_built:
+            return
+        self._is_built = True
+        from kedro.io import DataCatalog
+
+        try:
+            self._catalog = DataCatalog.from_config(self.datasets)
+        except Exception as exception:
+            self._catalog_error = exception
+
+    def _check_dataset(self, dataset_name: str) -> Optional[Exception]:
+        try:
+            catalog = self.catalog
+            if catalog is None:
+                from kedro.io import DataCatalog
+
+                # Isolate the dataset when the shared catalog is unusable
+                catalog = DataCatalog.from_config({dataset_name: self.datasets[dataset_name]})
+            _materialise(catalog, dataset_name)
+        except Exception as exception:
+            return exception
+        return None
+
+
+def _materialise(catalog: "DataCatalog", dataset_name: str) -> None:
+    try:
+        # Kedro 1.0+ uses __getitem__
+        _ = catalog[dataset_name]
+    except TypeError:
+        # Kedro 0.19.x doesn't support subscript, use _get_dataset
+        if hasattr(catalog, '_get_dataset'):
+            _ = catalog._get_dataset(dataset_name)
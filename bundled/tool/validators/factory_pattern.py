@@ -1,25 +1,31 @@
 """Factory pattern validation"""
-import json
-import re
-from typing import Dict, List, Set
+from typing import TYPE_CHECKING, Dict, List, Optional
 from lsprotocol.types import Diagnostic, DiagnosticSeverity, Position
 from .base import CatalogValidator
 from .utils import (
+    FACTORY_PLACEHOLDER_REGEX,
     find_line_number_and_character,
     create_diagnostic,
-    has_config_references,
+    collect_config_tokens,
     is_valid_dataset_entry,
-    remove_line_numbers,
 )
 
+if TYPE_CHECKING:
+    from .engine import CatalogValidationEngine
+
 
 class FactoryPatternValidator(CatalogValidator):
     """Validates factory patterns in dataset names"""
     
-    def validate(self, catalog_config: Dict, content: str) -> List[Diagnostic]:
+    def validate(
+        self,
+        catalog_config: Dict,
+        content: str,
+        engine: Optional["CatalogValidationEngine"] = None,
+    ) -> List[Diagnostic]:
+        # Only checks the pattern syntax, the shared catalog is not needed
         diagnostics = []
-        factory_pattern_regex = re.compile(r'\{([^{}]+)\}')
-        
+
         for dataset_name, dataset_config in catalog_config.items():
             if not is_valid_dataset_entry(dataset_name):
                 continue
@@ -73,19 +79,19 @@ class FactoryPatternValidator(CatalogValidator):
             if not has_opening:
                 continue  # Not a factory pattern
 
+            # Placeholders and interpolations are collected in one walk over the config
+            config_tokens = collect_config_tokens(dataset_config)
+
             # Skip factory patterns with configuration references
-            if has_config_references(dataset_config):
+            if config_tokens.has_config_references:
                 continue
-                
+
             # Extract variables from dataset name
-            name_variables = set(factory_pattern_regex.findall(dataset_name))
-            
+            name_variables = set(FACTORY_PLACEHOLDER_REGEX.findall(dataset_name))
+
             # Find all variables in the configuration
-            config_variables = set()
-            dataset_str = json.dumps(remove_line_numbers(dataset_config))
-            for match in factory_pattern_regex.finditer(dataset_str):
-                config_variables.add(match.group(1))
-            
+            config_variables = config_tokens.placeholders
+
             # Check for variables in config that aren't in the name
             extra_vars = config_variables - name_variables
             if extra_vars:
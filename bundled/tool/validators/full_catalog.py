@@ -1,39 +1,26 @@
 """Full catalog validation"""
-from typing import Dict, List
+from typing import Dict, List, Optional
 from lsprotocol.types import Diagnostic, Position
-from kedro.io import DataCatalog
 from .base import CatalogValidator
-from .utils import (
-    create_diagnostic,
-    has_config_references,
-    is_valid_dataset_entry,
-    remove_line_numbers
-)
+from .engine import CatalogValidationEngine
+from .utils import create_diagnostic
 
 
 class FullCatalogValidator(CatalogValidator):
     """Validates the entire catalog as a whole"""
 
-    def validate(self, catalog_config: Dict, content: str) -> List[Diagnostic]:
+    def validate(
+        self,
+        catalog_config: Dict,
+        content: str,
+        engine: Optional[CatalogValidationEngine] = None,
+    ) -> List[Diagnostic]:
         diagnostics = []
 
-        # Create a filtered catalog without factory patterns and interpolation variables
-        filtered_catalog = {}
-        for dataset_name, dataset_config in catalog_config.items():
-            if not is_valid_dataset_entry(dataset_name):
-                continue
-
-            # Skip factory patterns with configuration references
-            if '{' in dataset_name and has_config_references(dataset_config):
-                continue
-
-            filtered_catalog[dataset_name] = dataset_config
-
-        try:
-            # Try to validate the filtered catalog
-            clean_catalog_config = remove_line_numbers(filtered_catalog)
-            DataCatalog.from_config(clean_catalog_config)
-        except Exception as exception:
+        # The engine builds the catalog without factory patterns that use interpolation variables
+        engine = engine or CatalogValidationEngine(catalog_config)
+        exception = engine.catalog_error
+        if exception is not None:
             # If validation fails, add diagnostic at the top of the file
             diagnostic = create_diagnostic(
                 range_start=Position(line=0, character=0),
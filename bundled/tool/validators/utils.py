@@ -1,19 +1,32 @@
 """Validation utility functions"""
-from typing import Dict, Optional, Tuple, Any, List
-import json
+from functools import lru_cache
+from typing import FrozenSet, NamedTuple, Optional, Tuple, Any
 import re
 from lsprotocol.types import Position, Diagnostic, DiagnosticSeverity, Range
 
+# Factory pattern placeholders like {namespace} or {name}
+FACTORY_PLACEHOLDER_REGEX = re.compile(r'\{([^{}]+)\}')
+# OmegaConf interpolation patterns like ${globals:columns} or ${oc.env:VAR}
+CONFIG_REFERENCE_REGEX = re.compile(r'\$\{[^{}]+:[^{}]+\}')
+
+
+class ConfigTokens(NamedTuple):
+    """Tokens found in the string keys and values of a dataset config"""
+    placeholders: FrozenSet[str]
+    has_config_references: bool
+
 
 def find_line_number_and_character(text: str, dataset_name: str, field_name: str = "") -> Optional[Tuple[int, int]]:
     """Find the line number and character position of a dataset or field in YAML content"""
     lines = text.split('\n')
     in_dataset = False
+    # Factory patterns have to be quoted in YAML, e.g. "{name}_csv":
+    dataset_keys = (f"{dataset_name}:", f'"{dataset_name}":', f"'{dataset_name}':")
 
     for idx, line in enumerate(lines):
         stripped_line = line.lstrip()
 
-        if stripped_line.startswith(f"{dataset_name}:"):
+        if stripped_line.startswith(dataset_keys):
             in_dataset = True
             if not field_name:  # If we're looking for the dataset name itself
                 start_char = len(line) - len(line.lstrip())
@@ -45,14 +58,41 @@ def create_diagnostic(
     )
 
 
+@lru_cache(maxsize=4096)
+def _scan_string(value: str) -> ConfigTokens:
+    """Scan a single string, cached since catalogs repeat the same values a lot"""
+    if '{' not in value:
+        return ConfigTokens(frozenset(), False)
+    return ConfigTokens(
+        frozenset(FACTORY_PLACEHOLDER_REGEX.findall(value)),
+        bool(CONFIG_REFERENCE_REGEX.search(value)),
+    )
+
+
+def collect_config_tokens(config) -> ConfigTokens:
+    """Collect factory placeholders and config references in a single walk over the string leaves"""
+    placeholders = set()
+    has_references = False
+    pending = [config]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, dict):
+            pending.extend(node.keys())
+            pending.extend(node.values())
+        elif isinstance(node, (list, tuple)):
+            pending.extend(node)
+        elif isinstance(node, str):
+            tokens = _scan_string(node)
+            placeholders.update(tokens.placeholders)
+            has_references = has_references or tokens.has_config_references
+    return ConfigTokens(frozenset(placeholders), has_references)
+
+
 def has_config_references(dataset_config) -> bool:
     """Check if dataset config contains any configuration references (OmegaConf interpolations)"""
     if not isinstance(dataset_config, dict):
         return False
-
-    dataset_str = json.dumps(dataset_config)
-    # Match OmegaConf interpolation patterns like ${globals:columns} or ${oc.env:VAR}
-    return bool(re.search(r'\$\{[^{}]+:[^{}]+\}', dataset_str))
+    return collect_config_tokens(dataset_config).has_config_references
 
 
 def is_valid_dataset_entry(dataset_name: Any) -> bool:
@@ -61,13 +101,3 @@ def is_valid_dataset_entry(dataset_name: Any) -> bool:
         isinstance(dataset_name, str) and
         not dataset_name.startswith("_")
     )
-
-
-def remove_line_numbers(config):
-    """Remove __line__ information from config for validation purposes"""
-    if isinstance(config, dict):
-        return {k: remove_line_numbers(v) for k, v in config.items() if k != '__line__'}
-    elif isinstance(config, list):
-        return [remove_line_numbers(i) for i in config]
-    else:
-        return config
@@ -3,11 +3,13 @@
 import {
     selectEnvironment,
     selectKedroProject,
+    switchEnvironment,
     executeServerCommand,
     executeServerDefinitionCommand,
     setKedroProjectPath,
     filterPipelines,
     toggleVizTheme,
+    toggleServerProfiler,
 } from './commands';
 
 import * as vscode from 'vscode';
@@ -95,6 +97,7 @@ export const registerCommandsAndEvents = (
     const CMD_FILTER_PIPELINES = `${serverId}.filterPipelines`;
     const CMD_TOGGLE_VIZ_THEME = `${serverId}.toggleVizTheme`;
     const CMD_SELECT_PROJECT = `${serverId}.selectProject`;
+    const CMD_PROFILE_SERVER = `${serverId}.profileServer`;
 
     (async () => {
         // Status Bar
@@ -136,6 +139,14 @@ export const registerCommandsAndEvents = (
                 if (checkIfConfigurationChanged(e, serverId)) {
                     const newClient = await runServer(getLSClient());
                     setLSClient(newClient);
+                } else if (e.affectsConfiguration(`${serverId}.environment`)) {
+                    // The server keeps the config of recent environments, switch without a restart
+                    const projectRoot = await getProjectRoot();
+                    const settings = await getWorkspaceSettings(serverId, projectRoot);
+                    if (!(await switchEnvironment(getLSClient(), settings.environment, projectRoot))) {
+                        const newClient = await runServer(getLSClient());
+                        setLSClient(newClient);
+                    }
                 }
             }),
             registerCommand(CMD_RESTART_SERVER, async () => {
@@ -150,8 +161,10 @@ export const registerCommandsAndEvents = (
             }),
             registerCommand(CMD_SELECT_ENV, async () => {
                 const result = await selectEnvironment();
-                const newClient = await runServer(getLSClient(), result);
-                setLSClient(newClient);
+                if (result && !(await switchEnvironment(getLSClient(), result.label, await getProjectRoot()))) {
+                    const newClient = await runServer(getLSClient(), result);
+                    setLSClient(newClient);
+                }
                 if (result) {
                     const projectRoot = await getProjectRoot();
                     const settings = await getWorkspaceSettings(serverId, projectRoot);
@@ -197,6 +210,9 @@ export const registerCommandsAndEvents = (
                     updateStatusBarProject(statusBarItem, selectedPath, settings.environment || 'local');
                 }
             }),
+            registerCommand(CMD_PROFILE_SERVER, async () => {
+                await toggleServerProfiler(getLSClient());
+            }),
             registerCommand(CMD_TOGGLE_VIZ_THEME, async () => {
                 await toggleVizTheme();
                 // If KedroVizPanel is open, update the theme
@@ -34,6 +34,34 @@ export async function selectEnvironment() {
     return result;
 }
 
+/**
+ * Switch the run environment of the running language server in place.
+ * Returns false when the server cannot switch, so the caller can restart it instead.
+ */
+export async function switchEnvironment(
+    lsClient: LanguageClient | undefined,
+    environment: string,
+    projectRoot: vscode.WorkspaceFolder,
+): Promise<boolean> {
+    if (!lsClient || lsClient.state !== State.Running) {
+        return false;
+    }
+    try {
+        // The server switches the project containing the uri, not always the first one
+        const uri = projectRoot.uri.toString();
+        const result: any = await lsClient.sendRequest('kedro/switchEnvironment', { environment, uri });
+        if (result?.error) {
+            traceLog(`Failed to switch environment in place: ${result.error}`);
+            return false;
+        }
+        traceLog(`Switched to environment ${result?.environment} (reused: ${result?.reused})`);
+        return Boolean(result?.environment);
+    } catch (err) {
+        traceLog(`Failed to switch environment in place: ${err}`);
+        return false;
+    }
+}
+
 export async function setKedroProjectPath() {
     const result = await vscode.window.showInputBox({
         placeHolder: 'Enter the Kedro Project Root Directory',
@@ -265,3 +293,24 @@ export async function toggleVizTheme() {
     await config.update('vizTheme', newTheme, vscode.ConfigurationTarget.Workspace);
     vscode.window.showInformationMessage(`Kedro Viz theme changed to ${newTheme}`);
 }
+
+/**
+ * Start profiling the language server, or stop it and open the summary of the profile.
+ */
+export async function toggleServerProfiler(lsClient: LanguageClient | undefined) {
+    if (!lsClient || lsClient.state !== State.Running) {
+        await vscode.window.showErrorMessage('There is no language server running.');
+        return;
+    }
+
+    const result: any = await vscode.commands.executeCommand('kedro.profile');
+    if (result?.error) {
+        await vscode.window.showErrorMessage(`Cannot profile the Kedro language server: ${result.error}`);
+    } else if (result?.running) {
+        vscode.window.showInformationMessage(
+            'Profiling the Kedro language server, run the command again to stop and open the profile.',
+        );
+    } else if (result?.summary) {
+        await vscode.window.showTextDocument(vscode.Uri.file(result.summary));
+    }
+}
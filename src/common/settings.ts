@@ -17,6 +17,10 @@ export interface ISettings {
     isExperimental: string;
     environment: string;
     kedroProjectPath: string;
+    validationWorkers: number;
+    warmEnvironments: string[];
+    loadFullContext: boolean;
+    datasetUsageDiagnostics: boolean;
 }
 
 export function getExtensionSettings(namespace: string, includeInterpreter?: boolean): Promise<ISettings[]> {
@@ -97,6 +101,10 @@ export async function getWorkspaceSettings(
         environment: config.get<string>(`environment`) ?? '',
         kedroProjectPath: resolveWorkspacePath(config.get<string>(`kedroProjectPath`) ?? '', workspace),
         autoReloadKedroViz: config.get<boolean>(`autoReloadKedroViz`) ?? false,
+        validationWorkers: config.get<number>(`validationWorkers`) ?? 5,
+        warmEnvironments: config.get<string[]>(`warmEnvironments`) ?? [],
+        loadFullContext: config.get<boolean>(`loadFullContext`) ?? false,
+        datasetUsageDiagnostics: config.get<boolean>(`datasetUsageDiagnostics`) ?? true,
     };
     return workspaceSetting;
 }
@@ -129,6 +137,10 @@ export async function getGlobalSettings(namespace: string, includeInterpreter?:
         environment: getGlobalValue<string>(config, 'environment', ''),
         kedroProjectPath: getGlobalValue<string>(config, 'kedroProjectPath', ''),
         autoReloadKedroViz: getGlobalValue<boolean>(config, 'autoReloadKedroViz', false),
+        validationWorkers: getGlobalValue<number>(config, 'validationWorkers', 5),
+        warmEnvironments: getGlobalValue<string[]>(config, 'warmEnvironments', []),
+        loadFullContext: getGlobalValue<boolean>(config, 'loadFullContext', false),
+        datasetUsageDiagnostics: getGlobalValue<boolean>(config, 'datasetUsageDiagnostics', true),
     };
     return setting;
 }
@@ -140,8 +152,11 @@ export function checkIfConfigurationChanged(e: ConfigurationChangeEvent, namespa
         `${namespace}.interpreter`,
         `${namespace}.importStrategy`,
         `${namespace}.showNotifications`,
-        `${namespace}.environment`,
         `${namespace}.kedroProjectPath`,
+        `${namespace}.validationWorkers`,
+        `${namespace}.warmEnvironments`,
+        `${namespace}.loadFullContext`,
+        `${namespace}.datasetUsageDiagnostics`,
     ];
     const changed = settings.map((s) => e.affectsConfiguration(s));
     return changed.includes(true);
@@ -0,0 +1,11 @@
+"""
+Startup and request latency benchmarks of the language server.
+
+Run from the repository root, e.g.
+``python -m src.test.python_tests.lsp_benchmark --catalog-entries 500``.
+"""
+
+from .project import ProjectSpec, SyntheticProject, generate_project
+from .runner import compare, run_benchmark
+
+__all__ = ["ProjectSpec", "SyntheticProject", "compare", "generate_project", "run_benchmark"]
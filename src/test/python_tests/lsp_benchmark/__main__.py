@@ -0,0 +1,61 @@
+"""
+Benchmark the language server against a synthetic Kedro project.
+
+Results are written as JSON so a later run can be compared with them:
+
+    python -m src.test.python_tests.lsp_benchmark --output .benchmarks/main.json
+    python -m src.test.python_tests.lsp_benchmark --baseline .benchmarks/main.json
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+import tempfile
+
+from .project import ProjectSpec, generate_project
+from .runner import compare, format_results, run_benchmark, save_results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--catalog-entries", type=int, default=ProjectSpec().catalog_entries)
+    parser.add_argument("--parameter-depth", type=int, default=ProjectSpec().parameter_depth)
+    parser.add_argument("--pipeline-modules", type=int, default=ProjectSpec().pipeline_modules)
+    parser.add_argument(
+        "--iterations", type=int, default=20, help="Times each request is sent per position."
+    )
+    parser.add_argument("--output", type=pathlib.Path, help="Write the results to this file.")
+    parser.add_argument(
+        "--baseline", type=pathlib.Path, help="Fail if slower than the results in this file."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Slowdown relative to the baseline reported as a regression (default: 0.2).",
+    )
+    args = parser.parse_args(argv)
+    if args.catalog_entries < 2:
+        parser.error("--catalog-entries must be at least 2 for the pipelines to have nodes")
+
+    spec = ProjectSpec(args.catalog_entries, args.parameter_depth, args.pipeline_modules)
+    with tempfile.TemporaryDirectory(prefix="kedro-lsp-benchmark-") as root:
+        results = run_benchmark(generate_project(pathlib.Path(root), spec), args.iterations)
+
+    print(format_results(results))
+    if args.output:
+        save_results(results, args.output)
+    if args.baseline:
+        regressions = compare(
+            results, json.loads(args.baseline.read_text(encoding="utf8")), args.threshold
+        )
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
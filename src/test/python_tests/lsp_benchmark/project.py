@@ -0,0 +1,156 @@
+"""
+Synthetic Kedro projects to benchmark the language server against.
+"""
+
+import pathlib
+from typing import List, NamedTuple
+
+PACKAGE_NAME = "benchmark_project"
+# Not importable, so the server has diagnostics to publish for the catalog
+BROKEN_DATASET = "broken_dataset"
+
+
+class ProjectSpec(NamedTuple):
+    """Size of a synthetic project."""
+
+    catalog_entries: int = 100
+    parameter_depth: int = 3
+    pipeline_modules: int = 5
+
+
+class Probe(NamedTuple):
+    """A position to send requests at, zero-based as in LSP."""
+
+    path: pathlib.Path
+    line: int
+    character: int
+    word: str
+
+
+class SyntheticProject(NamedTuple):
+    """A generated project and the positions requests are sent at."""
+
+    root: pathlib.Path
+    spec: ProjectSpec
+    catalog: pathlib.Path
+    parameters: pathlib.Path
+    pipelines: List[pathlib.Path]
+    # Dataset names and ``params:`` in pipeline modules
+    pipeline_probes: List[Probe]
+    # Dataset keys in the catalog
+    catalog_probes: List[Probe]
+
+
+def dataset_name(index: int) -> str:
+    return f"dataset_{index}"
+
+
+def parameter_path(index: int, depth: int) -> str:
+    """Dotted path of the leaf parameter of group ``index``, ``depth`` keys deep."""
+    return ".".join([f"group_{index}"] + [f"level_{level}" for level in range(1, depth)])
+
+
+def generate_project(root: pathlib.Path, spec: ProjectSpec = ProjectSpec()) -> SyntheticProject:
+    """Write a Kedro project of the size given by ``spec`` under ``root``.
+
+    Datasets are ``MemoryDataset`` so the project needs nothing but Kedro.
+    Each pipeline module chains a share of the catalog entries, every node
+    reading one dataset and one nested parameter and writing the next dataset.
+    """
+    root = pathlib.Path(root)
+    package = root / "src" / PACKAGE_NAME
+    (package / "pipelines").mkdir(parents=True, exist_ok=True)
+    (root / "conf" / "base").mkdir(parents=True, exist_ok=True)
+    (root / "conf" / "local").mkdir(parents=True, exist_ok=True)
+
+    (root / "pyproject.toml").write_text(
+        "[tool.kedro]\n"
+        f'package_name = "{PACKAGE_NAME}"\n'
+        f'project_name = "{PACKAGE_NAME}"\n'
+        'kedro_init_version = "1.0.0"\n'
+        'source_dir = "src"\n',
+        encoding="utf8",
+    )
+    (package / "__init__.py").write_text("", encoding="utf8")
+    (package / "settings.py").write_text("", encoding="utf8")
+    (package / "pipelines" / "__init__.py").write_text("", encoding="utf8")
+
+    catalog = root / "conf" / "base" / "catalog.yml"
+    catalog_lines = []
+    catalog_probes = []
+    for index in range(spec.catalog_entries):
+        catalog_probes.append(Probe(catalog, len(catalog_lines), 1, dataset_name(index)))
+        catalog_lines += [f"{dataset_name(index)}:", "  type: MemoryDataset", ""]
+    catalog_lines += ['"{name}_factory":', "  type: MemoryDataset", ""]
+    catalog_lines += [f"{BROKEN_DATASET}:", "  type: missing_module.MissingDataset", ""]
+    catalog.write_text("\n".join(catalog_lines), encoding="utf8")
+
+    groups = max(1, spec.catalog_entries // 10)
+    parameters = root / "conf" / "base" / "parameters.yml"
+    parameter_lines = []
+    for group in range(groups):
+        for level, key in enumerate(parameter_path(group, spec.parameter_depth).split(".")):
+            parameter_lines.append(f"{'  ' * level}{key}:")
+        parameter_lines[-1] += f" {group}"
+    parameters.write_text("\n".join(parameter_lines) + "\n", encoding="utf8")
+
+    modules = max(1, spec.pipeline_modules)
+    pipelines = []
+    pipeline_probes = []
+    registry = ["from kedro.pipeline import Pipeline", ""]
+    for module in range(modules):
+        module_name = f"pipeline_{module}"
+        module_dir = package / "pipelines" / module_name
+        module_dir.mkdir(exist_ok=True)
+        (module_dir / "__init__.py").write_text(
+            "from .pipeline import create_pipeline\n", encoding="utf8"
+        )
+        (module_dir / "nodes.py").write_text(
+            "def process(data, parameter):\n    return data\n", encoding="utf8"
+        )
+
+        pipeline = module_dir / "pipeline.py"
+        lines = [
+            "from kedro.pipeline import Pipeline, node",
+            "",
+            "from .nodes import process",
+            "",
+            "",
+            "def create_pipeline(**kwargs):",
+            "    return Pipeline(",
+            "        [",
+        ]
+        # Each module reads its share of the catalog, the last entry is only an output
+        for index in range(module, max(spec.catalog_entries - 1, 0), modules):
+            dataset = dataset_name(index)
+            parameter = f"params:{parameter_path(index % groups, spec.parameter_depth)}"
+            line = (
+                f'            node(process, ["{dataset}", "{parameter}"], '
+                f'"{dataset_name(index + 1)}", name="node_{index}"),'
+            )
+            pipeline_probes.append(Probe(pipeline, len(lines), line.index(dataset) + 1, dataset))
+            pipeline_probes.append(
+                Probe(pipeline, len(lines), line.index(parameter) + 1, parameter)
+            )
+            lines.append(line)
+        lines += ["        ]", "    )", ""]
+        pipeline.write_text("\n".join(lines), encoding="utf8")
+        pipelines.append(pipeline)
+        registry.append(f"from .pipelines import {module_name}")
+
+    registry += ["", "", "def register_pipelines():", "    pipelines = {"]
+    registry += [
+        f'        "pipeline_{module}": pipeline_{module}.create_pipeline(),'
+        for module in range(modules)
+    ]
+    registry += [
+        "    }",
+        '    pipelines["__default__"] = sum(pipelines.values(), Pipeline([]))',
+        "    return pipelines",
+        "",
+    ]
+    (package / "pipeline_registry.py").write_text("\n".join(registry), encoding="utf8")
+
+    return SyntheticProject(
+        root, spec, catalog, parameters, pipelines, pipeline_probes, catalog_probes
+    )
@@ -0,0 +1,215 @@
+"""
+Drive the language server over stdio and time its responses.
+"""
+
+import copy
+import json
+import math
+import os
+import pathlib
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from threading import Event
+from typing import Any, Dict, List, Optional
+
+from ..lsp_test_client import session
+from ..lsp_test_client.constants import PROJECT_ROOT
+from ..lsp_test_client.defaults import VSCODE_DEFAULT_INITIALIZE
+from ..lsp_test_client.utils import as_uri
+from .project import Probe, SyntheticProject
+
+# Bump when the metrics change meaning, results of other versions are not compared
+RESULTS_VERSION = 1
+REQUEST_METHODS = ("definition", "references", "hover", "completion")
+DIAGNOSTICS_TIMEOUT = 120
+
+
+def initialize_params(project: SyntheticProject) -> Dict[str, Any]:
+    """The VS Code initialize request, opened on ``project``."""
+    params = copy.deepcopy(VSCODE_DEFAULT_INITIALIZE)
+    uri = as_uri(str(project.root))
+    params["rootPath"] = str(project.root)
+    params["rootUri"] = uri
+    params["workspaceFolders"] = [{"uri": uri, "name": project.root.name}]
+    for settings in params["initializationOptions"]["settings"]:
+        settings.update(workspace=uri, kedroProjectPath=str(project.root), environment="")
+    return params
+
+
+def percentile(samples: List[float], percent: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency statistics in milliseconds of samples in seconds."""
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "p50": round(percentile(samples, 50) * 1000, 3),
+        "p99": round(percentile(samples, 99) * 1000, 3),
+        "max": round(max(samples) * 1000, 3),
+    }
+
+
+def run_benchmark(project: SyntheticProject, iterations: int = 20) -> Dict[str, Any]:
+    """Start the server on ``project`` and time startup and requests.
+
+    Startup metrics are taken once from process start: time until the
+    initialize response, until the first diagnostics of the catalog and
+    until the first hover is answered (the project is bootstrapped by then).
+    Requests are then sent ``iterations`` times at every probe position.
+    """
+    catalog_uri = as_uri(str(project.catalog))
+    first_diagnostics = Event()
+    timings: Dict[str, Any] = {}
+
+    def _publish_diagnostics(params):
+        if params["uri"] == catalog_uri and params["diagnostics"]:
+            first_diagnostics.set()
+
+    def _after_initialize(_result):
+        timings["initialize"] = time.perf_counter() - start
+
+    # Every run starts cold and leaves no index cache behind in the user cache
+    cache_dir = tempfile.TemporaryDirectory()
+    env = dict(os.environ, KEDRO_LSP_CACHE_DIR=cache_dir.name)
+    start = time.perf_counter()
+    with cache_dir, session.LspSession(cwd=str(project.root), env=env) as lsp_session:
+        lsp_session.set_notification_callback(session.PUBLISH_DIAGNOSTICS, _publish_diagnostics)
+        lsp_session.initialize(initialize_params(project), _after_initialize)
+        if first_diagnostics.wait(DIAGNOSTICS_TIMEOUT):
+            timings["first_diagnostics"] = time.perf_counter() - start
+
+        for path in [project.catalog] + project.pipelines:
+            lsp_session.notify_did_open(
+                {
+                    "textDocument": {
+                        "uri": as_uri(str(path)),
+                        "languageId": "yaml" if path.suffix == ".yml" else "python",
+                        "version": 1,
+                        "text": path.read_text(encoding="utf8"),
+                    }
+                }
+            )
+
+        _time(lsp_session.text_document_hover, project.pipeline_probes[0])
+        timings["first_request"] = time.perf_counter() - start
+
+        samples: Dict[str, List[float]] = {method: [] for method in REQUEST_METHODS}
+        for _ in range(iterations):
+            for probe in project.pipeline_probes:
+                samples["definition"].append(_time(lsp_session.text_document_definition, probe))
+                samples["hover"].append(_time(lsp_session.text_document_hover, probe))
+                samples["completion"].append(
+                    _time(lsp_session.text_document_completion, _inside_quotes(probe))
+                )
+            for probe in project.catalog_probes:
+                samples["references"].append(
+                    _time(lsp_session.text_document_references, probe, references=True)
+                )
+
+    metrics: Dict[str, Any] = {
+        name: round(timings[name] * 1000, 3) if name in timings else None
+        for name in ("initialize", "first_diagnostics", "first_request")
+    }
+    for method in REQUEST_METHODS:
+        metrics[method] = summarize(samples[method])
+    return {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": _environment(),
+        "spec": project.spec._asdict(),
+        "iterations": iterations,
+        "metrics": metrics,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Describe the metrics of ``results`` more than ``threshold`` slower than ``baseline``."""
+    if baseline.get("version") != results["version"] or baseline.get("spec") != results["spec"]:
+        return [f"Baseline is not comparable: {baseline.get('spec')} != {results['spec']}"]
+
+    regressions = []
+    for name, value in results["metrics"].items():
+        previous = baseline["metrics"].get(name)
+        for statistic in ("p50", "p99") if isinstance(value, dict) else (None,):
+            current = value.get(statistic) if statistic else value
+            before = previous.get(statistic) if statistic and previous else previous
+            if current is None or not before:
+                continue
+            if current > before * (1 + threshold):
+                label = f"{name} {statistic}" if statistic else name
+                regressions.append(
+                    f"{label}: {current:.1f} ms vs {before:.1f} ms (+{current / before - 1:.0%})"
+                )
+    return regressions
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    lines = [f"Project: {results['spec']}, {results['iterations']} iterations"]
+    for name, value in results["metrics"].items():
+        if isinstance(value, dict):
+            if value["count"]:
+                lines.append(
+                    f"  {name:<18} p50 {value['p50']:>9.2f} ms  p99 {value['p99']:>9.2f} ms"
+                    f"  ({value['count']} requests)"
+                )
+        elif value is None:
+            lines.append(f"  {name:<18} not received")
+        else:
+            lines.append(f"  {name:<18} {value:>13.2f} ms")
+    return "\n".join(lines)
+
+
+def save_results(results: Dict[str, Any], path: pathlib.Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf8")
+
+
+def _time(request, probe: Probe, references: bool = False) -> float:
+    params = {
+        "textDocument": {"uri": as_uri(str(probe.path))},
+        "position": {"line": probe.line, "character": probe.character},
+    }
+    if references:
+        params["context"] = {"includeDeclaration": False}
+    start = time.perf_counter()
+    request(params)
+    return time.perf_counter() - start
+
+
+def _inside_quotes(probe: Probe) -> Probe:
+    # Probes point one character into the quoted name, as completion is triggered by a quote
+    return probe._replace(character=probe.character - 1)
+
+
+def _environment() -> Dict[str, Optional[str]]:
+    try:
+        from importlib.metadata import version
+
+        kedro_version = version("kedro")
+    except Exception:  # pylint: disable=broad-except
+        kedro_version = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:  # pylint: disable=broad-except
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "kedro": kedro_version,
+        "commit": commit,
+    }
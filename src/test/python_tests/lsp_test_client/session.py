@@ -23,14 +23,16 @@ LSP_EXIT_TIMEOUT = 5000
 PUBLISH_DIAGNOSTICS = "textDocument/publishDiagnostics"
 WINDOW_LOG_MESSAGE = "window/logMessage"
 WINDOW_SHOW_MESSAGE = "window/showMessage"
+CLIENT_REGISTER_CAPABILITY = "client/registerCapability"
 
 
 # pylint: disable=too-many-instance-attributes
 class LspSession(MethodDispatcher):
     """Send and Receive messages over LSP as a test LS Client."""
 
-    def __init__(self, cwd=None, script=None):
+    def __init__(self, cwd=None, script=None, env=None):
         self.cwd = cwd if cwd else os.getcwd()
+        self.env = env if env is not None else os.environ
         # pylint: disable=consider-using-with
         self._thread_pool = ThreadPoolExecutor()
         self._sub = None
@@ -54,7 +56,7 @@ class LspSession(MethodDispatcher):
             stdin=subprocess.PIPE,
             bufsize=0,
             cwd=self.cwd,
-            env=os.environ,
+            env=self.env,
             shell="WITH_COVERAGE" in os.environ,
         )
 
@@ -65,6 +67,7 @@ class LspSession(MethodDispatcher):
             PUBLISH_DIAGNOSTICS: self._publish_diagnostics,
             WINDOW_SHOW_MESSAGE: self._window_show_message,
             WINDOW_LOG_MESSAGE: self._window_log_message,
+            CLIENT_REGISTER_CAPABILITY: self._client_register_capability,
         }
         self._endpoint = Endpoint(dispatcher, self._writer.write)
         self._thread_pool.submit(self._reader.listen, self._endpoint.consume)
@@ -158,6 +161,26 @@ class LspSession(MethodDispatcher):
         )
         return fut.result()
 
+    def text_document_hover(self, hover_params):
+        """Sends text document hover request to LSP server."""
+        fut = self._send_request("textDocument/hover", params=hover_params)
+        return fut.result()
+
+    def text_document_definition(self, definition_params):
+        """Sends text document definition request to LSP server."""
+        fut = self._send_request("textDocument/definition", params=definition_params)
+        return fut.result()
+
+    def text_document_references(self, references_params):
+        """Sends text document references request to LSP server."""
+        fut = self._send_request("textDocument/references", params=references_params)
+        return fut.result()
+
+    def text_document_completion(self, completion_params):
+        """Sends text document completion request to LSP server."""
+        fut = self._send_request("textDocument/completion", params=completion_params)
+        return fut.result()
+
     def set_notification_callback(self, notification_name, callback):
         """Set custom LS notification handler."""
         self._notification_callbacks[notification_name] = callback
@@ -190,6 +213,10 @@ class LspSession(MethodDispatcher):
             WINDOW_SHOW_MESSAGE, window_show_message_params
         )
 
+    def _client_register_capability(self, _register_capability_params):
+        """Internal handler for capability registration, accepted as VS Code does."""
+        return None
+
     def _handle_notification(self, notification_name, params):
         """Internal handler for notifications."""
         fut = Future()
@@ -0,0 +1,109 @@
+import sys
+from pathlib import Path
+from textwrap import dedent
+
+# Add bundled/tool to path to import the server helpers
+BUNDLED_PATH = Path(__file__).parents[3] / "bundled" / "tool"
+sys.path.insert(0, str(BUNDLED_PATH))
+
+from catalog_document import CatalogDocument
+
+CATALOG = dedent(
+    """\
+    # Raw data
+    companies:
+      type: pandas.CSVDataset
+      filepath: data/companies.csv
+
+    shuttles:
+      type: pandas.ExcelDataset
+      filepath: data/shuttles.xlsx
+    """
+)
+
+
+class TestCatalogDocument:
+    """Test block-wise parsing of catalog files."""
+
+    def test_blocks_are_spliced(self):
+        document = CatalogDocument()
+        document.update(CATALOG)
+        assert document.is_split
+        assert list(document.config) == ["companies", "shuttles"]
+        assert document.positions[("shuttles",)][:2] == (5, 0)
+        assert document.positions[("shuttles", "filepath")][:2] == (7, 2)
+
+    def test_only_edited_block_is_parsed(self):
+        document = CatalogDocument()
+        document.update(CATALOG)
+        dirty = document.update(
+            CATALOG.replace("data/shuttles.xlsx", "data/shuttles_v2.xlsx")
+        )
+        assert [block.start_line for block in dirty] == [5]
+        assert document.config["shuttles"]["filepath"] == "data/shuttles_v2.xlsx"
+
+    def test_unchanged_blocks_move_with_inserted_lines(self):
+        document = CatalogDocument()
+        document.update(CATALOG)
+        dirty = document.update("reviews:\n  type: MemoryDataset\n" + CATALOG)
+        assert len(dirty) == 1
+        assert document.positions[("shuttles",)][:2] == (7, 0)
+
+    ALIASED = dedent(
+        """\
+        _csv: &csv
+          type: pandas.CSVDataset
+          load_args:
+            sep: ","
+        companies:
+          <<: *csv
+          filepath: data/companies.csv
+        shuttles: *csv
+        """
+    )
+
+    def test_aliases_across_blocks_are_parsed_after_their_anchors(self):
+        document = CatalogDocument()
+        document.update(self.ALIASED)
+        assert document.is_split
+        assert document.error is None
+        assert list(document.config) == ["_csv", "companies", "shuttles"]
+        assert document.config["companies"]["type"] == "pandas.CSVDataset"
+        assert document.config["shuttles"]["load_args"] == {"sep": ","}
+        assert document.positions[("companies", "filepath")][:2] == (6, 2)
+        # Merged keys are where the anchor writes them
+        assert document.positions[("companies", "load_args", "sep")][:2] == (3, 4)
+
+    def test_only_edited_block_using_an_alias_is_parsed(self):
+        document = CatalogDocument()
+        document.update(self.ALIASED)
+        edited = "reviews:\n  type: MemoryDataset\n" + self.ALIASED.replace(
+            "data/companies.csv", "data/companies_v2.csv"
+        )
+        dirty = document.update(edited)
+        assert [block.start_line for block in dirty] == [0, 6]
+        assert document.config["companies"]["filepath"] == "data/companies_v2.csv"
+        assert document.positions[("companies", "load_args", "sep")][:2] == (5, 4)
+
+        # Blocks using an anchor are parsed again with it
+        dirty = document.update(edited.replace("pandas.CSVDataset", "pandas.ParquetDataset"))
+        assert [block.start_line for block in dirty] == [2, 6, 9]
+        assert document.config["shuttles"]["type"] == "pandas.ParquetDataset"
+
+    def test_aliases_before_their_anchor_fall_back_to_full_parse(self):
+        document = CatalogDocument()
+        document.update("companies: *csv\n_csv: &csv\n  type: pandas.CSVDataset\n")
+        assert not document.is_split
+        assert document.error is not None
+
+    def test_parse_error(self):
+        document = CatalogDocument()
+        document.update("companies:\n  type: [unclosed\n")
+        assert document.error is not None
+        assert document.config is None
+
+    def test_block_at(self):
+        document = CatalogDocument()
+        document.update(CATALOG)
+        assert document.block_at(3).start_line == 1
+        assert document.block_at(6).start_line == 5
@@ -0,0 +1,73 @@
+import logging
+import sys
+from pathlib import Path
+
+# Add bundled/tool to path to import the server helpers
+BUNDLED_PATH = Path(__file__).parents[3] / "bundled" / "tool"
+sys.path.insert(0, str(BUNDLED_PATH))
+
+from client_log import ClientLog  # noqa: E402
+
+
+class _Unformattable:
+    def __repr__(self):
+        raise AssertionError("Formatted although the level is disabled")
+
+    __str__ = __repr__
+
+
+class TestClientLog:
+    """Test the level gating and rate limiting of the logs sent to the client."""
+
+    def test_disabled_levels_are_not_formatted_or_sent(self):
+        sent = []
+        log = ClientLog(lambda level, message: sent.append((level, message)))
+
+        log.debug("location=%r", _Unformattable())
+        log.info("Switched to environment %s", "staging")
+        assert sent == [(logging.INFO, "Switched to environment staging")]
+
+    def test_level_can_change(self):
+        sent = []
+        log = ClientLog(lambda level, message: sent.append(message))
+        log.level = logging.DEBUG
+        log.debug("word=%s", "companies")
+        log.level = logging.WARNING
+        log.info("hidden")
+        log.log(logging.INFO, "always", force=True)
+        assert sent == ["word=companies", "always"]
+
+    def test_messages_without_args_are_not_formatted(self):
+        sent = []
+        ClientLog(lambda level, message: sent.append(message)).info("100% done")
+        assert sent == ["100% done"]
+
+    def test_bursts_are_rate_limited_except_errors(self):
+        sent = []
+        log = ClientLog(lambda level, message: sent.append((level, message)), rate=0, burst=3)
+
+        for index in range(10):
+            log.info("message %d", index)
+        log.error("still sent")
+        assert [message for _, message in sent] == [
+            "message 0",
+            "message 1",
+            "message 2",
+            "7 log messages were dropped, the server logged too fast",
+            "still sent",
+        ]
+
+    def test_dropped_messages_are_reported(self):
+        sent = []
+        log = ClientLog(lambda level, message: sent.append((level, message)), rate=0, burst=1)
+        log.info("first")
+        log.info("dropped")
+        assert log.dropped == 1
+        # A second later a message can be sent again
+        log.rate = 1
+        log._updated -= 1
+        log.info("after")
+
+        assert sent[1][0] == logging.WARNING
+        assert sent[1][1].startswith("1 log messages were dropped")
+        assert sent[-1] == (logging.INFO, "after")
@@ -0,0 +1,153 @@
+import importlib.util
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+# Add bundled/tool to path to import the server helpers
+BUNDLED_PATH = Path(__file__).parents[3] / "bundled" / "tool"
+sys.path.insert(0, str(BUNDLED_PATH))
+
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("kedro") is None,
+    reason="Requires Kedro to be installed",
+)
+
+
+@pytest.fixture
+def conf_source(tmp_path):
+    base = tmp_path / "conf" / "base"
+    local = tmp_path / "conf" / "local"
+    base.mkdir(parents=True)
+    local.mkdir(parents=True)
+    (base / "catalog.yml").write_text("companies:\n  type: pandas.CSVDataset\n")
+    (base / "catalog_extra.yml").write_text("shuttles:\n  type: pandas.ExcelDataset\n")
+    (base / "parameters.yml").write_text("alpha: 1\n")
+    return tmp_path / "conf"
+
+
+@pytest.fixture
+def cache(conf_source):
+    from kedro.config import OmegaConfigLoader
+
+    from config_cache import ConfigCache
+
+    loader = OmegaConfigLoader(str(conf_source), base_env="base", default_run_env="local")
+    return ConfigCache(loader)
+
+
+class TestConfigCache:
+    """Test memoization of the configs resolved by the config loader."""
+
+    def test_resolved_configs_are_memoized(self, cache):
+        catalog = cache["catalog"]
+        assert set(catalog) == {"companies", "shuttles"}
+        assert cache["catalog"] is catalog
+
+    def test_invalidate_drops_matching_keys_only(self, cache, conf_source):
+        catalog = cache["catalog"]
+        parameters = cache["parameters"]
+
+        assert cache.invalidate([str(conf_source / "base" / "catalog.yml")])
+        assert cache["parameters"] is parameters
+        assert cache["catalog"] is not catalog
+
+    def test_invalidate_ignores_unrelated_files(self, cache, conf_source):
+        assert not cache.invalidate([str(conf_source.parent / "src" / "pipeline.py")])
+        assert not cache.invalidate([str(conf_source / "README.md")])
+
+    def test_only_changed_files_are_read_again(self, cache, conf_source):
+        cache["catalog"]
+        catalog_file = conf_source / "base" / "catalog.yml"
+        catalog_file.write_text("companies:\n  type: pandas.ParquetDataset\n  extra: 1\n")
+        cache.invalidate([str(catalog_file)])
+
+        with mock.patch.object(
+            cache.config_loader._fs, "open", wraps=cache.config_loader._fs.open
+        ) as opened:
+            catalog = cache["catalog"]
+
+        assert [call.args[0] for call in opened.call_args_list] == [catalog_file.as_posix()]
+        assert catalog["companies"]["type"] == "pandas.ParquetDataset"
+        assert catalog["shuttles"]["type"] == "pandas.ExcelDataset"
+
+    def test_merging_does_not_alter_cached_files(self, cache, conf_source):
+        (conf_source / "local" / "catalog.yml").write_text(
+            "companies:\n  type: pandas.JSONDataset\n"
+        )
+        assert cache["catalog"]["companies"]["type"] == "pandas.JSONDataset"
+
+        cache.invalidate([str(conf_source / "local" / "catalog.yml")])
+        (conf_source / "local" / "catalog.yml").unlink()
+        assert cache["catalog"]["companies"]["type"] == "pandas.CSVDataset"
+
+    def test_globals_invalidate_everything(self, cache, conf_source):
+        catalog = cache["catalog"]
+        parameters = cache["parameters"]
+
+        assert cache.invalidate([str(conf_source / "base" / "globals.yml")])
+        assert cache["catalog"] is not catalog
+        assert cache["parameters"] is not parameters
+
+    def test_duplicate_keys_still_raise(self, cache, conf_source):
+        cache["catalog"]
+        duplicate = conf_source / "base" / "catalog_duplicate.yml"
+        duplicate.write_text("companies:\n  type: pandas.CSVDataset\n")
+        cache.invalidate([str(duplicate)])
+
+        with pytest.raises(ValueError, match="Duplicate keys"):
+            cache["catalog"]
+
+    def test_loaders_without_the_private_members_are_only_memoized(
+        self, conf_source, monkeypatch
+    ):
+        from kedro.config import OmegaConfigLoader
+
+        from config_cache import ConfigCache
+
+        loader = OmegaConfigLoader(str(conf_source), base_env="base", default_run_env="local")
+        # E.g. a Kedro version that renamed one of them
+        monkeypatch.delattr(OmegaConfigLoader, "_is_valid_config_path")
+        cache = ConfigCache(loader)
+        monkeypatch.undo()
+        assert "_read_dir_configs" not in vars(loader)
+
+        catalog = cache["catalog"]
+        assert set(catalog) == {"companies", "shuttles"}
+        assert cache["catalog"] is catalog
+
+
+class TestConfigPositionIndex:
+    """Test the per-file index of config key positions."""
+
+    def test_dotted_paths_are_indexed(self, tmp_path):
+        from config_cache import ConfigPositionIndex
+
+        parameters = tmp_path / "parameters.yml"
+        parameters.write_text("model:\n  alpha: 1\n  model_v2: 3\nmodel_v2:\n  beta: 2\n")
+
+        dotted = ConfigPositionIndex().get(parameters).dotted
+        assert (dotted["model.alpha"].line, dotted["model.alpha"].character) == (1, 2)
+        assert (dotted["model_v2"].line, dotted["model_v2"].character) == (3, 0)
+        assert dotted["model.model_v2"].line == 2
+
+    def test_files_are_parsed_again_only_after_a_change(self, tmp_path):
+        from config_cache import ConfigPositionIndex
+
+        parameters = tmp_path / "parameters.yml"
+        parameters.write_text("alpha: 1\n")
+        index = ConfigPositionIndex()
+        first = index.get(parameters)
+        assert index.get(parameters) is first
+
+        parameters.write_text("# moved\nalpha: 1\n")
+        assert index.get(parameters).dotted["alpha"].line == 1
+
+    def test_broken_files_are_indexed_empty(self, tmp_path):
+        from config_cache import ConfigPositionIndex
+
+        parameters = tmp_path / "parameters.yml"
+        parameters.write_text("alpha: [1\n")
+        assert ConfigPositionIndex().get(parameters).dotted == {}
+        assert ConfigPositionIndex().get(tmp_path / "missing.yml").dotted == {}
@@ -0,0 +1,123 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add bundled/tool to path to import the server helpers
+BUNDLED_PATH = Path(__file__).parents[3] / "bundled" / "tool"
+sys.path.insert(0, str(BUNDLED_PATH))
+
+from dataset_usage import UNDEFINED, UNUSED, DatasetUsageIndex  # noqa: E402
+from pipeline_index import PipelineGraphIndex  # noqa: E402
+
+PIPELINE = '''from kedro.pipeline import Pipeline, node
+
+
+def create_pipeline(**kwargs):
+    return Pipeline(
+        [
+            node(len, ["companies", "params:alpha"], "preprocessed"),
+            node(len, ["preprocessed", "shuttles"], "model_input"),
+        ]
+    )
+'''
+
+CATALOG = Path("/conf/base/catalog.yml")
+# One catalog entry per line
+ENTRIES = ["_template", "companies", "model_input", "old_table", "shuttles"]
+
+
+def _write(path: Path, content: str):
+    # Bump the modification time even on filesystems with a coarse clock
+    existed = path.exists()
+    path.write_text(content)
+    if existed:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def pipeline_file(tmp_path):
+    pipeline_dir = tmp_path / "src" / "demo" / "pipelines" / "data_processing"
+    pipeline_dir.mkdir(parents=True)
+    (pipeline_dir / "pipeline.py").write_text(PIPELINE)
+    return pipeline_dir / "pipeline.py"
+
+
+@pytest.fixture
+def graph(pipeline_file):
+    graph = PipelineGraphIndex(pipeline_file.parents[1])
+    assert graph.wait(5)
+    return graph
+
+
+def _locate_entry(name):
+    return [(CATALOG, ENTRIES.index(name), 0)]
+
+
+def _update(index, graph, catalog, names=(), patterns=(), is_generated=lambda name: False):
+    return index.update(set(catalog), patterns, graph, names, _locate_entry, is_generated)
+
+
+class TestDatasetUsageIndex:
+    """Test the join of the catalog with the datasets of the pipelines."""
+
+    def test_unused_entries_and_undefined_inputs(self, graph, pipeline_file):
+        index = DatasetUsageIndex()
+        changed = _update(index, graph, ["companies", "model_input", "old_table", "_template"])
+        assert changed == {CATALOG, pipeline_file}
+
+        (unused,) = index.warnings(CATALOG)
+        assert (unused.kind, unused.dataset, unused.line) == (UNUSED, "old_table", 3)
+        (undefined,) = index.warnings(pipeline_file)
+        assert (undefined.kind, undefined.dataset) == (UNDEFINED, "shuttles")
+        assert (undefined.line, undefined.character) == (7, 40)
+        assert "not in the catalog" in undefined.message
+
+    def test_catalog_changes_only_join_the_changed_entries(self, graph, pipeline_file):
+        index = DatasetUsageIndex()
+        _update(index, graph, ["companies", "old_table"])
+        assert _update(index, graph, ["companies", "old_table"]) == set()
+
+        changed = _update(index, graph, ["companies", "shuttles"])
+        assert changed == {CATALOG, pipeline_file}
+        assert index.warnings(CATALOG) == []
+        assert index.warnings(pipeline_file) == []
+
+    def test_pipeline_changes_join_the_touched_datasets(self, graph, pipeline_file):
+        index = DatasetUsageIndex()
+        _update(index, graph, ["companies", "shuttles", "old_table"])
+        assert [warning.dataset for warning in index.warnings(CATALOG)] == ["old_table"]
+
+        _write(pipeline_file, PIPELINE.replace('"shuttles"', '"old_table"'))
+        names = graph.refresh([str(pipeline_file)])
+        assert {"shuttles", "old_table"} <= names
+        _update(index, graph, ["companies", "shuttles", "old_table"], names)
+        assert [warning.dataset for warning in index.warnings(CATALOG)] == ["shuttles"]
+
+    def test_parameters_and_pattern_datasets_are_defined(self, graph, pipeline_file):
+        index = DatasetUsageIndex()
+        _update(index, graph, ["companies"])
+        assert [warning.dataset for warning in index.warnings(pipeline_file)] == ["shuttles"]
+
+        # A new factory pattern joins every dataset again
+        changed = _update(
+            index, graph, ["companies"], patterns=("{name}s",), is_generated=lambda name: name.endswith("s")
+        )
+        assert changed == {pipeline_file}
+        assert index.warnings(pipeline_file) == []
+
+    def test_namespaced_pipelines_use_their_namespaced_datasets(self, graph, pipeline_file):
+        _write(
+            pipeline_file,
+            PIPELINE.replace("    return Pipeline(", "    base = Pipeline(")
+            + '    return pipeline(base, namespace="dp", inputs="companies")\n',
+        )
+        graph.refresh([str(pipeline_file)])
+        index = DatasetUsageIndex()
+        _update(index, graph, ["companies", "model_input", "dp.shuttles"])
+
+        # The free input mapped to the catalog entry is not namespaced
+        assert [warning.dataset for warning in index.warnings(CATALOG)] == ["model_input"]
+        assert index.warnings(pipeline_file) == []
@@ -0,0 +1,151 @@
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add bundled/tool to path to import the server helpers
+BUNDLED_PATH = Path(__file__).parents[3] / "bundled" / "tool"
+sys.path.insert(0, str(BUNDLED_PATH))
+
+import index_cache  # noqa: E402
+from index_cache import IndexCache  # noqa: E402
+from pipeline_index import PipelineReferenceIndex, find_literals  # noqa: E402
+
+
+def _touch(path: Path, content: str):
+    # Bump the modification time even on filesystems with a coarse clock
+    stat = path.stat()
+    path.write_text(content)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestIndexCache:
+    """Test the project cache file shared by consecutive servers."""
+
+    def test_sections_survive_a_restart(self, tmp_path):
+        cache = IndexCache(tmp_path / "project", tmp_path / "cache")
+        cache.sections = {"catalog_reports": {"file:///catalog.yml": {"result_id": "abc"}}}
+        assert cache.save()
+
+        restored = IndexCache(tmp_path / "project", tmp_path / "cache")
+        assert restored.load()
+        assert restored.sections == cache.sections
+
+    def test_other_projects_and_versions_are_ignored(self, tmp_path):
+        cache = IndexCache(tmp_path / "project", tmp_path / "cache")
+        cache.sections = {"pipeline_references": {}}
+        cache.save()
+
+        assert not IndexCache(tmp_path / "other", tmp_path / "cache").load()
+        upgraded = IndexCache(tmp_path / "project", tmp_path / "cache")
+        upgraded.key["kedro"] = "99.0.0"
+        assert not upgraded.load()
+
+    def test_installing_packages_invalidates_the_cache(self, tmp_path, monkeypatch):
+        site_packages = tmp_path / "site-packages"
+        site_packages.mkdir()
+        monkeypatch.setattr(sys, "path", [str(site_packages), *sys.path])
+        cache = IndexCache(tmp_path / "project", tmp_path / "cache")
+        cache.sections = {"catalog_reports": {}}
+        cache.save()
+
+        (site_packages / "pandas-2.2.0.dist-info").mkdir()
+        stat = site_packages.stat()
+        os.utime(site_packages, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert not IndexCache(tmp_path / "project", tmp_path / "cache").load()
+
+    def test_updating_the_server_invalidates_the_cache(self, tmp_path, monkeypatch):
+        server = tmp_path / "tool"
+        (server / "validators").mkdir(parents=True)
+        (server / "validators" / "utils.py").write_text("RULES = 1\n")
+        monkeypatch.setattr(index_cache, "SERVER_DIRECTORY", server)
+        cache = IndexCache(tmp_path / "project", tmp_path / "cache")
+        cache.sections = {"catalog_reports": {}}
+        cache.save()
+        assert IndexCache(tmp_path / "project", tmp_path / "cache").load()
+
+        _touch(server / "validators" / "utils.py", "RULES = 2\n")
+        assert not IndexCache(tmp_path / "project", tmp_path / "cache").load()
+
+    def test_unchanged_sections_are_not_written_again(self, tmp_path):
+        cache = IndexCache(tmp_path / "project", tmp_path / "cache")
+        cache.sections = {"pipeline_references": {}}
+        assert cache.save()
+        assert not cache.save()
+
+        restored = IndexCache(tmp_path / "project", tmp_path / "cache")
+        restored.load()
+        assert not restored.save()
+
+    def test_broken_files_are_ignored(self, tmp_path):
+        cache = IndexCache(tmp_path / "project", tmp_path / "cache")
+        cache.directory.mkdir()
+        cache.path.write_text("{not json")
+        assert not cache.load()
+        assert cache.sections == {}
+
+
+class TestPipelineReferenceIndex:
+    """Test the index of the string literals of pipeline files."""
+
+    def test_literals_match_quoted_words(self):
+        lines = find_literals('node(func, "companies", ["a", "b"])\n# "params:alpha"\nx = 1\n')
+        assert lines["companies"] == [0]
+        assert lines["a"] == lines["b"] == [0]
+        assert lines["params:alpha"] == [1]
+
+    def test_only_changed_files_are_read_again(self, tmp_path):
+        first = tmp_path / "first.py"
+        second = tmp_path / "second.py"
+        first.write_text('"companies"\n')
+        second.write_text('\n"shuttles"\n')
+        index = PipelineReferenceIndex()
+        assert index.find([first, second], "shuttles") == [(second, 1)]
+
+        _touch(first, '\n\n"shuttles"\n')
+        assert index.find([first, second], "shuttles") == [(first, 2), (second, 1)]
+        assert index.find([first, second], "companies") == []
+
+    def test_restored_files_are_checked_against_disk(self, tmp_path):
+        pipeline = tmp_path / "pipeline.py"
+        pipeline.write_text('"companies"\n')
+        index = PipelineReferenceIndex()
+        index.get(pipeline)
+        dumped = index.dump()
+
+        restored = PipelineReferenceIndex()
+        restored.restore(dumped)
+        assert restored.find([pipeline], "companies") == [(pipeline, 0)]
+
+        _touch(pipeline, '\n"companies"\n')
+        restored = PipelineReferenceIndex()
+        restored.restore(dumped)
+        assert restored.find([pipeline], "companies") == [(pipeline, 1)]
+
+
+@pytest.mark.skipif(importlib.util.find_spec("kedro") is None, reason="Requires Kedro")
+class TestConfigPositionIndexCache:
+    """Test that key positions are restored from a dump of the index."""
+
+    def test_positions_are_restored(self, tmp_path):
+        from config_cache import ConfigPositionIndex
+
+        parameters = tmp_path / "parameters.yml"
+        parameters.write_text("model:\n  alpha: 1\n")
+        index = ConfigPositionIndex()
+        expected = index.get(parameters)
+
+        restored = ConfigPositionIndex()
+        restored.restore(index.dump())
+        assert restored.get(parameters) == expected
+
+    def test_configs_not_surviving_json_are_not_dumped(self, tmp_path):
+        from config_cache import ConfigPositionIndex
+
+        parameters = tmp_path / "parameters.yml"
+        parameters.write_text("start: 2024-01-01\n1: one\n")
+        index = ConfigPositionIndex()
+        index.get(parameters)
+        assert index.dump() == {}
@@ -0,0 +1,84 @@
+import importlib.util
+
+import pytest
+
+from .lsp_benchmark import ProjectSpec, compare, generate_project, run_benchmark
+from .lsp_benchmark.runner import percentile
+
+
+def _results(spec=ProjectSpec(), **metrics):
+    return {"version": 1, "spec": spec._asdict(), "metrics": metrics}
+
+
+class TestSyntheticProject:
+    """Test the projects generated for the benchmarks."""
+
+    def test_project_has_the_requested_size(self, tmp_path):
+        project = generate_project(tmp_path, ProjectSpec(20, 4, 3))
+
+        catalog = project.catalog.read_text()
+        assert catalog.count("type: MemoryDataset") == 21
+        assert "group_1:\n  level_1:\n    level_2:\n      level_3: 1" in project.parameters.read_text()
+        assert len(project.pipelines) == 3
+        assert len(project.catalog_probes) == 20
+
+    def test_probes_point_into_names(self, tmp_path):
+        project = generate_project(tmp_path, ProjectSpec(10, 2, 2))
+
+        for probe in project.pipeline_probes + project.catalog_probes:
+            line = probe.path.read_text().splitlines()[probe.line]
+            assert line[probe.character - 1 :].startswith(probe.word)
+
+    @pytest.mark.skipif(importlib.util.find_spec("kedro") is None, reason="Requires Kedro")
+    def test_project_loads_in_kedro(self, tmp_path):
+        from kedro.config import OmegaConfigLoader
+
+        project = generate_project(tmp_path, ProjectSpec(10, 3, 2))
+        loader = OmegaConfigLoader(str(tmp_path / "conf"), base_env="base", default_run_env="local")
+        assert loader["parameters"]["group_0"]["level_1"]["level_2"] == 0
+        assert "dataset_9" in loader["catalog"]
+        compile(project.pipelines[0].read_text(), str(project.pipelines[0]), "exec")
+
+
+class TestCompare:
+    """Test the comparison of benchmark results with a baseline."""
+
+    def test_percentile_is_nearest_rank(self):
+        samples = [float(value) for value in range(1, 101)]
+        assert percentile(samples, 50) == 50
+        assert percentile(samples, 99) == 99
+        assert percentile([3.0], 99) == 3.0
+
+    def test_slowdowns_beyond_threshold_are_regressions(self):
+        baseline = _results(initialize=100.0, hover={"count": 5, "p50": 1.0, "p99": 2.0})
+        results = _results(initialize=110.0, hover={"count": 5, "p50": 1.5, "p99": 2.1})
+
+        regressions = compare(results, baseline, threshold=0.2)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("hover p50")
+
+    def test_missing_metrics_are_skipped(self):
+        baseline = _results(first_diagnostics=None, hover={"count": 0})
+        results = _results(first_diagnostics=50.0, hover={"count": 5, "p50": 1.0, "p99": 2.0})
+        assert compare(results, baseline, threshold=0.2) == []
+
+    def test_different_projects_are_not_compared(self):
+        regressions = compare(_results(ProjectSpec(10)), _results(ProjectSpec(20)), 0.2)
+        assert regressions[0].startswith("Baseline is not comparable")
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("kedro") is None
+    or importlib.util.find_spec("pygls") is None
+    or importlib.util.find_spec("pyls_jsonrpc") is None,
+    reason="Requires Kedro, pygls and python-jsonrpc-server to be installed",
+)
+def test_benchmark_runs_against_the_server(tmp_path):
+    results = run_benchmark(generate_project(tmp_path, ProjectSpec(4, 2, 1)), iterations=1)
+
+    metrics = results["metrics"]
+    assert metrics["initialize"] > 0
+    assert metrics["first_diagnostics"] > 0
+    assert metrics["first_request"] >= metrics["initialize"]
+    assert metrics["hover"]["count"] == metrics["definition"]["count"] == 6
+    assert metrics["references"]["count"] == 4
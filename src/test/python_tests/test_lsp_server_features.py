@@ -0,0 +1,648 @@
+import asyncio
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from lsprotocol.types import Position
+
+# Add bundled/tool to path to import the server
+BUNDLED_PATH = Path(__file__).parents[3] / "bundled" / "tool"
+sys.path.insert(0, str(BUNDLED_PATH))
+
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("kedro") is None
+    or importlib.util.find_spec("pygls") is None,
+    reason="Requires Kedro and pygls to be installed",
+)
+
+
+@pytest.fixture(scope="module")
+def lsp_server():
+    import lsp_server
+
+    return lsp_server
+
+
+def _diagnostic(lsp_server, message, line=0):
+    return lsp_server.create_diagnostic(
+        range_start=Position(line=line, character=0),
+        range_end=Position(line=line, character=4),
+        message=message,
+    )
+
+
+class TestDiagnosticsStore:
+    """Test that unchanged diagnostics are not published again."""
+
+    def test_identical_diagnostics_are_suppressed(self, lsp_server):
+        store = lsp_server.DiagnosticsStore()
+        assert store.has_changed("file:///a.yml", [_diagnostic(lsp_server, "error")])
+        assert not store.has_changed(
+            "file:///a.yml", [_diagnostic(lsp_server, "error")]
+        )
+        assert store.has_changed("file:///a.yml", [_diagnostic(lsp_server, "other")])
+
+    def test_empty_diagnostics_only_clear_published_ones(self, lsp_server):
+        store = lsp_server.DiagnosticsStore()
+        assert not store.has_changed("file:///a.yml", [])
+        store.has_changed("file:///a.yml", [_diagnostic(lsp_server, "error")])
+        assert store.has_changed("file:///a.yml", [])
+        assert not store.has_changed("file:///a.yml", [])
+
+
+class TestValidationWorkers:
+    """Test that each workspace folder sets the validation threads of its catalogs."""
+
+    def test_setting_of_the_folder_containing_the_catalog(self, lsp_server, tmp_path, monkeypatch):
+        first, second = tmp_path / "first", tmp_path / "second"
+        monkeypatch.setattr(
+            lsp_server,
+            "WORKSPACE_SETTINGS",
+            {str(first): {"validationWorkers": 2}, str(second): {"validationWorkers": 8}},
+        )
+        assert lsp_server._get_validation_workers((second / "conf" / "catalog.yml").as_uri()) == 8
+        assert lsp_server._get_validation_workers((first / "catalog.yml").as_uri()) == 2
+        assert lsp_server._get_validation_workers() == 2
+
+
+class TestWorkspaceDiagnostics:
+    """Test that repeated workspace diagnostic pulls only redo the work for changes."""
+
+    def test_unchanged_files_are_not_read_again(self, lsp_server, tmp_path, monkeypatch):
+        catalog = tmp_path / "catalog.yml"
+        catalog.write_text("companies: {}\n")
+        reads = []
+        read_catalog_content = lsp_server.read_catalog_content
+        monkeypatch.setattr(
+            lsp_server,
+            "read_catalog_content",
+            lambda ls, uri: reads.append(uri) or read_catalog_content(ls, uri),
+        )
+        monkeypatch.setattr(lsp_server, "compute_catalog_diagnostics", lambda content, document, max_workers: [])
+
+        first = lsp_server.get_catalog_report(lsp_server.LSP_SERVER, catalog.as_uri())
+        assert lsp_server.get_catalog_report(lsp_server.LSP_SERVER, catalog.as_uri()) == first
+        assert len(reads) == 1
+
+        catalog.write_text("companies: {}\nshuttles: {}\n")
+        assert lsp_server.get_catalog_report(lsp_server.LSP_SERVER, catalog.as_uri()) != first
+        assert len(reads) == 2
+
+    def test_only_the_edited_block_using_an_alias_is_validated(self, lsp_server, monkeypatch):
+        from catalog_document import CatalogDocument
+
+        validated = []
+        validate_blocks = lsp_server._validate_blocks
+
+        def _validate_blocks(document, blocks, content, max_workers):
+            validated.append([block.start_line for block in blocks])
+            return validate_blocks(document, blocks, content, max_workers)
+
+        monkeypatch.setattr(lsp_server, "_validate_blocks", _validate_blocks)
+        content = (
+            "_memory: &memory\n"
+            "  type: MemoryDataset\n"
+            "companies:\n"
+            "  <<: *memory\n"
+            "  copy_mode: deepcopy\n"
+            "shuttles: *memory\n"
+        )
+        document = CatalogDocument()
+        lsp_server.compute_catalog_diagnostics(content, document, max_workers=1)
+        lsp_server.compute_catalog_diagnostics(
+            content.replace("deepcopy", "copy"), document, max_workers=1
+        )
+        assert validated == [[0, 2, 5], [2]]
+
+    def test_catalog_files_are_found_again_when_one_is_created(
+        self, lsp_server, tmp_path, monkeypatch
+    ):
+        import asyncio
+        from lsprotocol.types import DidChangeWatchedFilesParams, FileChangeType, FileEvent
+
+        project = lsp_server.KedroProject(tmp_path, {"datasetUsageDiagnostics": False})
+        project.project_metadata = object()
+        monkeypatch.setattr(lsp_server.LSP_SERVER, "projects", {tmp_path: project})
+        monkeypatch.setattr(lsp_server.LSP_SERVER, "supports_pull_diagnostics", lambda: True)
+        monkeypatch.setattr(lsp_server.LSP_SERVER, "refresh_diagnostics", lambda: None)
+        (tmp_path / "catalog.yml").write_text("")
+        assert len(lsp_server._find_project_catalog_files(lsp_server.LSP_SERVER)) == 1
+
+        created = tmp_path / "conf" / "catalog_new.yml"
+        created.parent.mkdir()
+        created.write_text("")
+        assert len(lsp_server._find_project_catalog_files(lsp_server.LSP_SERVER)) == 1
+        asyncio.run(
+            lsp_server.did_change_watched_files(
+                lsp_server.LSP_SERVER,
+                DidChangeWatchedFilesParams(
+                    changes=[FileEvent(uri=created.as_uri(), type=FileChangeType.Created)]
+                ),
+            )
+        )
+        assert len(lsp_server._find_project_catalog_files(lsp_server.LSP_SERVER)) == 2
+
+
+@pytest.fixture
+def project(lsp_server, tmp_path):
+    from kedro.config import OmegaConfigLoader
+
+    for env in ("base", "local"):
+        (tmp_path / "conf" / env).mkdir(parents=True)
+    (tmp_path / "conf" / "base" / "parameters.yml").write_text("alpha: 1\n")
+
+    project = lsp_server.KedroProject(tmp_path, {})
+    project.snapshot = lsp_server.EnvironmentSnapshot(
+        "local",
+        None,
+        OmegaConfigLoader(str(tmp_path / "conf"), base_env="base", default_run_env="local"),
+    )
+    return project
+
+
+class TestConfPaths:
+    """Test that config file lookups are cached until files come or go."""
+
+    def test_paths_are_cached(self, lsp_server, project):
+        paths = lsp_server._get_conf_paths(project, "parameters")
+        assert [path.name for path in paths] == ["parameters.yml"]
+        assert lsp_server._get_conf_paths(project, "parameters") is paths
+
+    def test_created_files_invalidate_their_key(self, lsp_server, project, tmp_path):
+        parameters = lsp_server._get_conf_paths(project, "parameters")
+        catalog = lsp_server._get_conf_paths(project, "catalog")
+        created = tmp_path / "conf" / "local" / "parameters.yml"
+        created.write_text("alpha: 2\n")
+
+        project.forget_conf_paths([str(created)])
+        assert lsp_server._get_conf_paths(project, "catalog") is catalog
+        assert [path for path in lsp_server._get_conf_paths(project, "parameters")] == [
+            created,
+            *parameters,
+        ]
+
+
+class TestParamLocation:
+    """Test that parameters resolve to the exact position of their key."""
+
+    @pytest.fixture(autouse=True)
+    def parameters(self, project, tmp_path):
+        (tmp_path / "conf" / "base" / "parameters.yml").write_text(
+            "model:\n  alpha: 1\n  layers: [1, 2]\nmodel_v2:\n  beta: 2\n"
+        )
+
+    @pytest.mark.parametrize(
+        "word, expected",
+        [
+            ("params:model_v2", (3, 0)),
+            ("params:model", (0, 0)),
+            ("params:model.alpha", (1, 2)),
+            ("params:model.layers.0", (2, 2)),
+            ("params:model.missing", (0, 0)),
+        ],
+    )
+    def test_location(self, lsp_server, project, word, expected):
+        location = lsp_server._get_param_location(project, word)
+        start = location.range.start
+        assert (start.line, start.character) == expected
+
+    def test_unknown_parameter(self, lsp_server, project):
+        assert lsp_server._get_param_location(project, "params:unknown") is None
+
+
+class TestProjectRouting:
+    """Test that requests are routed to the project of their workspace folder."""
+
+    @pytest.fixture
+    def server(self, lsp_server, tmp_path, monkeypatch):
+        folders = {
+            str(tmp_path / "first"): {"kedroProjectPath": ""},
+            str(tmp_path / "second"): {"kedroProjectPath": str(tmp_path / "second" / "project")},
+        }
+        monkeypatch.setattr(lsp_server, "WORKSPACE_SETTINGS", folders)
+        return lsp_server.KedroLanguageServer("test-server", "v0")
+
+    def test_documents_use_the_project_of_their_folder(self, server, tmp_path):
+        first = server.project_for((tmp_path / "first" / "conf" / "catalog.yml").as_uri())
+        second = server.project_for((tmp_path / "second" / "src" / "pipeline.py").as_uri())
+
+        assert first.root_path == tmp_path / "first"
+        assert second.root_path == tmp_path / "second" / "project"
+        assert server.project_for((tmp_path / "first" / "other.py").as_uri()) is first
+
+    def test_documents_outside_folders_use_the_first_project(self, server, tmp_path):
+        assert server.project_for((tmp_path / "elsewhere.py").as_uri()).root_path == (
+            tmp_path / "first"
+        )
+        assert server.project_for().root_path == tmp_path / "first"
+
+    def test_removed_projects_are_saved_and_their_diagnostics_cleared(
+        self, lsp_server, tmp_path, monkeypatch
+    ):
+        server = lsp_server.LSP_SERVER
+        project = lsp_server.KedroProject(tmp_path / "first", {})
+        saved, published = [], []
+        monkeypatch.setattr(project, "save_index", saved.append)
+        monkeypatch.setattr(server, "projects", {project.root_path: project})
+        monkeypatch.setattr(server, "diagnostics_store", lsp_server.DiagnosticsStore())
+        monkeypatch.setattr(server, "supports_pull_diagnostics", lambda: False)
+        monkeypatch.setattr(
+            lsp_server.LanguageServer,
+            "publish_diagnostics",
+            lambda ls, uri, diagnostics, *args, **kwargs: published.append((uri, diagnostics)),
+        )
+        inside = (tmp_path / "first" / "conf" / "catalog.yml").as_uri()
+        outside = (tmp_path / "second" / "conf" / "catalog.yml").as_uri()
+        for uri in (inside, outside):
+            server.publish_diagnostics(uri, [_diagnostic(lsp_server, "error")])
+        published.clear()
+
+        server.remove_project(project.root_path)
+        assert server.projects == {}
+        assert len(saved) == 1
+        assert published == [(inside, [])]
+
+    def test_idle_projects_are_evicted(self, lsp_server, server, tmp_path, monkeypatch):
+        first = server.project_for((tmp_path / "first" / "a.py").as_uri())
+        first.last_used -= lsp_server.PROJECT_IDLE_TIMEOUT + 1
+        second = server.project_for((tmp_path / "second" / "b.py").as_uri())
+
+        assert list(server.projects.values()) == [second]
+        assert server.project_for((tmp_path / "first" / "a.py").as_uri()) is not first
+
+
+class TestEnvironmentSwitching:
+    """Test that run environments are switched in place from their snapshots."""
+
+    @pytest.fixture
+    def loads(self, lsp_server, project, tmp_path, monkeypatch):
+        from kedro.config import OmegaConfigLoader
+
+        (tmp_path / "conf" / "base" / "catalog.yml").write_text("companies:\n  type: pandas.CSVDataset\n")
+        for env in ("staging", "prod"):
+            (tmp_path / "conf" / env).mkdir()
+        (tmp_path / "conf" / "staging" / "parameters.yml").write_text("alpha: 2\n")
+        project.project_metadata = object()
+        project.snapshots[project.run_env] = project.snapshot
+        loads = []
+
+        def _load_environment(env):
+            loads.append(env)
+            config_loader = OmegaConfigLoader(
+                str(tmp_path / "conf"), env=env, base_env="base", default_run_env="local"
+            )
+            return lsp_server.EnvironmentSnapshot(env or "local", None, config_loader)
+
+        monkeypatch.setattr(project, "_load_environment", _load_environment)
+        return loads
+
+    def test_environments_are_loaded_once(self, project, loads):
+        assert project.dummy_catalog.load("params:alpha") == 1
+        assert not project.has_environment("staging")
+
+        project.switch_environment("staging")
+        assert project.run_env == "staging"
+        assert project.dummy_catalog.load("params:alpha") == 2
+
+        project.switch_environment(None)
+        project.switch_environment("staging")
+        assert loads == ["staging"]
+        assert project.has_environment("staging")
+
+    def test_least_recently_used_environments_are_dropped(
+        self, lsp_server, project, loads, monkeypatch
+    ):
+        monkeypatch.setattr(lsp_server, "MAX_ENVIRONMENT_SNAPSHOTS", 2)
+        project.switch_environment("staging")
+        project.switch_environment("prod")
+
+        assert list(project.snapshots) == ["staging", "prod"]
+        assert project.run_env == "prod"
+
+    def test_warming_never_evicts_snapshots(self, lsp_server, project, loads, monkeypatch):
+        class _Thread:
+            def __init__(self, target, **kwargs):
+                self.target = target
+
+            def start(self):
+                self.target()
+
+        monkeypatch.setattr(lsp_server, "MAX_ENVIRONMENT_SNAPSHOTS", 2)
+        monkeypatch.setattr(lsp_server.threading, "Thread", _Thread)
+        project.warm_environments(["staging", "prod"])
+        assert loads == ["staging"]
+        assert list(project.snapshots) == ["staging", "local"]
+
+    def test_failed_switches_report_an_error(self, lsp_server, project, loads, monkeypatch):
+        def _load_environment(env):
+            raise ValueError("broken settings")
+
+        monkeypatch.setattr(lsp_server, "_check_project", lambda uri=None: project)
+        monkeypatch.setattr(project, "_load_environment", _load_environment)
+        result = lsp_server.switch_environment(lsp_server.LSP_SERVER, mock.Mock(environment="prod"))
+        assert result == {"environment": None, "reused": False, "error": "broken settings"}
+        assert project.run_env == "local"
+
+    def test_config_changes_reach_every_snapshot(self, project, loads, tmp_path):
+        project.switch_environment("staging")
+        assert project.snapshots["local"].dummy_catalog.load("params:alpha") == 1
+
+        parameters = tmp_path / "conf" / "base" / "parameters.yml"
+        parameters.write_text("alpha: 3\n")
+        project.reload_config([str(parameters)])
+        assert project.snapshots["local"].dummy_catalog.load("params:alpha") == 3
+        assert project.dummy_catalog.load("params:alpha") == 2
+
+
+class TestProjectLifecycle:
+    """Test that projects are bootstrapped once and failures back off."""
+
+    @pytest.fixture
+    def bootstraps(self, lsp_server, monkeypatch):
+        bootstraps = []
+
+        def _bootstrap_project(root_path):
+            bootstraps.append(root_path)
+            raise RuntimeError("broken settings.py")
+
+        monkeypatch.setattr(lsp_server, "_bootstrap_project", _bootstrap_project)
+        return bootstraps
+
+    def test_failed_projects_back_off(self, lsp_server, tmp_path, bootstraps):
+        project = lsp_server.KedroProject(tmp_path, {})
+        project.load()
+        project.load()
+        assert project.state is lsp_server.ProjectState.FAILED
+        assert len(bootstraps) == 1
+
+        first_delay = project.retry_at - lsp_server.time.monotonic()
+        project.retry_at = 0.0
+        project.load()
+        assert len(bootstraps) == 2
+        assert project.retry_at - lsp_server.time.monotonic() > first_delay
+
+    def test_retry_clears_the_backoff(self, lsp_server, tmp_path, bootstraps):
+        project = lsp_server.KedroProject(tmp_path, {})
+        project.load()
+        project.retry()
+        project.load()
+        assert len(bootstraps) == 2
+
+    def test_ready_projects_are_not_bootstrapped_again(
+        self, lsp_server, project, tmp_path, monkeypatch
+    ):
+        snapshot = project.snapshot
+        bootstraps = []
+        monkeypatch.setattr(
+            lsp_server,
+            "_bootstrap_project",
+            lambda root_path: bootstraps.append(root_path) or mock.Mock(package_name=None),
+        )
+        monkeypatch.setattr(project, "_load_environment", lambda env, package_name=None: snapshot)
+
+        project.load()
+        project.load()
+        assert project.state is lsp_server.ProjectState.READY
+        assert project.is_kedro_project()
+        assert bootstraps == [tmp_path]
+
+    def test_projects_are_analysed_once_bootstrapped(self, lsp_server, project, monkeypatch):
+        snapshot = project.snapshot
+        monkeypatch.setattr(
+            lsp_server, "_bootstrap_project", lambda root_path: mock.Mock(package_name=None)
+        )
+        monkeypatch.setattr(project, "_load_environment", lambda env, package_name=None: snapshot)
+        # e.g. the project of the second workspace folder, loaded on its first request
+        monkeypatch.setattr(lsp_server.LSP_SERVER, "project_for", lambda uri=None: project)
+        analysed = []
+
+        async def _analyse_dataset_usage(ls, analysed_project, names=()):
+            analysed.append(analysed_project)
+
+        monkeypatch.setattr(lsp_server, "analyse_dataset_usage", _analyse_dataset_usage)
+
+        async def _requests():
+            lsp_server._check_project("file:///second/conf/base/catalog.yml")
+            lsp_server._check_project("file:///second/conf/base/catalog.yml")
+            await asyncio.sleep(0)
+
+        asyncio.run(_requests())
+        assert analysed == [project]
+
+
+class TestIndexPersistence:
+    """Test that a new server reuses the indexes and reports of the previous one."""
+
+    @pytest.fixture
+    def new_project(self, lsp_server, project, tmp_path):
+        from index_cache import IndexCache
+
+        def _new_project():
+            new_project = lsp_server.KedroProject(tmp_path, {})
+            new_project.index_cache = IndexCache(tmp_path, tmp_path / "cache")
+            return new_project
+
+        project.project_metadata = object()
+        project.index_cache = IndexCache(tmp_path, tmp_path / "cache")
+        return _new_project
+
+    def test_catalog_reports_are_reused_for_the_same_content(
+        self, lsp_server, project, new_project, tmp_path
+    ):
+        catalog = tmp_path / "conf" / "base" / "catalog.yml"
+        catalog.write_text("companies: {}\n")
+        uri = catalog.as_uri()
+        diagnostics = [_diagnostic(lsp_server, "error", line=1)]
+        project.save_index({uri: ("result", diagnostics)})
+
+        restored = new_project()
+        restored.restore_index()
+        assert restored.restored_report(uri, "other result") is None
+        assert restored.restored_report(uri, "result") is None
+
+        restored = new_project()
+        restored.restore_index()
+        assert restored.restored_report(uri, "result") == diagnostics
+
+    def test_position_index_is_restored(self, lsp_server, project, new_project, tmp_path):
+        parameters_file = tmp_path / "conf" / "base" / "parameters.yml"
+        project.position_index.get(parameters_file)
+        project.save_index({})
+
+        restored = new_project()
+        restored.restore_index()
+        assert parameters_file in restored.position_index._files
+
+    def test_reports_outside_the_project_are_not_saved(
+        self, lsp_server, project, new_project, tmp_path
+    ):
+        project.save_index({"file:///elsewhere/catalog.yml": ("result", [])})
+        assert project.index_cache.sections["catalog_reports"] == {}
+
+
+class TestConfigOnlyBootstrap:
+    """Test that only the config loader is built unless a context is needed."""
+
+    @pytest.fixture
+    def calls(self, lsp_server, project, monkeypatch):
+        config_loader = project.config_loader
+        calls = []
+
+        class _Session:
+            def load_context(self):
+                calls.append("context")
+                return mock.Mock(config_loader=config_loader)
+
+        def _create_config_loader(root_path, env):
+            calls.append("config_loader")
+            return config_loader
+
+        def _create_session(root_path, env):
+            calls.append("session")
+            return _Session()
+
+        monkeypatch.setattr(lsp_server, "_create_config_loader", _create_config_loader)
+        monkeypatch.setattr(lsp_server, "_create_session", _create_session)
+        monkeypatch.delenv("KEDRO_ENV", raising=False)
+        return calls
+
+    def test_context_is_created_on_demand(self, project, calls):
+        project.snapshot = project._load_environment(None)
+        assert calls == ["config_loader"]
+        assert project.context is None
+        assert project.run_env == "local"
+
+        context = project.load_context()
+        assert project.load_context() is context
+        assert calls == ["config_loader", "session", "context"]
+
+    def test_kedro_settings_are_configured_for_the_project(self, project, calls, monkeypatch):
+        from kedro.framework import project as kedro_project
+
+        configured = []
+        # Another project of the workspace was bootstrapped last
+        monkeypatch.setattr(kedro_project, "PACKAGE_NAME", "other")
+        monkeypatch.setattr(kedro_project, "configure_project", configured.append)
+        project.project_metadata = mock.Mock(package_name="demo")
+
+        project._load_environment("staging")
+        project.load_context()
+        assert configured == ["demo", "demo"]
+
+    def test_full_context_setting(self, project, calls):
+        project.settings["loadFullContext"] = True
+        project.snapshot = project._load_environment("staging")
+        assert calls == ["session", "context"]
+        assert project.context is not None
+        assert project.run_env == "staging"
+
+
+class TestLazyImports:
+    """Test that Kedro is only imported when a project is bootstrapped."""
+
+    def test_server_import_does_not_import_kedro(self):
+        code = (
+            "import sys; import lsp_server; "
+            "print(sorted(name for name in sys.modules if name.split('.')[0] in ('kedro', 'omegaconf')))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=BUNDLED_PATH,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.strip().splitlines()[-1] == "[]"
+
+    def test_profile_import_times_first_import_only(self, lsp_server, monkeypatch):
+        monkeypatch.setattr(lsp_server, "IMPORT_TIMES", {})
+        with lsp_server.profile_import("json"):
+            import json  # noqa: F401
+        first = lsp_server.IMPORT_TIMES["json"]
+        with lsp_server.profile_import("json"):
+            pass
+        assert lsp_server.IMPORT_TIMES == {"json": first}
+
+
+class TestDocumentOutline:
+    """Test the outline and folding ranges of catalog and parameters files."""
+
+    CATALOG = (
+        "companies:\n"
+        "  type: pandas.CSVDataset\n"
+        "  filepath: data/companies.csv\n"
+        "\n"
+        '"{name}_csv":\n'
+        "  type: pandas.CSVDataset\n"
+        "  load_args:\n"
+        "    sep: ','\n"
+        "    header: 0\n"
+    )
+
+    def _params(self, path):
+        from lsprotocol.types import TextDocumentIdentifier
+
+        params = mock.Mock()
+        params.text_document = TextDocumentIdentifier(uri=path.as_uri())
+        return params
+
+    def test_catalog_entries_show_their_dataset_type(self, lsp_server, tmp_path):
+        catalog = tmp_path / "catalog.yml"
+        catalog.write_text(self.CATALOG)
+        symbols = lsp_server.document_symbol(lsp_server.LSP_SERVER, self._params(catalog))
+        assert [(symbol.name, symbol.detail) for symbol in symbols] == [
+            ("companies", "pandas.CSVDataset"),
+            ("{name}_csv", "pandas.CSVDataset"),
+        ]
+        assert [child.name for child in symbols[1].children] == ["type", "load_args"]
+        assert [child.name for child in symbols[1].children[1].children] == ["sep", "header"]
+        assert (symbols[1].range.start.line, symbols[1].selection_range.start.line) == (4, 4)
+
+    def test_parameters_show_their_values(self, lsp_server, tmp_path):
+        parameters = tmp_path / "parameters.yml"
+        parameters.write_text("model:\n  alpha: 1\n  layers:\n    - size: 2\n")
+        (model,) = lsp_server.document_symbol(lsp_server.LSP_SERVER, self._params(parameters))
+        assert [(child.name, child.detail) for child in model.children] == [
+            ("alpha", "1"),
+            ("layers", ""),
+        ]
+        assert [child.name for child in model.children[1].children] == ["[0].size"]
+
+    def test_multi_line_values_fold(self, lsp_server, tmp_path):
+        catalog = tmp_path / "catalog.yml"
+        catalog.write_text(self.CATALOG)
+        ranges = lsp_server.folding_range(lsp_server.LSP_SERVER, self._params(catalog))
+        assert [(fold.start_line, fold.end_line) for fold in ranges] == [(0, 2), (4, 8), (6, 8)]
+
+    def test_keys_inherited_from_anchors_are_left_out(self, lsp_server, tmp_path):
+        catalog = tmp_path / "catalog.yml"
+        catalog.write_text(
+            "_csv: &csv\n"
+            "  type: pandas.CSVDataset\n"
+            "  load_args:\n"
+            "    sep: ','\n"
+            "companies:\n"
+            "  <<: *csv\n"
+            "  filepath: data/companies.csv\n"
+            "shuttles: *csv\n"
+        )
+        symbols = lsp_server.document_symbol(lsp_server.LSP_SERVER, self._params(catalog))
+        assert [(symbol.name, symbol.detail) for symbol in symbols] == [
+            ("_csv", "pandas.CSVDataset"),
+            ("companies", "pandas.CSVDataset"),
+            ("shuttles", "pandas.CSVDataset"),
+        ]
+        assert [child.name for child in symbols[1].children] == ["filepath"]
+        assert symbols[2].children == []
+
+        ranges = lsp_server.folding_range(lsp_server.LSP_SERVER, self._params(catalog))
+        assert [(fold.start_line, fold.end_line) for fold in ranges] == [(0, 3), (2, 3), (4, 6)]
+
+    def test_other_files_are_ignored(self, lsp_server, tmp_path):
+        other = tmp_path / "settings.yml"
+        other.write_text("a:\n  b: 1\n")
+        assert lsp_server.document_symbol(lsp_server.LSP_SERVER, self._params(other)) is None
+        assert lsp_server.folding_range(lsp_server.LSP_SERVER, self._params(other)) is None
@@ -0,0 +1,166 @@
+import sys
+from pathlib import Path
+from textwrap import dedent
+
+# Add bundled/tool to path to import the server helpers
+BUNDLED_PATH = Path(__file__).parents[3] / "bundled" / "tool"
+sys.path.insert(0, str(BUNDLED_PATH))
+
+from _lsp_server import (
+    DummyDataCatalog,
+    FactoryPatternMatcher,
+    NodePosition,
+    load_with_positions,
+)
+
+
+class TestLoadWithPositions:
+    """Test the side table of key positions produced by SafeLineLoader."""
+
+    def test_config_has_no_line_annotations(self):
+        content = dedent(
+            """\
+            companies:
+              type: pandas.CSVDataset
+              load_args:
+                sep: ","
+            """
+        )
+        config, _ = load_with_positions(content)
+        assert config == {
+            "companies": {"type": "pandas.CSVDataset", "load_args": {"sep": ","}}
+        }
+
+    def test_positions_for_nested_keys(self):
+        content = dedent(
+            """\
+            companies:
+              type: pandas.CSVDataset
+              load_args:
+                sep: ","
+            shuttles:
+              type: pandas.ExcelDataset
+            """
+        )
+        _, positions = load_with_positions(content)
+        assert positions[("companies",)][:2] == (0, 0)
+        assert positions[("companies", "load_args")][:2] == (2, 2)
+        assert positions[("companies", "load_args", "sep")][:2] == (3, 4)
+        assert positions[("shuttles",)][:2] == (4, 0)
+
+    def test_position_spans_the_value(self):
+        content = dedent(
+            """\
+            companies:
+              type: pandas.CSVDataset
+              filepath: data.csv
+            shuttles:
+              type: pandas.ExcelDataset
+            """
+        )
+        _, positions = load_with_positions(content)
+        assert positions[("companies",)] == NodePosition(0, 0, 3, 0)
+
+    def test_sequence_items_are_indexed(self):
+        content = dedent(
+            """\
+            model:
+              layers:
+                - units: 32
+                - units: 16
+            """
+        )
+        _, positions = load_with_positions(content)
+        assert positions[("model", "layers", 1, "units")][:2] == (3, 6)
+
+    def test_anchors_and_merge_keys(self):
+        content = dedent(
+            """\
+            _csv: &csv
+              type: pandas.CSVDataset
+            companies:
+              <<: *csv
+              filepath: data.csv
+            """
+        )
+        config, positions = load_with_positions(content)
+        assert config["companies"]["type"] == "pandas.CSVDataset"
+        assert ("companies", "<<") not in positions
+        assert positions[("companies", "type")][:2] == (1, 2)
+        assert positions[("companies", "filepath")][:2] == (4, 2)
+
+    def test_empty_document(self):
+        assert load_with_positions("") == (None, {})
+
+
+class TestFactoryPatternMatcher:
+    """Test factory pattern resolution in Kedro's specificity order."""
+
+    def test_sorted_by_specificity(self):
+        matcher = FactoryPatternMatcher(
+            ["{default}", "{namespace}.{name}", "{namespace}.int_{name}"]
+        )
+        assert matcher.patterns == [
+            "{namespace}.int_{name}",
+            "{namespace}.{name}",
+            "{default}",
+        ]
+
+    def test_most_specific_pattern_wins(self):
+        matcher = FactoryPatternMatcher(
+            ["{default}", "{namespace}.{name}", "{namespace}.int_{name}"]
+        )
+        match = matcher.match("data.int_customers")
+        assert match.pattern == "{namespace}.int_{name}"
+        assert match.values == {"namespace": "data", "name": "customers"}
+        assert matcher.match("customers").pattern == "{default}"
+
+    def test_no_match(self):
+        matcher = FactoryPatternMatcher(["{name}_csv"])
+        assert matcher.match("companies") is None
+
+    def test_repeated_placeholder_must_be_equal(self):
+        matcher = FactoryPatternMatcher(["{name}.{name}"])
+        assert matcher.match("a.a").values == {"name": "a"}
+        assert matcher.match("a.b") is None
+
+    def test_resolved_names_are_cached(self):
+        matcher = FactoryPatternMatcher(["{name}_csv"], cache_size=2)
+        matcher.match("a_csv")
+        matcher.match("b_csv")
+        matcher.match("c_csv")
+        assert matcher.resolved_names() == [("b_csv", "{name}_csv"), ("c_csv", "{name}_csv")]
+
+
+class TestDummyDataCatalog:
+    """Test dataset lookups in the DummyDataCatalog."""
+
+    def setup_method(self):
+        self.catalog = DummyDataCatalog(
+            conf_catalog={
+                "companies": {"type": "pandas.CSVDataset", "filepath": "companies.csv"},
+                "{name}_csv": {
+                    "type": "pandas.CSVDataset",
+                    "filepath": "data/{name}.csv",
+                    "load_args": {"sep": ","},
+                },
+            },
+            feed_dict={"model": {"alpha": 1}},
+        )
+
+    def test_patterns_are_not_listed(self):
+        assert "{name}_csv" not in self.catalog.list()
+        assert "companies" in self.catalog.list()
+        assert "params:model.alpha" in self.catalog.list()
+
+    def test_get_dataset_config_resolves_pattern(self):
+        assert self.catalog.get_dataset_config("shuttles_csv") == {
+            "type": "pandas.CSVDataset",
+            "filepath": "data/shuttles.csv",
+            "load_args": {"sep": ","},
+        }
+
+    def test_declared_dataset_is_not_matched(self):
+        assert self.catalog.match_pattern("companies") is None
+        assert self.catalog.get_dataset_config("companies")["filepath"] == "companies.csv"
+        assert self.catalog.get_dataset_config("missing") is None
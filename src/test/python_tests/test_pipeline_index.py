@@ -0,0 +1,177 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add bundled/tool to path to import the server helpers
+BUNDLED_PATH = Path(__file__).parents[3] / "bundled" / "tool"
+sys.path.insert(0, str(BUNDLED_PATH))
+
+from pipeline_index import PipelineGraphIndex, find_registered_pipelines, registry_files  # noqa: E402
+
+PIPELINE = '''from kedro.pipeline import Pipeline, node
+
+from . import nodes as steps
+from .nodes import preprocess
+
+
+def local(x):
+    return x
+
+
+def create_pipeline(**kwargs):
+    return Pipeline(
+        [
+            node(preprocess, ["companies", "params:alpha"], "preprocessed", name="preprocess_node"),
+            node(func=steps.combine, inputs={"a": "preprocessed", "b": "shuttles"}, outputs="model_input"),
+            node(local, "model_input", ["scores", "metrics"]),
+        ]
+    )
+'''
+
+NODES = '''def preprocess(companies, alpha):
+    return companies
+
+
+def combine(a, b):
+    return a
+'''
+
+
+def _write(path: Path, content: str):
+    # Bump the modification time even on filesystems with a coarse clock
+    existed = path.exists()
+    path.write_text(content)
+    if existed:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def pipelines_dir(tmp_path):
+    pipeline_dir = tmp_path / "src" / "demo" / "pipelines" / "data_processing"
+    pipeline_dir.mkdir(parents=True)
+    (pipeline_dir.parent / "__init__.py").write_text("")
+    (pipeline_dir / "__init__.py").write_text("")
+    (pipeline_dir / "pipeline.py").write_text(PIPELINE)
+    (pipeline_dir / "nodes.py").write_text(NODES)
+    return pipeline_dir.parent
+
+
+@pytest.fixture
+def graph(pipelines_dir):
+    graph = PipelineGraphIndex(pipelines_dir)
+    assert graph.wait(5)
+    return graph
+
+
+class TestPipelineGraphIndex:
+    """Test the index of the nodes of the pipelines and their datasets."""
+
+    def test_producers_and_consumers(self, graph):
+        (producer,) = graph.producers("preprocessed")
+        assert producer.name == "preprocess_node"
+        assert producer.pipeline == "data_processing"
+        assert [node.name for node in graph.consumers("preprocessed")] == ["combine"]
+        assert [node.name for node in graph.consumers("params:alpha")] == ["preprocess_node"]
+        assert [node.name for node in graph.producers("metrics")] == ["local"]
+        assert graph.producers("companies") == []
+        assert graph.datasets() == {
+            "companies", "params:alpha", "preprocessed", "shuttles", "model_input", "scores", "metrics"
+        }
+
+    def test_node_functions_are_resolved(self, graph, pipelines_dir):
+        nodes_file = pipelines_dir / "data_processing" / "nodes.py"
+        pipeline_file = pipelines_dir / "data_processing" / "pipeline.py"
+
+        def _function(dataset):
+            (node,) = graph.producers(dataset)
+            return node.function_path, node.function_line
+
+        assert _function("preprocessed") == (nodes_file, 0)
+        assert _function("model_input") == (nodes_file, 4)
+        assert _function("scores") == (pipeline_file, 6)
+
+    def test_changed_pipeline_files_are_parsed_again(self, graph, pipelines_dir):
+        pipeline_file = pipelines_dir / "data_processing" / "pipeline.py"
+        _write(pipeline_file, PIPELINE.replace('"scores"', '"predictions"'))
+        graph.refresh([str(pipeline_file)])
+        assert graph.producers("scores") == []
+        assert [node.name for node in graph.producers("predictions")] == ["local"]
+
+        pipeline_file.unlink()
+        graph.refresh([str(pipeline_file)])
+        assert graph.datasets() == set()
+
+    def test_refreshes_during_the_build_are_kept(self, pipelines_dir):
+        pipeline_file = pipelines_dir / "data_processing" / "pipeline.py"
+        graph = PipelineGraphIndex(pipelines_dir)
+        _write(pipeline_file, PIPELINE.replace('"scores"', '"predictions"'))
+        graph.refresh([str(pipeline_file)])
+
+        # The build reads the file as it was before the refresh
+        _write(pipeline_file, PIPELINE)
+        assert graph.wait(5)
+        assert [node.name for node in graph.producers("predictions")] == ["local"]
+        assert graph.producers("scores") == []
+
+    def test_changed_node_modules_update_function_lines(self, graph, pipelines_dir):
+        nodes_file = pipelines_dir / "data_processing" / "nodes.py"
+        _write(nodes_file, "\n\n" + NODES)
+        graph.refresh([str(nodes_file)])
+        assert graph.producers("preprocessed")[0].function_line == 2
+
+    def test_broken_files_are_indexed_empty(self, graph, pipelines_dir):
+        pipeline_file = pipelines_dir / "data_processing" / "pipeline.py"
+        _write(pipeline_file, PIPELINE + "\nnode(")
+        graph.refresh([str(pipeline_file)])
+        assert graph.producers("preprocessed") == []
+
+    def test_files_outside_the_pipelines_are_ignored(self, graph, pipelines_dir):
+        graph.refresh([str(pipelines_dir.parent / "settings.py")])
+        assert len(graph.nodes()) == 3
+
+    def test_namespaced_pipelines_rename_their_datasets(self, graph, pipelines_dir):
+        pipeline_file = pipelines_dir / "data_processing" / "pipeline.py"
+        _write(
+            pipeline_file,
+            PIPELINE.replace("    return Pipeline(", "    base = Pipeline(")
+            + '''    return pipeline(
+        base, namespace="dp", inputs={"companies": "raw_companies"}, outputs="metrics"
+    ) + pipeline(base, namespace="ds", inputs=["companies", "shuttles"])
+''',
+        )
+        graph.refresh([str(pipeline_file)])
+
+        assert [node.name for node in graph.producers("dp.preprocessed")] == ["dp.preprocess_node"]
+        assert [node.name for node in graph.consumers("raw_companies")] == ["dp.preprocess_node"]
+        assert [node.name for node in graph.consumers("companies")] == ["ds.preprocess_node"]
+        # Parameters are not namespaced
+        assert len(graph.consumers("params:alpha")) == 2
+        assert [node.name for node in graph.producers("metrics")] == ["dp.local"]
+        assert [node.name for node in graph.producers("ds.metrics")] == ["ds.local"]
+        assert graph.producers("preprocessed") == []
+        (combine,) = graph.consumers("dp.preprocessed")
+        assert ("dp.preprocessed", 14, 51) in combine.dataset_positions
+
+    def test_registered_pipelines(self, pipelines_dir):
+        package_dir = pipelines_dir.parent
+        registry = package_dir / "pipeline_registry.py"
+        registry.write_text(
+            "from kedro.framework.project import find_pipelines\n"
+            "\n"
+            "def register_pipelines():\n"
+            "    pipelines = find_pipelines()\n"
+            '    pipelines["__default__"] = sum(pipelines.values())\n'
+            "    return pipelines\n"
+        )
+        assert find_registered_pipelines(package_dir) == [
+            ("__default__", registry, 4),
+            ("data_processing", pipelines_dir / "data_processing" / "pipeline.py", 10),
+        ]
+
+        assert pipelines_dir / "data_processing" / "pipeline.py" in registry_files(package_dir)
+
+        registry.write_text('def register_pipelines():\n    return {"__default__": p, "dp": p}\n')
+        assert [name for name, _, _ in find_registered_pipelines(package_dir)] == ["__default__", "dp"]
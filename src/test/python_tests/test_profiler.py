@@ -0,0 +1,49 @@
+import pstats
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add bundled/tool to path to import the server helpers
+BUNDLED_PATH = Path(__file__).parents[3] / "bundled" / "tool"
+sys.path.insert(0, str(BUNDLED_PATH))
+
+from profiler import ServerProfiler, profile_directory  # noqa: E402
+
+
+def _work():
+    return sum(index * index for index in range(1000))
+
+
+class TestServerProfiler:
+    """Test the on-demand profiler of the server."""
+
+    def test_profile_and_summary_are_written_in_the_project(self, tmp_path):
+        profiler = ServerProfiler()
+        profiler.start()
+        assert profiler.running
+        _work()
+        profile_path, summary_path = profiler.stop(tmp_path)
+
+        assert not profiler.running
+        assert profile_path.parent == tmp_path / ".kedro" / "profiles"
+        functions = {function for _, _, function in pstats.Stats(str(profile_path)).stats}
+        assert "_work" in functions
+        assert "_work" in summary_path.read_text()
+
+    def test_start_and_stop_must_alternate(self, tmp_path):
+        profiler = ServerProfiler()
+        with pytest.raises(RuntimeError, match="not running"):
+            profiler.stop(tmp_path)
+        profiler.start()
+        try:
+            with pytest.raises(RuntimeError, match="already running"):
+                profiler.start()
+        finally:
+            profiler.stop(tmp_path)
+
+    def test_temporary_directory_without_project(self, tmp_path):
+        assert profile_directory(None).is_dir()
+        # A file where .kedro should be
+        (tmp_path / ".kedro").write_text("")
+        assert profile_directory(tmp_path) == profile_directory(None)
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add bundled/tool to path to import the server helpers
+BUNDLED_PATH = Path(__file__).parents[3] / "bundled" / "tool"
+sys.path.insert(0, str(BUNDLED_PATH))
+
+from server_stats import ServerStats  # noqa: E402
+
+
+class TestServerStats:
+    """Test the per-method and per-cache counters of the server."""
+
+    def test_latencies_are_bucketed(self):
+        stats = ServerStats()
+        for milliseconds in [0.5] * 98 + [30, 7000]:
+            stats.record("textDocument/hover", milliseconds / 1000)
+
+        hover = stats.snapshot()["methods"]["textDocument/hover"]
+        assert hover["count"] == 100
+        assert hover["histogram"] == {"<=1ms": 98, "<=50ms": 1, ">5000ms": 1}
+        assert hover["p50_ms"] == 1.0
+        assert hover["p99_ms"] == 50.0
+        assert hover["max_ms"] == 7000.0
+
+    def test_cache_hit_rates(self):
+        stats = ServerStats()
+        stats.cache("configs", hit=True, count=3)
+        stats.cache("configs", hit=False)
+        stats.cache("conf_paths", hit=False)
+
+        caches = stats.snapshot()["caches"]
+        assert caches["configs"] == {"hits": 3, "misses": 1, "hit_rate": 0.75}
+        assert caches["conf_paths"]["hit_rate"] == 0.0
+
+    def test_bytes_sent_are_counted_per_method(self):
+        stats = ServerStats()
+        stats.sent("textDocument/publishDiagnostics", 120)
+        stats.sent("textDocument/publishDiagnostics", 80)
+
+        published = stats.snapshot()["methods"]["textDocument/publishDiagnostics"]
+        assert (published["messages_sent"], published["bytes_sent"]) == (2, 200)
+        assert published["count"] == 0
+
+    def test_timed_functions_keep_their_signature(self):
+        stats = ServerStats()
+
+        def definition(ls, params):
+            return params
+
+        async def did_open(ls, params):
+            return params
+
+        timed = stats.timed("textDocument/definition", definition)
+        timed_async = stats.timed("textDocument/didOpen", did_open)
+        assert timed(None, 1) == 1
+        assert asyncio.run(timed_async(None, 2)) == 2
+        assert asyncio.iscoroutinefunction(timed_async)
+        assert timed.__wrapped__ is definition
+
+        methods = stats.snapshot()["methods"]
+        assert methods["textDocument/definition"]["count"] == 1
+        assert methods["textDocument/didOpen"]["count"] == 1
+
+    def test_errors_are_counted(self):
+        stats = ServerStats()
+        with pytest.raises(ValueError):
+            with stats.timer("validator/DatasetConfigValidator"):
+                raise ValueError("broken")
+
+        assert stats.snapshot()["methods"]["validator/DatasetConfigValidator"]["errors"] == 1
+
+    def test_calls_are_dumped_as_json_lines(self, tmp_path):
+        dump = tmp_path / "stats.jsonl"
+        stats = ServerStats(str(dump))
+        stats.record("textDocument/hover", 0.002)
+        stats.record("textDocument/definition", 0.001, error=True)
+
+        lines = [json.loads(line) for line in dump.read_text().splitlines()]
+        assert [(line["method"], line["ms"], line["error"]) for line in lines] == [
+            ("textDocument/hover", 2.0, False),
+            ("textDocument/definition", 1.0, True),
+        ]
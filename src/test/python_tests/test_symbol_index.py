@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+# Add bundled/tool to path to import the server helpers
+BUNDLED_PATH = Path(__file__).parents[3] / "bundled" / "tool"
+sys.path.insert(0, str(BUNDLED_PATH))
+
+from symbol_index import DATASET, PARAMETER, Symbol, SymbolIndex  # noqa: E402
+
+
+def _symbols(*names, kind=DATASET):
+    return [Symbol(name, kind, "/conf/base/catalog.yml", line, 0) for line, name in enumerate(names)]
+
+
+def _names(symbols):
+    return [symbol.name for symbol in symbols]
+
+
+class TestSymbolIndex:
+    """Test the fuzzy search over the symbols of a project."""
+
+    def test_matches_are_ranked(self):
+        index = SymbolIndex()
+        index.update(
+            "catalog",
+            1,
+            lambda: _symbols("companies", "companies_raw", "raw_companies", "ncompanies", "co_mpanies", "shuttles"),
+        )
+        assert _names(index.search("companies")) == [
+            "companies", "companies_raw", "raw_companies", "ncompanies", "co_mpanies"
+        ]
+        # Tighter matches first, then shorter names
+        assert _names(index.search("CMP")) == [
+            "companies", "ncompanies", "companies_raw", "raw_companies", "co_mpanies"
+        ]
+        assert _names(index.search("xyz")) == []
+
+    def test_parameters_match_at_word_starts(self):
+        index = SymbolIndex()
+        index.update("parameters", 1, lambda: _symbols("params:model.alpha", "params:malpha", kind=PARAMETER))
+        assert _names(index.search("alpha")) == ["params:model.alpha", "params:malpha"]
+
+    def test_sources_are_read_again_when_their_version_changes(self):
+        index = SymbolIndex()
+        reads = []
+
+        def _read(*names):
+            reads.append(names)
+            return _symbols(*names)
+
+        index.update("catalog", 1, lambda: _read("companies"))
+        index.update("catalog", 1, lambda: _read("shuttles"))
+        assert _names(index.search("")) == ["companies"]
+        index.update("catalog", 2, lambda: _read("shuttles"))
+        assert _names(index.search("")) == ["shuttles"]
+        assert len(reads) == 2
+
+        index.update("other", 1, lambda: _read("reviews"))
+        index.retain(["other"])
+        assert _names(index.search("")) == ["reviews"]
+
+    def test_results_are_limited(self):
+        index = SymbolIndex()
+        index.update("catalog", 1, lambda: _symbols(*(f"dataset_{number}" for number in range(10_000))))
+        assert len(index) == 10_000
+        assert len(index.search("dataset", limit=20)) == 20
+        assert index.search("dataset_9999")[0].name == "dataset_9999"
@@ -1,6 +1,8 @@
+import importlib.util
 import sys
 from pathlib import Path
 from textwrap import dedent
+from unittest import mock
 
 import pytest
 from lsprotocol.types import DiagnosticSeverity, Position
@@ -10,14 +12,20 @@ BUNDLED_PATH = Path(__file__).parents[3] / "bundled" / "tool"
 sys.path.insert(0, str(BUNDLED_PATH))
 
 from validators.dataset_config import DatasetConfigValidator
+from validators.engine import CatalogValidationEngine
 from validators.factory_pattern import FactoryPatternValidator
 from validators.full_catalog import FullCatalogValidator
 from validators.utils import (
+    collect_config_tokens,
     create_diagnostic,
     find_line_number_and_character,
     has_config_references,
     is_valid_dataset_entry,
-    remove_line_numbers,
+)
+
+requires_kedro = pytest.mark.skipif(
+    importlib.util.find_spec("kedro") is None,
+    reason="Requires Kedro to be installed",
 )
 
 
@@ -85,6 +93,24 @@ class TestUtilsFunctions:
     def test_has_config_references_non_dict(self):
         assert has_config_references("not a dict") is False
 
+    def test_has_config_references_in_list(self):
+        assert has_config_references({"columns": ["a", "${globals:col}"]}) is True
+
+    def test_collect_config_tokens(self):
+        tokens = collect_config_tokens(
+            {
+                "filepath": "data/{layer}/{name}.csv",
+                "load_args": {"sep": ",", "usecols": ["{name}_id"]},
+            }
+        )
+        assert tokens.placeholders == {"layer", "name"}
+        assert tokens.has_config_references is False
+
+    def test_collect_config_tokens_ignores_nested_mappings(self):
+        # Nested dicts without braces must not be reported as placeholders
+        tokens = collect_config_tokens({"load_args": {"sep": ","}})
+        assert tokens.placeholders == frozenset()
+
     def test_is_valid_dataset_entry_valid(self):
         assert is_valid_dataset_entry("my_dataset") is True
 
@@ -95,30 +121,6 @@ class TestUtilsFunctions:
         assert is_valid_dataset_entry(123) is False
         assert is_valid_dataset_entry(None) is False
 
-    def test_remove_line_numbers(self):
-        config = {
-            "type": "pandas.CSVDataset",
-            "__line__": 5,
-            "load_args": {"sep": ",", "__line__": 7},
-        }
-        cleaned = remove_line_numbers(config)
-        assert "__line__" not in cleaned
-        assert "__line__" not in cleaned["load_args"]
-        assert cleaned["type"] == "pandas.CSVDataset"
-        assert cleaned["load_args"]["sep"] == ","
-
-    def test_remove_line_numbers_with_list(self):
-        config = {
-            "items": [
-                {"name": "item1", "__line__": 1},
-                {"name": "item2", "__line__": 2},
-            ],
-            "__line__": 0,
-        }
-        cleaned = remove_line_numbers(config)
-        assert "__line__" not in cleaned
-        assert all("__line__" not in item for item in cleaned["items"])
-
     def test_create_diagnostic(self):
         diagnostic = create_diagnostic(
             range_start=Position(line=5, character=10),
@@ -143,7 +145,6 @@ class TestFactoryPatternValidator:
             "{layer}.{name}": {
                 "type": "pandas.CSVDataset",
                 "filepath": "data/{layer}/{name}.csv",
-                "__line__": 1,
             }
         }
         content = dedent(
@@ -159,7 +160,6 @@ class TestFactoryPatternValidator:
             "regular_dataset": {
                 "type": "pandas.CSVDataset",
                 "filepath": "data.csv",
-                "__line__": 1,
             }
         }
         content = dedent("regular_dataset:\n  type: pandas.CSVDataset\n")
@@ -173,7 +173,6 @@ class TestFactoryPatternValidator:
                 "type": "pandas.CSVDataset",
                 "filepath": "data/{layer}/{name}.csv",
                 "load_args": {"columns": "${globals:columns}"},
-                "__line__": 1,
             }
         }
         content = dedent('"{layer}.{name}":\n  type: pandas.CSVDataset\n')
@@ -182,6 +181,25 @@ class TestFactoryPatternValidator:
         assert len(diagnostics) == 0
 
 
+    def test_extra_placeholder_in_config(self):
+        catalog = {
+            "{name}_csv": {
+                "type": "pandas.CSVDataset",
+                "filepath": "data/{layer}/{name}.csv",
+                "load_args": {"sep": ","},
+            }
+        }
+        content = dedent(
+            '"{name}_csv":\n'
+            "  type: pandas.CSVDataset\n"
+            "  filepath: data/{layer}/{name}.csv\n"
+        )
+        diagnostics = self.validator.validate(catalog, content)
+        assert len(diagnostics) == 1
+        assert diagnostics[0].severity == DiagnosticSeverity.Warning
+        assert "[layer]" in diagnostics[0].message
+
+
 class TestDatasetConfigValidator:
     """Test dataset configuration validation."""
 
@@ -198,7 +216,6 @@ class TestDatasetConfigValidator:
             "bad_dataset": {
                 "type": "pandas.InvalidDataset",  # This doesn't exist
                 "filepath": "data.csv",
-                "__line__": 1,
             }
         }
         content = dedent(
@@ -242,3 +259,58 @@ class TestFullCatalogValidator:
         diagnostics = self.validator.validate(catalog, content="")
         # This should produce an error about the mismatched factory pattern
         assert len(diagnostics) > 0
+
+
+@requires_kedro
+class TestCatalogValidationEngine:
+    """Test the DataCatalog shared by the validators of a pass."""
+
+    def test_catalog_is_built_once(self):
+        from kedro.io import DataCatalog
+
+        catalog = {
+            "a": {"type": "MemoryDataset"},
+            "b": {"type": "MemoryDataset"},
+        }
+        engine = CatalogValidationEngine(catalog)
+        with mock.patch.object(
+            DataCatalog, "from_config", wraps=DataCatalog.from_config
+        ) as from_config:
+            DatasetConfigValidator().validate(catalog, "", engine)
+            FullCatalogValidator().validate(catalog, "", engine)
+        assert from_config.call_count == 1
+
+    def test_errors_are_attributed_to_the_dataset(self):
+        catalog = {
+            "good": {"type": "MemoryDataset"},
+            "bad": {"type": "not_a_module.MissingDataset"},
+            "_anchor": {"type": "MemoryDataset"},
+        }
+        engine = CatalogValidationEngine(catalog)
+        assert list(engine.dataset_errors()) == ["bad"]
+        assert "_anchor" not in engine.datasets
+
+    def test_falls_back_to_isolated_catalogs(self):
+        catalog = {
+            "{layer}": {"type": "MemoryDataset", "metadata": {"x": "{extra}"}},
+            "good": {"type": "MemoryDataset"},
+            "bad": {"type": "not_a_module.MissingDataset"},
+        }
+        engine = CatalogValidationEngine(catalog)
+        assert engine.catalog is None
+        assert engine.catalog_error is not None
+        assert list(engine.dataset_errors()) == ["{layer}", "bad"]
+
+    def test_parallel_errors_keep_document_order(self):
+        catalog = {
+            f"dataset_{index}": (
+                {"type": "not_a_module.MissingDataset"}
+                if index % 3 == 0
+                else {"type": "MemoryDataset"}
+            )
+            for index in range(20)
+        }
+        engine = CatalogValidationEngine(catalog, max_workers=4)
+        assert list(engine.dataset_errors()) == [
+            f"dataset_{index}" for index in range(0, 20, 3)
+        ]